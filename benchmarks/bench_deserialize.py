@@ -0,0 +1,128 @@
+"""
+Measure how long it takes to restore a saved queue of many entries with
+the frame inspecting Serializer.deserialize hook versus the registered
+factory path with explicit context from Serializer.object_hook().
+
+Run from the repository root with the bot requirements installed:
+
+    python benchmarks/bench_deserialize.py --entries 10000
+
+Entries are a small Serializable class shaped like URLPlaylistEntry, so the
+time measured is the deserialization machinery rather than entry setup.
+The legacy hook is called from a few frames deep, like it is at startup.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yeboybot.constructs import Serializable, Serializer  # noqa: E402
+
+
+class BenchPlaylist(Serializable):
+    def __init__(self, bot: Any) -> None:
+        self.bot = bot
+        self.entries: List["BenchEntry"] = []
+
+    def __json__(self) -> Dict[str, Any]:
+        return self._enclose_json({"entries": self.entries})
+
+    @classmethod
+    def _deserialize(
+        cls, raw_json: Dict[str, Any], bot: Optional[Any] = None, **kwargs: Any
+    ) -> "BenchPlaylist":
+        assert bot is not None, cls._bad("bot")
+        pl = cls(bot)
+        pl.entries.extend(raw_json["entries"])
+        return pl
+
+
+class BenchEntry(Serializable):
+    def __init__(self, playlist: Any, info: Dict[str, Any]) -> None:
+        self.playlist = playlist
+        self.info = info
+
+    def __json__(self) -> Dict[str, Any]:
+        return self._enclose_json({"version": 3, "info": self.info})
+
+    @classmethod
+    def _deserialize(
+        cls,
+        raw_json: Dict[str, Any],
+        playlist: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> "BenchEntry":
+        assert playlist is not None, cls._bad("playlist")
+        return cls(playlist, raw_json["info"])
+
+
+def make_queue_json(count: int) -> str:
+    """Serialize a playlist of `count` entries."""
+    pl = BenchPlaylist(bot=object())
+    for idx in range(count):
+        vid = f"vid{idx:08d}"
+        pl.entries.append(
+            BenchEntry(
+                pl,
+                {
+                    "id": vid,
+                    "title": f"Some Artist - Some Song Title {idx}",
+                    "url": f"https://www.youtube.com/watch?v={vid}",
+                    "duration": 180 + idx % 120,
+                    "extractor": "youtube",
+                },
+            )
+        )
+    return pl.serialize()
+
+
+def _nested(depth: int, func: Callable[[], Any]) -> Any:
+    """Call `func` from `depth` extra frames, to mimic a real call stack."""
+    if depth:
+        return _nested(depth - 1, func)
+    return func()
+
+
+def restore_legacy(raw: str, bot: Any, playlist: Any) -> Any:
+    """Restore using call frame inspection for each object."""
+    return _nested(10, lambda: json.loads(raw, object_hook=Serializer.deserialize))
+
+
+def restore_registered(raw: str, bot: Any, playlist: Any) -> Any:
+    """Restore using registered factories and explicit context."""
+    hook = Serializer.object_hook(bot=bot, playlist=playlist)
+    return _nested(10, lambda: json.loads(raw, object_hook=hook))
+
+
+def measure(name: str, restore: Callable[[str, Any, Any], Any], raw: str) -> float:
+    """Run `restore` once and print how long it took."""
+    start = time.perf_counter()
+    pl = restore(raw, object(), object())
+    elapsed = time.perf_counter() - start
+    assert isinstance(pl, BenchPlaylist)
+    print(
+        f"{name:>11}:  {len(pl.entries):,} entries in {elapsed * 1000:8.1f} ms,  "
+        f"{elapsed / len(pl.entries) * 1e6:6.1f} us per entry"
+    )
+    return elapsed
+
+
+def main() -> None:
+    """Parse args and restore the queue with both hooks."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--entries", type=int, default=10000)
+    args = parser.parse_args()
+
+    raw = make_queue_json(args.entries)
+    legacy = measure("legacy", restore_legacy, raw)
+    registered = measure("registered", restore_registered, raw)
+    print(f"Registered factories are {legacy / registered:.1f}x faster.")
+
+
+if __name__ == "__main__":
+    main()
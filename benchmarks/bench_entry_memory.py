@@ -0,0 +1,128 @@
+"""
+Measure per-entry memory held by queued playlist entries when keeping the
+full yt-dlp info dict (YtdlpResponseDict) versus the compact YtdlpRecord.
+
+Run from the repository root with the bot requirements installed:
+
+    python benchmarks/bench_entry_memory.py --entries 2000
+
+Info dicts are generated to look like a typical YouTube video extraction,
+with formats, automatic captions, heatmap, and thumbnail lists.
+Pass a JSON file of real extraction info with --info-json to use that instead.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yeboybot.downloader import YtdlpRecord, YtdlpResponseDict  # noqa: E402
+
+
+def make_info(idx: int) -> Dict[str, Any]:
+    """Build a synthetic info dict resembling a sanitized YouTube extraction."""
+    vid = f"vid{idx:08d}"
+    formats = [
+        {
+            "format_id": str(f),
+            "url": f"https://rr1---sn.googlevideo.com/videoplayback?id={vid}&itag={f}&expire=1700000000",
+            "ext": "webm" if f % 2 else "m4a",
+            "acodec": "opus" if f % 2 else "mp4a.40.2",
+            "vcodec": "none" if f < 6 else "vp9",
+            "abr": 48.0 + f,
+            "filesize": 1_000_000 + f * 1000,
+            "http_headers": {
+                "User-Agent": "Mozilla/5.0",
+                "Accept": "text/html,application/xhtml+xml",
+                "Accept-Language": "en-us,en;q=0.5",
+            },
+            "downloader_options": {"http_chunk_size": 10485760},
+        }
+        for f in range(24)
+    ]
+    captions = {
+        lang: [
+            {"ext": ext, "url": f"https://www.youtube.com/api/timedtext?v={vid}&lang={lang}&fmt={ext}", "name": lang}
+            for ext in ("json3", "srv1", "srv2", "srv3", "ttml", "vtt")
+        ]
+        for lang in ("en", "de", "fr", "es", "uk", "ja", "pt", "it", "nl", "pl")
+    }
+    return {
+        "id": vid,
+        "_type": "video",
+        "title": f"Some Artist - Some Song Title {idx}",
+        "url": formats[3]["url"],
+        "webpage_url": f"https://www.youtube.com/watch?v={vid}",
+        "duration": 180 + idx % 120,
+        "extractor": "youtube",
+        "extractor_key": "Youtube",
+        "description": "A long description of the video. " * 40,
+        "tags": [f"tag{t}" for t in range(20)],
+        "formats": formats,
+        "automatic_captions": captions,
+        "heatmap": [
+            {"start_time": t * 2.0, "end_time": t * 2.0 + 2, "value": 0.5}
+            for t in range(100)
+        ],
+        "thumbnails": [
+            {"url": f"https://i.ytimg.com/vi/{vid}/{n}.jpg", "preference": -n, "id": str(n)}
+            for n in range(40)
+        ],
+        "__input_subject": f"https://youtu.be/{vid}",
+        "__expected_filename": f"audio_cache/youtube-{vid}-Some_Song-.webm",
+        "__header_data": {"CONTENT-LENGTH": "3456789", "CONTENT-TYPE": "audio/webm"},
+    }
+
+
+def measure(
+    label: str, build: Callable[[int], Any], count: int
+) -> float:
+    """Return bytes per object retained after building `count` objects."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    kept: List[Any] = [build(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    per_entry = (after - before) / count
+    print(f"{label:>20}:  {per_entry / 1024:9.2f} KiB per entry  ({len(kept)} entries)")
+    return per_entry
+
+
+def main() -> None:
+    """Parse args and run the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--info-json", type=str, default="")
+    args = parser.parse_args()
+
+    if args.info_json:
+        with open(args.info_json, "r", encoding="utf8") as fh:
+            raw = json.load(fh)
+
+        def build_info(_idx: int) -> Dict[str, Any]:
+            return json.loads(json.dumps(raw))
+
+    else:
+        build_info = make_info
+
+    full = measure(
+        "YtdlpResponseDict",
+        lambda i: YtdlpResponseDict(build_info(i)),
+        args.entries,
+    )
+    slim = measure(
+        "YtdlpRecord",
+        lambda i: YtdlpRecord.from_info(YtdlpResponseDict(build_info(i))),
+        args.entries,
+    )
+    if slim:
+        print(f"Saving:  {(full - slim) / 1024:.2f} KiB per entry, {full / slim:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Compare event loop lag and throughput of yt-dlp info extraction when run
+in a thread pool versus the worker process pool.
+
+Run from the repository root, network access is required:
+
+    python benchmarks/bench_extract_modes.py --workers 2 --jobs 20
+    python benchmarks/bench_extract_modes.py --mode process "https://youtu.be/..."
+
+Loop lag is measured by a coroutine that sleeps for a short interval and
+records how late it wakes up while extractions are running.
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yt_dlp as youtube_dl  # type: ignore[import-untyped]  # noqa: E402
+
+from yeboybot.extractor_pool import ProcessExtractorPool  # noqa: E402
+
+DEFAULT_SUBJECTS = [
+    "ytsearch5:lofi hip hop",
+    "ytsearch5:synthwave mix",
+    "ytsearch5:jazz piano",
+    "ytsearch5:classical guitar",
+]
+
+YTDL_OPTS: Dict[str, Any] = {
+    "format": "bestaudio/best",
+    "noplaylist": True,
+    "quiet": True,
+    "no_warnings": True,
+    "extract_flat": "in_playlist",
+    "default_search": "auto",
+    "no_color": True,
+    "http_headers": {"User-Agent": youtube_dl.utils.networking.random_user_agent()},
+}
+
+
+async def _lag_monitor(
+    samples: List[float], stop: asyncio.Event, interval: float
+) -> None:
+    """Record how late the loop wakes up from a short sleep."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - start - interval))
+
+
+async def _run(
+    name: str,
+    call: Callable[[str], Any],
+    subjects: List[str],
+    jobs: int,
+    workers: int,
+    interval: float,
+) -> Dict[str, float]:
+    """Run `jobs` extractions through `call` and collect timing stats."""
+    loop = asyncio.get_running_loop()
+    lag: List[float] = []
+    stop = asyncio.Event()
+    errors = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        monitor = asyncio.create_task(_lag_monitor(lag, stop, interval))
+        start = time.perf_counter()
+        futures = [
+            loop.run_in_executor(pool, call, subjects[i % len(subjects)])
+            for i in range(jobs)
+        ]
+        for res in await asyncio.gather(*futures, return_exceptions=True):
+            if isinstance(res, BaseException):
+                errors += 1
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+
+    lag_ms = sorted(x * 1000 for x in lag) or [0.0]
+    result = {
+        "elapsed_s": elapsed,
+        "jobs_per_s": jobs / elapsed if elapsed else 0.0,
+        "errors": float(errors),
+        "lag_mean_ms": statistics.fmean(lag_ms),
+        "lag_p95_ms": lag_ms[min(len(lag_ms) - 1, int(len(lag_ms) * 0.95))],
+        "lag_max_ms": lag_ms[-1],
+    }
+    print(
+        f"{name:>8}:  {result['jobs_per_s']:.2f} jobs/s  "
+        f"lag mean {result['lag_mean_ms']:.2f} ms  "
+        f"p95 {result['lag_p95_ms']:.2f} ms  "
+        f"max {result['lag_max_ms']:.2f} ms  "
+        f"errors {errors}"
+    )
+    return result
+
+
+def _thread_extract(ytdl: youtube_dl.YoutubeDL, subject: str) -> Dict[str, Any]:
+    """Extract in the calling thread, like the default Downloader mode."""
+    data = ytdl.extract_info(subject, download=False)
+    return ytdl.sanitize_info(data)  # type: ignore[no-any-return]
+
+
+def _process_extract(
+    pool: ProcessExtractorPool, user_agent: str, subject: str
+) -> Dict[str, Any]:
+    """Extract via a worker process, blocking the calling thread."""
+    return pool.extract_info(subject, user_agent, download=False)
+
+
+async def main() -> None:
+    """Parse args and run the selected benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("subjects", nargs="*", default=DEFAULT_SUBJECTS)
+    parser.add_argument("--mode", choices=["thread", "process", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--jobs", type=int, default=16)
+    parser.add_argument("--interval", type=float, default=0.005)
+    args = parser.parse_args()
+
+    print(
+        f"Running {args.jobs} extractions with {args.workers} workers "
+        f"over {len(args.subjects)} subjects."
+    )
+
+    if args.mode in ("thread", "both"):
+        ytdl = youtube_dl.YoutubeDL(YTDL_OPTS)
+        await _run(
+            "thread",
+            functools.partial(_thread_extract, ytdl),
+            args.subjects,
+            args.jobs,
+            args.workers,
+            args.interval,
+        )
+
+    if args.mode in ("process", "both"):
+        pool = ProcessExtractorPool(args.workers, YTDL_OPTS)
+        ua = YTDL_OPTS["http_headers"]["User-Agent"]
+        try:
+            # start and warm up the workers before measuring.
+            await asyncio.gather(
+                *[
+                    asyncio.to_thread(pool.extract_info, s, ua, download=False)
+                    for s in args.subjects[: args.workers]
+                ],
+                return_exceptions=True,
+            )
+            await _run(
+                "process",
+                functools.partial(_process_extract, pool, ua),
+                args.subjects,
+                args.jobs,
+                args.workers,
+                args.interval,
+            )
+        finally:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
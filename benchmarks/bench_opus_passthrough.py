@@ -0,0 +1,153 @@
+"""
+Estimate how many guilds one CPU core can stream to when playing cached
+tracks through the PCM path versus Opus passthrough.
+
+Run from the repository root with the bot requirements, ffmpeg, and an
+opus library installed:
+
+    python benchmarks/bench_opus_passthrough.py --seconds 60
+    python benchmarks/bench_opus_passthrough.py --input audio_cache/some-file.opus
+
+The PCM path mirrors normal playback: FFmpegPCMAudio decodes the file,
+PCMVolumeTransformer scales it, and each frame is Opus encoded as the voice
+client would.  The passthrough path reads frames from FFmpegOpusAudio with
+codec copy, as used for Ogg/Opus cache files at 100% volume.
+Frames are read as fast as possible, and CPU time of this process and its
+ffmpeg children is divided by the audio time played.
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from discord import (  # noqa: E402
+    FFmpegOpusAudio,
+    FFmpegPCMAudio,
+    PCMVolumeTransformer,
+    opus,
+)
+
+from yeboybot.opus_loader import load_opus_lib  # noqa: E402
+
+FRAME_SECONDS = 0.02
+
+
+def make_test_file(path: str, seconds: int) -> None:
+    """Encode a test tone to Ogg/Opus like the cache would store it."""
+    subprocess.run(
+        [
+            shutil.which("ffmpeg") or "ffmpeg",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=frequency=440:sample_rate=48000:duration={seconds}",
+            "-ac",
+            "2",
+            "-c:a",
+            "libopus",
+            "-b:a",
+            "128k",
+            "-f",
+            "ogg",
+            path,
+        ],
+        check=True,
+    )
+
+
+def _cpu_times() -> Tuple[float, float]:
+    """Get CPU seconds used by this process and by waited-for children."""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (own.ru_utime + own.ru_stime, kids.ru_utime + kids.ru_stime)
+
+
+def run_pcm(path: str) -> int:
+    """Play through the PCM path and return the number of frames sent."""
+    source = PCMVolumeTransformer(FFmpegPCMAudio(path, options="-vn"), 0.5)
+    encoder = opus.Encoder()
+    frames = 0
+    try:
+        while True:
+            data = source.read()
+            if not data:
+                break
+            encoder.encode(data, encoder.SAMPLES_PER_FRAME)
+            frames += 1
+    finally:
+        source.cleanup()
+    return frames
+
+
+def run_passthrough(path: str) -> int:
+    """Play through Opus passthrough and return the number of frames sent."""
+    source = FFmpegOpusAudio(path, options="-vn", codec="copy")
+    frames = 0
+    try:
+        while source.read():
+            frames += 1
+    finally:
+        source.cleanup()
+    return frames
+
+
+def measure(name: str, play: Callable[[str], int], path: str) -> Dict[str, float]:
+    """Run `play` once and report CPU cost per second of audio."""
+    own_before, kids_before = _cpu_times()
+    start = time.perf_counter()
+    frames = play(path)
+    elapsed = time.perf_counter() - start
+    own_after, kids_after = _cpu_times()
+
+    audio_seconds = frames * FRAME_SECONDS
+    cpu = (own_after - own_before) + (kids_after - kids_before)
+    per_audio_second = cpu / audio_seconds if audio_seconds else 0.0
+    guilds = 1 / per_audio_second if per_audio_second else 0.0
+    print(
+        f"{name:>12}:  {audio_seconds:7.1f} s audio in {elapsed:6.2f} s,  "
+        f"{per_audio_second * 100:6.3f}% of a core per stream,  "
+        f"~{guilds:,.0f} guilds per core"
+    )
+    return {"cpu_per_audio_second": per_audio_second, "guilds_per_core": guilds}
+
+
+def main() -> None:
+    """Parse args and run both playback paths."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--input", type=str, default="")
+    parser.add_argument("--seconds", type=int, default=60)
+    args = parser.parse_args()
+
+    load_opus_lib()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.input
+        if not path:
+            path = os.path.join(tmp, "bench.opus")
+            make_test_file(path, args.seconds)
+
+        pcm = measure("pcm", run_pcm, path)
+        passthrough = measure("passthrough", run_passthrough, path)
+
+    if passthrough["cpu_per_audio_second"]:
+        print(
+            "Passthrough uses "
+            f"{pcm['cpu_per_audio_second'] / passthrough['cpu_per_audio_second']:.1f}x"
+            " less CPU per stream."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Measure how long it takes to queue a large playlist by adding its entries
+one at a time with Playlist.add_entry_from_info versus the batch path in
+Playlist.import_from_info.
+
+Run from the repository root with the bot requirements installed:
+
+    python benchmarks/bench_playlist_import.py --entries 1000 --round-robin
+
+Entries are flat YouTube playlist items, so no extraction or download is
+done, and the queue starts empty for each run.  Events emitted by the
+playlist are counted by a single listener, like the one MusicPlayer adds.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yeboybot.downloader import YtdlpResponseDict  # noqa: E402
+from yeboybot.playlist import Playlist  # noqa: E402
+from yeboybot.utils import _add_logger_level  # noqa: E402
+
+# playlist logs with custom levels, normally added by setup_loggers().
+_add_logger_level("NOISY", 4, func_name="noise")
+
+
+class BenchBlocklist:
+    def __init__(self, terms: List[str]) -> None:
+        self.terms = terms
+
+    def is_blocked(self, text: str) -> bool:
+        """Same substring test as SongBlocklist."""
+        return any(t in text for t in self.terms)
+
+
+class BenchMember:
+    def __init__(self, member_id: int) -> None:
+        self.id = member_id
+
+
+def make_bot(round_robin: bool) -> Any:
+    """Build the parts of MusicBot used by Playlist while queueing entries."""
+    return SimpleNamespace(
+        loop=asyncio.get_running_loop(),
+        config=SimpleNamespace(
+            round_robin_queue=round_robin,
+            song_blocklist_enabled=True,
+            song_blocklist=BenchBlocklist(["blocked song", "youtube.com/watch?v=bad"]),
+        ),
+        permissions=SimpleNamespace(
+            for_user=lambda _member: SimpleNamespace(max_song_length=0)
+        ),
+        downloader=None,
+        filecache=None,
+    )
+
+
+def make_playlist_info(count: int) -> YtdlpResponseDict:
+    """Build flat extraction info for a YouTube playlist of `count` videos."""
+    entries: List[Dict[str, Any]] = []
+    for idx in range(count):
+        vid = f"vid{idx:08d}"
+        entries.append(
+            {
+                "_type": "url",
+                "ie_key": "Youtube",
+                "id": vid,
+                "url": f"https://www.youtube.com/watch?v={vid}",
+                "title": f"Some Artist - Some Song Title {idx}",
+                "duration": 180 + idx % 120,
+                "extractor": "youtube",
+            }
+        )
+    return YtdlpResponseDict(
+        {
+            "_type": "playlist",
+            "__input_subject": "https://www.youtube.com/playlist?list=bench",
+            "extractor": "youtube:tab",
+            "title": "Bench Playlist",
+            "entries": entries,
+        }
+    )
+
+
+async def import_per_entry(pl: Playlist, info: YtdlpResponseDict, author: Any) -> int:
+    """Queue each playlist item with its own add_entry_from_info() call."""
+    count = 0
+    for item in pl._filter_import_items(info, author=author):
+        await pl.add_entry_from_info(
+            item, head=False, defer_serialize=True, author=author
+        )
+        count += 1
+    return count
+
+
+async def import_batch(pl: Playlist, info: YtdlpResponseDict, author: Any) -> int:
+    """Queue the playlist with a single import_from_info() call."""
+    entries, _pos = await pl.import_from_info(info, head=False, author=author)
+    return len(entries)
+
+
+async def measure(
+    name: str,
+    run: Callable[[Playlist, YtdlpResponseDict, Any], Awaitable[int]],
+    count: int,
+    round_robin: bool,
+) -> float:
+    """Queue a fresh playlist with `run` and print how long it took."""
+    info = make_playlist_info(count)
+    pl = Playlist(make_bot(round_robin))
+    events = {"entry-added": 0, "entries-added": 0}
+
+    def count_event(event: str) -> Callable[..., None]:
+        def _listener(**_kwargs: Any) -> None:
+            events[event] += 1
+
+        return _listener
+
+    for event in events:
+        pl.on(event, count_event(event))
+
+    author = BenchMember(1)
+    start = time.perf_counter()
+    queued = await run(pl, info, author)
+    elapsed = time.perf_counter() - start
+    assert queued == len(pl.entries), "entries were not queued"
+    print(
+        f"{name:>9}:  {queued:,} entries in {elapsed * 1000:8.1f} ms,  "
+        f"{events['entry-added']:,} entry-added / "
+        f"{events['entries-added']:,} entries-added events"
+    )
+    return elapsed
+
+
+async def run_all(args: argparse.Namespace) -> None:
+    """Run both import styles and compare them."""
+    per_entry = await measure(
+        "per-entry", import_per_entry, args.entries, args.round_robin
+    )
+    batch = await measure("batch", import_batch, args.entries, args.round_robin)
+    print(f"Batch import is {per_entry / batch:.1f}x faster.")
+
+
+def main() -> None:
+    """Parse args and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument(
+        "--round-robin",
+        action="store_true",
+        help="Enable the RoundRobinQueue option for the playlist.",
+    )
+    args = parser.parse_args()
+    asyncio.run(run_all(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Measure how long SongBlocklist.is_blocked takes to check playlist items
+against a large block list, testing each item with `in` versus matching
+with the compiled Aho-Corasick automaton.
+
+Run from the repository root with the bot requirements installed:
+
+    python benchmarks/bench_song_blocklist.py --terms 10000 --subjects 1000
+
+Block list terms and subjects are generated to look like song titles and
+YouTube URLs, with a small share of subjects containing a blocked term.
+Like Playlist.import_from_info, both the URL and title of each item are
+checked.
+"""
+
+import argparse
+import os
+import pathlib
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from yeboybot.config import SongBlocklist  # noqa: E402
+
+# fmt: off
+WORDS = [
+    "love", "night", "dance", "heart", "fire", "dream", "summer", "rain",
+    "city", "light", "gold", "river", "shadow", "storm", "wild", "echo",
+]
+# fmt: on
+
+
+def make_terms(count: int, rng: random.Random) -> List[str]:
+    """Build `count` unique phrases and video IDs to block."""
+    terms = set()
+    while len(terms) < count:
+        if rng.random() < 0.5:
+            terms.add(f"watch?v=blk{rng.randrange(10**8):08d}")
+        else:
+            terms.add(" ".join(rng.choices(WORDS, k=3)) + f" {rng.randrange(10**4)}")
+    return sorted(terms)
+
+
+def make_subjects(
+    count: int, terms: List[str], rng: random.Random
+) -> List[Tuple[str, str]]:
+    """Build `count` (url, title) pairs, where about 1 in 20 is blocked."""
+    subjects = []
+    for idx in range(count):
+        url = f"https://www.youtube.com/watch?v=vid{idx:08d}"
+        title = f"Some Artist - {' '.join(rng.choices(WORDS, k=4))} (Official Video)"
+        if idx % 20 == 0:
+            title = f"Some Artist - {rng.choice(terms)}"
+        subjects.append((url, title))
+    return subjects
+
+
+def measure(
+    name: str, is_blocked: Callable[[str], bool], subjects: List[Tuple[str, str]]
+) -> Tuple[float, int]:
+    """Check all subjects with `is_blocked` and print how long it took."""
+    start = time.perf_counter()
+    blocked = sum(1 for url, title in subjects if is_blocked(url) or is_blocked(title))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:>9}:  {len(subjects):,} items in {elapsed * 1000:9.1f} ms,  "
+        f"{elapsed / len(subjects) * 1e6:8.1f} us per item,  {blocked:,} blocked"
+    )
+    return elapsed, blocked
+
+
+def main() -> None:
+    """Parse args, build a block list file, and check subjects both ways."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--terms", type=int, default=10000)
+    parser.add_argument("--subjects", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    terms = make_terms(args.terms, rng)
+    subjects = make_subjects(args.subjects, terms, rng)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        blocklist_file = pathlib.Path(tmp_dir).joinpath("song_blocklist.txt")
+        blocklist_file.write_text("\n".join(terms) + "\n", encoding="utf8")
+
+        start = time.perf_counter()
+        blocklist = SongBlocklist(blocklist_file)
+        print(
+            f"Loaded {len(blocklist):,} terms in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+
+    def linear(subject: str) -> bool:
+        return any(x in subject for x in blocklist.items)
+
+    linear_time, linear_blocked = measure("linear", linear, subjects)
+    matcher_time, matcher_blocked = measure(
+        "automaton", blocklist.is_blocked, subjects
+    )
+    assert linear_blocked == matcher_blocked, "matchers disagree"
+    print(f"The automaton is {linear_time / matcher_time:.1f}x faster.")
+
+
+if __name__ == "__main__":
+    main()
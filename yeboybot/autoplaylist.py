@@ -3,13 +3,14 @@ import logging
 import pathlib
 import shutil
 import time
-from collections import UserList
-from typing import TYPE_CHECKING, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
 
 from .constants import (
+    APL_COMPACT_MIN_DEAD_LINES,
     APL_FILE_APLCOPY,
     APL_FILE_DEFAULT,
     APL_FILE_HISTORY,
+    APL_TOMBSTONE_PREFIX,
     OLD_BUNDLED_AUTOPLAYLIST_FILE,
     OLD_DEFAULT_AUTOPLAYLIST_FILE,
 )
@@ -17,22 +18,46 @@ from .constants import (
 if TYPE_CHECKING:
     # Припускаємо, що ваш MusicBot успадковує discord.ext.commands.Bot (py‑cord)
     from discord.ext.commands import Bot as MusicBot  
-    StrUserList = UserList[str]
-else:
-    StrUserList = UserList
 
 log = logging.getLogger(__name__)
 
 
-class AutoPlaylist(StrUserList):
+class AutoPlaylist:
     def __init__(self, filename: pathlib.Path, bot: "MusicBot") -> None:
-        super().__init__()
         self._bot: "MusicBot" = bot
         self._file: pathlib.Path = filename
         self._removed_file = filename.with_name(f"{filename.stem}.removed.log")
-        self._update_lock: asyncio.Lock = asyncio.Lock()
+        # один замок для читання, дописування та стискання файлу.
         self._file_lock: asyncio.Lock = asyncio.Lock()
         self._is_loaded: bool = False
+        # впорядкована множина записів: ключі dict зберігають порядок додавання.
+        self._tracks: Dict[str, None] = {}
+        # рядки файлу, які більше не дають записів: надгробки, видалені та повторні записи.
+        self._dead_lines: int = 0
+        # збільшується при кожній зміні записів, щоб кеші знали, коли оновитись.
+        self._version: int = 0
+        self._data_cache: List[str] = []
+        self._data_cache_version: int = -1
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tracks)
+
+    def __contains__(self, song_subject: object) -> bool:
+        return song_subject in self._tracks
+
+    def __getitem__(self, index: int) -> str:
+        return self.data[index]
+
+    @property
+    def data(self) -> List[str]:
+        """Повертає записи автосписку як список, що створюється заново лише після змін."""
+        if self._data_cache_version != self._version:
+            self._data_cache = list(self._tracks)
+            self._data_cache_version = self._version
+        return self._data_cache
 
     @property
     def filename(self) -> str:
@@ -44,6 +69,11 @@ class AutoPlaylist(StrUserList):
         """Повертає стан завантаження автосписку. Якщо False – дані недоступні."""
         return self._is_loaded
 
+    @property
+    def version(self) -> int:
+        """Повертає номер версії записів, який змінюється після load, add_track і remove_track."""
+        return self._version
+
     @property
     def rmlog_file(self) -> pathlib.Path:
         """Повертає ім'я файлу для логування видалених записів."""
@@ -58,31 +88,112 @@ class AutoPlaylist(StrUserList):
         """
         Завантажує автосписок з файлу, якщо ще не завантажено.
         """
-        if (self._is_loaded or self._file_lock.locked()) and not force:
+        if self._is_loaded and not force:
             return
         async with self._file_lock:
+            # інше завантаження могло завершитись, поки ми чекали на замок.
+            if self._is_loaded and not force:
+                return
             try:
-                self.data = self._read_playlist()
+                self._tracks, self._dead_lines = self._read_playlist()
             except OSError:
                 log.warning("Помилка завантаження автосписку: %s", self._file)
-                self.data = []
+                self._tracks = {}
+                self._dead_lines = 0
                 self._is_loaded = False
+                self._version += 1
                 return
             self._is_loaded = True
+            self._version += 1
 
-    def _read_playlist(self) -> List[str]:
+    def _read_playlist(self) -> Tuple[Dict[str, None], int]:
         """
-        Зчитує та розбирає файл автосписку, повертаючи список URL/записів.
+        Зчитує та розбирає файл автосписку, повертаючи впорядковану множину записів
+        і кількість мертвих рядків.
+        Надгробок видаляє запис, доданий рядками вище, а повторний запис ігнорується.
+        """
+        tracks, _live_lines, dead = self._parse_lines(self._file.read_text(encoding="utf8"))
+        return tracks, dead
+
+    @staticmethod
+    def _parse_lines(text: str) -> Tuple[Dict[str, None], Dict[str, int], int]:
+        """
+        Розбирає текст автосписку.
+        Повертає записи, номер рядка, що додав кожен живий запис, та кількість мертвих рядків.
         """
         comment_char = "#"
-        playlist: List[str] = []
-        with open(self._file, "r", encoding="utf8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line or line.startswith(comment_char):
-                    continue
-                playlist.append(line)
-        return playlist
+        tracks: Dict[str, None] = {}
+        live_lines: Dict[str, int] = {}
+        dead = 0
+        for num, line in enumerate(text.split("\n")):
+            line = line.strip()
+            if line.startswith(APL_TOMBSTONE_PREFIX):
+                subject = line[len(APL_TOMBSTONE_PREFIX):].strip()
+                dead += 1
+                if subject in tracks:
+                    del tracks[subject]
+                    del live_lines[subject]
+                    dead += 1
+                continue
+            if not line or line.startswith(comment_char):
+                continue
+            if line in tracks:
+                dead += 1
+                continue
+            tracks[line] = None
+            live_lines[line] = num
+        return tracks, live_lines, dead
+
+    def _append_lines(self, lines: List[str]) -> None:
+        """
+        Дописує рядки в кінець файлу автосписку, не перечитуючи його.
+        Порожній файл отримує заголовок, а відсутній перенос рядка в кінці додається.
+        Запис іде в текстовому режимі, як у _compact_file, тож переноси рядків однакові на Windows.
+        """
+        if not self._file.is_file():
+            self._file.touch(exist_ok=True)
+        prefix = ""
+        # перевіряємо лише останній байт, "\r\n" теж закінчується на "\n".
+        with open(self._file, "rb") as fh:
+            if fh.seek(0, 2) == 0:
+                prefix = "# MusicBot Auto Playlist\n"
+            else:
+                fh.seek(-1, 2)
+                if fh.read(1) != b"\n":
+                    prefix = "\n"
+        with open(self._file, "a", encoding="utf8") as fh:
+            fh.write(prefix + "".join(f"{line}\n" for line in lines))
+
+    def _compact_file(self) -> None:
+        """
+        Переписує файл автосписку без мертвих рядків, зберігаючи коментарі та порядок записів.
+        Файл замінюється атомарно, через тимчасовий файл.
+        """
+        text = self._file.read_text(encoding="utf8")
+        _tracks, live_lines, dead = self._parse_lines(text)
+        keep = set(live_lines.values())
+        out = []
+        for num, line in enumerate(text.split("\n")):
+            target = line.strip()
+            if target.startswith(APL_TOMBSTONE_PREFIX):
+                continue
+            if target and not target.startswith("#") and num not in keep:
+                continue
+            out.append(line)
+        tmp_file = self._file.with_name(f"{self._file.name}.tmp")
+        tmp_file.write_text("\n".join(out), encoding="utf8")
+        tmp_file.replace(self._file)
+        log.debug("Стиснуто файл автосписку %s, прибрано %s рядків.", self._file.name, dead)
+        self._dead_lines = 0
+
+    def _maybe_compact(self) -> None:
+        """Стискає файл, коли мертвих рядків забагато, тож кожна зміна коштує O(1) I/O в середньому."""
+        if self._dead_lines < max(APL_COMPACT_MIN_DEAD_LINES, len(self._tracks)):
+            return
+        try:
+            self._compact_file()
+        except (OSError, PermissionError, FileNotFoundError):
+            log.exception("Не вдалося стиснути файл автосписку: %s", self._file)
 
     async def remove_track(
         self,
@@ -93,11 +204,13 @@ class AutoPlaylist(StrUserList):
     ) -> None:
         """
         Видаляє запис (song_subject) з автосписку (і, опційно, оновлює файл).
+        Файл оновлюється дописуванням надгробка, а не переписуванням.
         """
-        if song_subject not in self.data:
+        if song_subject not in self._tracks:
             return
-        async with self._update_lock:
-            self.data.remove(song_subject)
+        async with self._file_lock:
+            self._tracks.pop(song_subject, None)
+            self._version += 1
             log.info("Видаляємо%s пісню з автосписку %s: %s",
                      " непроигравану" if ex and not isinstance(ex, UserWarning) else "",
                      self._file.name, song_subject)
@@ -113,14 +226,11 @@ class AutoPlaylist(StrUserList):
                 log.exception("Не вдалося записати лог видалення для: %s", self._file)
             if delete_from_ap:
                 log.info("Оновлення файлу автосписку...")
-                def _filter_replace(line: str, url: str) -> str:
-                    target = line.strip()
-                    return f"# Removed # {url}" if target == url else line
                 try:
-                    data = self._file.read_text(encoding="utf8").split("\n")
-                    data = [_filter_replace(x, song_subject) for x in data]
-                    text = "\n".join(data)
-                    self._file.write_text(text, encoding="utf8")
+                    self._append_lines([f"{APL_TOMBSTONE_PREFIX}{song_subject}"])
+                    # надгробок і рядок видаленого запису.
+                    self._dead_lines += 2
+                    self._maybe_compact()
                 except (OSError, PermissionError, FileNotFoundError):
                     log.exception("Не вдалося оновити файл автосписку: %s", self._file)
                 self._bot.filecache.remove_autoplay_cachemap_entry_by_url(song_subject)
@@ -128,26 +238,17 @@ class AutoPlaylist(StrUserList):
     async def add_track(self, song_subject: str) -> None:
         """
         Додає новий запис до автосписку (як у файлі, так і в пам'яті).
+        Запис дописується в кінець файлу.
         """
-        if song_subject in self.data:
+        if song_subject in self._tracks:
             log.debug("Запис уже існує у автосписку %s, пропускаємо", self._file.name)
             return
-        async with self._update_lock:
-            self.data.append(song_subject)
+        async with self._file_lock:
+            self._tracks[song_subject] = None
+            self._version += 1
             log.info("Додаємо новий запис до автосписку %s: %s", self._file.name, song_subject)
             try:
-                if not self._file.is_file():
-                    self._file.touch(exist_ok=True)
-                with open(self._file, "r+", encoding="utf8") as fh:
-                    lines = fh.readlines()
-                    if not lines:
-                        lines.append("# MusicBot Auto Playlist\n")
-                    if lines[-1].endswith("\n"):
-                        lines.append(f"{song_subject}\n")
-                    else:
-                        lines.append(f"\n{song_subject}\n")
-                    fh.seek(0)
-                    fh.writelines(lines)
+                self._append_lines([song_subject])
             except (OSError, PermissionError, FileNotFoundError):
                 log.exception("Не вдалося зберегти файл автосписку: %s", self._file)
 
@@ -163,6 +264,9 @@ class AutoPlaylistManager:
         self._apl_file_history = self._apl_dir.joinpath(APL_FILE_HISTORY)
         self._apl_file_usercopy = self._apl_dir.joinpath(APL_FILE_APLCOPY)
         self._playlists: Dict[str, AutoPlaylist] = {}
+        # об'єднання записів усіх завантажених автосписків та версії, з яких його зібрано.
+        self._loaded_tracks: Set[str] = set()
+        self._loaded_tracks_stamp: Tuple[Tuple[str, int], ...] = ()
         self.setup_autoplaylist()
 
     def setup_autoplaylist(self) -> None:
@@ -212,12 +316,22 @@ class AutoPlaylistManager:
         return [pl for pl in self._playlists.values() if pl.loaded]
 
     @property
-    def loaded_tracks(self) -> List[str]:
-        tracks: Set[str] = set()
-        for pl in self._playlists.values():
-            if pl.loaded:
-                tracks = tracks.union(set(pl))
-        return list(tracks)
+    def loaded_tracks(self) -> Set[str]:
+        """
+        Повертає множину записів усіх завантажених автосписків для перевірки за O(1).
+        Множина збирається заново лише тоді, коли змінилась версія одного з автосписків.
+        Не змінюйте повернуту множину.
+        """
+        stamp = tuple(
+            (name, pl.version) for name, pl in self._playlists.items() if pl.loaded
+        )
+        if stamp != self._loaded_tracks_stamp:
+            tracks: Set[str] = set()
+            for pl in self.loaded_playlists:
+                tracks.update(pl)
+            self._loaded_tracks = tracks
+            self._loaded_tracks_stamp = stamp
+        return self._loaded_tracks
 
     def discover_playlists(self) -> None:
         for pfile in self._apl_dir.iterdir():
@@ -3,6 +3,7 @@ import sys
 import logging
 import asyncio
 import configparser
+import pathlib
 
 import discord
 from discord.ext import commands
@@ -18,6 +19,7 @@ from .music import setup as setup_music
 from .help import setup as setup_help
 from .rank import setup as setup_rank
 from .autoplaylist import AutoPlaylistManager
+from .constants import DEFAULT_DATA_DIR
 
 # Налаштовуємо логування
 setup_logging()
@@ -53,8 +55,19 @@ def create_bot() -> commands.Bot:
     async def on_ready():
         logger.info(f"Бот запущено як {bot.user} ({bot.user.id})")
 
+    attach_queue_store(bot)
     return bot
 
+def attach_queue_store(bot_instance: commands.Bot) -> None:
+    """Створює сховище стану черги, яке MusicPlayer використовує для збереження та відновлення."""
+    try:
+        # модулі плеєра тягнуть за собою yt-dlp та інші залежності MusicBot.
+        from .queue_store import QueueStateStore
+    except ImportError as e:
+        logger.warning(f"Збереження стану черги вимкнено: {e}")
+        return
+    bot_instance.queue_store = QueueStateStore(bot_instance, pathlib.Path(DEFAULT_DATA_DIR))
+
 async def load_extensions(bot_instance: commands.Bot) -> None:
     """Завантажуємо всі потрібні розширення (cogs) для бота."""
     await setup_moderation(bot_instance)
@@ -64,6 +77,18 @@ async def load_extensions(bot_instance: commands.Bot) -> None:
     await setup_rank(bot_instance)
     logger.info("Усі розширення (Cog-и) завантажено успішно.")
 
+async def close_services(bot_instance: commands.Bot) -> None:
+    """Закриває сервіси MusicBot, підключені до бота, щоб зберегти їхні дані."""
+    queue_store = getattr(bot_instance, "queue_store", None)
+    if queue_store is not None:
+        await queue_store.flush()
+    filecache = getattr(bot_instance, "filecache", None)
+    if filecache is not None:
+        await filecache.close()
+    downloader = getattr(bot_instance, "downloader", None)
+    if downloader is not None:
+        await downloader.close()
+
 async def main():
     global bot  # оголошуємо bot як глобальну, щоб його було видно в інших місцях, якщо потрібно
     bot = create_bot()
@@ -74,6 +99,8 @@ async def main():
     except Exception as e:
         logger.error(f"Помилка при старті бота: {e}")
         sys.exit(1)
+    finally:
+        await close_services(bot)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -32,6 +32,7 @@ from .constants import (
     DEFAULT_LOG_LEVEL,
     DEFAULT_LOGS_KEPT,
     DEFAULT_LOGS_ROTATE_FORMAT,
+    DEFAULT_MAX_DL_THREADS,
     DEFAULT_MEDIA_FILE_DIR,
     DEFAULT_OPTIONS_FILE,
     DEFAULT_PLAYLIST_DIR,
@@ -40,8 +41,11 @@ from .constants import (
     DEPRECATED_USER_BLACKLIST,
     EXAMPLE_OPTIONS_FILE,
     MAXIMUM_LOGS_LIMIT,
+    MAX_PRE_DOWNLOAD_WINDOW,
+    MAX_READ_AHEAD_FRAMES,
 )
 from .exceptions import HelpfulError
+from .lib.aho_corasick import AhoCorasick
 from .utils import (
     format_size_from_bytes,
     format_size_to_bytes,
@@ -329,6 +333,17 @@ class Config:
             getter="getdatasize",
             comment="If SaveVideos is enabled, set a limit on how much storage space should be used.",
         )
+        self.storage_limit_low_percent: int = self.register.init_option(
+            section="MusicBot",
+            option="StorageLimitLowPercent",
+            dest="storage_limit_low_percent",
+            default=ConfigDefaults.storage_limit_low_percent,
+            getter="getint",
+            comment=(
+                "When the cache goes over StorageLimitBytes, the least recently played files are deleted\n"
+                "until the cache is this percent of the limit.  Lower values clean up less often."
+            ),
+        )
         self.storage_limit_days: int = self.register.init_option(
             section="MusicBot",
             option="StorageLimitDays",
@@ -345,6 +360,31 @@ class Config:
             getter="getboolean",
             comment="If SaveVideos is enabled, never purge auto playlist songs from the cache.",
         )
+        self.opus_cache: bool = self.register.init_option(
+            section="MusicBot",
+            option="OpusCache",
+            dest="opus_cache",
+            default=ConfigDefaults.opus_cache,
+            getter="getboolean",
+            comment=(
+                "Store downloaded media as 48 kHz Ogg/Opus files.\n"
+                "When volume is at 100% and no audio filters are needed, these files are\n"
+                "played without decoding and re-encoding, which uses much less CPU."
+            ),
+        )
+        self.read_ahead_frames: int = self.register.init_option(
+            section="MusicBot",
+            option="ReadAheadFrames",
+            dest="read_ahead_frames",
+            default=ConfigDefaults.read_ahead_frames,
+            getter="getint",
+            comment=(
+                "Number of 20 ms audio frames to decode ahead of playback in memory.\n"
+                "A buffer lets playback ride out short stalls in ffmpeg or the network,\n"
+                "at the cost of about 4 KB of memory per frame for each playing guild.\n"
+                f"For example 50 buffers one second.  Set to 0 to disable, the maximum is {MAX_READ_AHEAD_FRAMES}."
+            ),
+        )
         self.now_playing_mentions: bool = self.register.init_option(
             section="MusicBot",
             option="NowPlayingMentions",
@@ -440,6 +480,91 @@ class Config:
                 "Currently this option does not apply to auto-playlist or songs added to an empty queue."
             ),
         )
+        self.pre_download_window: int = self.register.init_option(
+            section="MusicBot",
+            option="PreDownloadWindow",
+            dest="pre_download_window",
+            default=ConfigDefaults.pre_download_window,
+            getter="getint",
+            comment=(
+                "Number of songs at the front of the queue to download ahead of playback.\n"
+                "More songs avoid waiting on downloads when skipping several songs in a row.\n"
+                f"Requires PreDownloadNextSong.  The minimum is 1 and the maximum is {MAX_PRE_DOWNLOAD_WINDOW}."
+            ),
+        )
+        self.pre_download_limit_bytes: int = self.register.init_option(
+            section="MusicBot",
+            option="PreDownloadLimitBytes",
+            dest="pre_download_limit_bytes",
+            default=ConfigDefaults.pre_download_limit_bytes,
+            getter="getdatasize",
+            comment=(
+                "Stop downloading more songs ahead once the downloaded ones reach this size.\n"
+                "Songs are also not downloaded ahead while the cache is over StorageLimitBytes.\n"
+                "The next song is always downloaded.  Set to 0 to disable."
+            ),
+        )
+        self.extraction_threads: int = self.register.init_option(
+            section="MusicBot",
+            option="ExtractionThreads",
+            dest="extraction_threads",
+            default=ConfigDefaults.extraction_threads,
+            getter="getint",
+            comment=(
+                "Number of threads MusicBot may use to look up media info for searches and links.\n"
+                "These are kept apart from downloads so long downloads cannot delay user commands.\n"
+                "Set to 0 to size this automatically from the number of CPUs."
+            ),
+        )
+        self.download_threads: int = self.register.init_option(
+            section="MusicBot",
+            option="DownloadThreads",
+            dest="download_threads",
+            default=ConfigDefaults.download_threads,
+            getter="getint",
+            comment=(
+                "Number of threads MusicBot may use to download media at the same time.\n"
+                f"Set to 0 to use the default of {DEFAULT_MAX_DL_THREADS}."
+            ),
+        )
+        self.download_rate_limit: int = self.register.init_option(
+            section="MusicBot",
+            option="DownloadRateLimit",
+            dest="download_rate_limit",
+            default=ConfigDefaults.download_rate_limit,
+            getter="getdatasize",
+            comment=(
+                "Limit the total bandwidth used by all media downloads, per second.\n"
+                "The limit is shared between downloads running at the same time.\n"
+                "Accepts an exact number of bytes or a short-hand notation like 2 MB.\n"
+                "Set to 0 to disable the limit."
+            ),
+        )
+        self.ytdlp_process_workers: int = self.register.init_option(
+            section="MusicBot",
+            option="YtdlpProcessWorkers",
+            dest="ytdlp_process_workers",
+            default=ConfigDefaults.ytdlp_process_workers,
+            getter="getint",
+            comment=(
+                "Experimental option to run yt-dlp info extraction in separate worker processes.\n"
+                "This keeps heavy playlist and search parsing from causing playback stutter,\n"
+                "at the cost of extra memory for each worker process.\n"
+                "Set the number of worker processes to use, or 0 to disable."
+            ),
+        )
+        self.max_subprocesses: int = self.register.init_option(
+            section="MusicBot",
+            option="MaxSubprocesses",
+            dest="max_subprocesses",
+            default=ConfigDefaults.max_subprocesses,
+            getter="getint",
+            comment=(
+                "Maximum number of ffmpeg and ffprobe processes MusicBot may run at once for\n"
+                "probing and analysing media.  Playback processes are not counted.\n"
+                "Set to 0 to size this automatically from the number of CPUs."
+            ),
+        )
         self.status_message: str = self.register.init_option(
             section="MusicBot",
             option="StatusMessage",
@@ -492,6 +617,18 @@ class Config:
             getter="getboolean",
             comment="Tries to use ffmpeg to get volume normalizing options for use in playback.",
         )
+        self.deferred_equalization: bool = self.register.init_option(
+            section="MusicBot",
+            option="DeferredEqualization",
+            dest="deferred_equalization",
+            default=ConfigDefaults.deferred_equalization,
+            getter="getboolean",
+            comment=(
+                "When experimental equalization is enabled, start tracks right away with a "
+                "dynamic normalization filter and measure loudness in the background.\n"
+                "Later plays of the same file use the measured values."
+            ),
+        )
         self.embeds: bool = self.register.init_option(
             section="MusicBot",
             option="UseEmbeds",
@@ -1028,6 +1165,52 @@ class Config:
             )
             self.default_speed = max(min(self.default_speed, 100.0), 0.5)
 
+        if self.extraction_threads < 0 or self.download_threads < 0:
+            log.warning(
+                "ExtractionThreads and DownloadThreads cannot be negative. "
+                "Negative values will be sized automatically instead."
+            )
+            self.extraction_threads = max(0, self.extraction_threads)
+            self.download_threads = max(0, self.download_threads)
+
+        if self.ytdlp_process_workers < 0:
+            log.warning(
+                "YtdlpProcessWorkers cannot be negative, worker processes will be disabled."
+            )
+            self.ytdlp_process_workers = 0
+
+        if self.max_subprocesses < 0:
+            log.warning(
+                "MaxSubprocesses cannot be negative, it will be sized automatically."
+            )
+            self.max_subprocesses = 0
+
+        if not 0 <= self.read_ahead_frames <= MAX_READ_AHEAD_FRAMES:
+            log.warning(
+                "ReadAheadFrames must be between 0 and %s, it will be clamped.",
+                MAX_READ_AHEAD_FRAMES,
+            )
+            self.read_ahead_frames = min(
+                max(0, self.read_ahead_frames), MAX_READ_AHEAD_FRAMES
+            )
+
+        if not 1 <= self.storage_limit_low_percent <= 100:
+            log.warning(
+                "StorageLimitLowPercent must be between 1 and 100, it will be clamped."
+            )
+            self.storage_limit_low_percent = min(
+                max(1, self.storage_limit_low_percent), 100
+            )
+
+        if not 1 <= self.pre_download_window <= MAX_PRE_DOWNLOAD_WINDOW:
+            log.warning(
+                "PreDownloadWindow must be between 1 and %s, it will be clamped.",
+                MAX_PRE_DOWNLOAD_WINDOW,
+            )
+            self.pre_download_window = min(
+                max(1, self.pre_download_window), MAX_PRE_DOWNLOAD_WINDOW
+            )
+
         if self.enable_local_media and not self.media_file_dir.is_dir():
             self.media_file_dir.mkdir(exist_ok=True)
 
@@ -1259,8 +1442,11 @@ class ConfigDefaults:
     skips_required: int = 4
     skip_ratio_required: float = 0.5
     save_videos: bool = True
+    opus_cache: bool = False
+    read_ahead_frames: int = 0
     storage_retain_autoplay: bool = True
     storage_limit_bytes: int = 0
+    storage_limit_low_percent: int = 90
     storage_limit_days: int = 0
     now_playing_mentions: bool = False
     auto_summon: bool = True
@@ -1277,6 +1463,7 @@ class ConfigDefaults:
     write_current_song: bool = False
     allow_author_skip: bool = True
     use_experimental_equalization: bool = False
+    deferred_equalization: bool = False
     embeds: bool = True
     queue_length: int = 10
     remove_ap: bool = True
@@ -1313,6 +1500,13 @@ class ConfigDefaults:
 
     ytdlp_use_oauth2: bool = False
     pre_download_next_song: bool = True
+    pre_download_window: int = 1
+    pre_download_limit_bytes: int = 0
+    extraction_threads: int = 0
+    download_threads: int = 0
+    ytdlp_process_workers: int = 0
+    download_rate_limit: int = 0
+    max_subprocesses: int = 0
 
     song_blocklist: Set[str] = set()
     user_blocklist: Set[int] = set()
@@ -2163,6 +2357,7 @@ class Blocklist:
                             line = line.split(self._comment_char, maxsplit=1)[0].strip()
 
                         self.items.add(line)
+            self._items_changed()
             return True
         except OSError:
             log.error(
@@ -2201,6 +2396,7 @@ class Blocklist:
                 for item in items:
                     f.write(f"{item}{space}{comment}\n")
                     self.items.add(item)
+            self._items_changed()
             return True
         except OSError:
             log.error(
@@ -2210,6 +2406,12 @@ class Blocklist:
             )
         return False
 
+    def _items_changed(self) -> None:
+        """
+        Called after items are loaded, added, or removed, so subclasses can
+        update anything built from them.
+        """
+
     def remove_items(self, items: Iterable[str]) -> bool:
         """
         Find and remove the given `items` from the block list file.
@@ -2220,6 +2422,7 @@ class Blocklist:
             return False
 
         self.items.difference_update(set(items))
+        self._items_changed()
 
         try:
             # read the original file in and remove lines with our items.
@@ -2303,11 +2506,17 @@ class UserBlocklist(Blocklist):
 
 
 class SongBlocklist(Blocklist):
+    # below this many items, testing each item is faster than the automaton.
+    MATCHER_MIN_ITEMS = 64
+
     def __init__(self, blocklist_file: pathlib.Path, comment_char: str = "#") -> None:
         """
         A SongBlocklist manages a block list which contains song URLs or other
         words and phrases that should be blocked from playback.
+        Large lists are compiled into an Aho-Corasick automaton, so checking
+        a subject takes time linear in its length rather than in list size.
         """
+        self._matcher: Optional[AhoCorasick] = None
         c = comment_char
         create_file_ifnoexist(
             blocklist_file,
@@ -2329,4 +2538,13 @@ class SongBlocklist(Blocklist):
 
         :param: song_subject:  Any input the bot player commands will take or pass to ytdl extraction.
         """
+        if self._matcher is not None:
+            return self._matcher.contains_any(song_subject)
         return any(x in song_subject for x in self.items)
+
+    def _items_changed(self) -> None:
+        """Rebuild the matcher from the current items."""
+        if len(self.items) >= self.MATCHER_MIN_ITEMS:
+            self._matcher = AhoCorasick(self.items)
+        else:
+            self._matcher = None
@@ -1,5 +1,5 @@
 import subprocess
-from typing import List
+from typing import List, Tuple
 
 VERSION: str = ""
 
@@ -33,9 +33,11 @@ DEFAULT_DATA_DIR: str = "data/"
 # File names within the DEFAULT_DATA_DIR or guild folders.
 DATA_FILE_SERVERS: str = "server_names.txt"
 DATA_FILE_CACHEMAP: str = "playlist_cachemap.json"
+DATA_FILE_CACHE_MANIFEST: str = "audio_cache_manifest.json"
 DATA_FILE_COOKIES: str = "cookies.txt"  # No support for this, go read yt-dlp docs.
 DATA_FILE_YTDLP_OAUTH2: str = "oauth2.token"
 DATA_GUILD_FILE_QUEUE: str = "queue.json"
+DATA_GUILD_FILE_QUEUE_JOURNAL: str = "queue.journal"
 DATA_GUILD_FILE_CUR_SONG: str = "current.txt"
 DATA_GUILD_FILE_OPTIONS: str = "options.json"
 
@@ -48,6 +50,11 @@ EXAMPLE_COMMAND_ALIAS_FILE: str = "config/example_aliases.json"
 APL_FILE_DEFAULT: str = "default.txt"
 APL_FILE_HISTORY: str = "history.txt"
 APL_FILE_APLCOPY: str = "autoplaylist.txt"
+# Line appended to an autoplaylist file to mark a track as removed.
+APL_TOMBSTONE_PREFIX: str = "# Removed # "
+# Autoplaylist files are compacted once they hold this many dead lines, and
+# at least as many dead lines as live tracks.
+APL_COMPACT_MIN_DEAD_LINES: int = 256
 
 # Logging related constants
 DEFAULT_MUSICBOT_LOG_FILE: str = "logs/musicbot.log"
@@ -81,13 +88,53 @@ VOICE_CLIENT_RECONNECT_TIMEOUT: int = 5
 # Each retry increases the timeout by multiplying attempts by the above timeout.
 VOICE_CLIENT_MAX_RETRY_CONNECT: int = 5
 
-# Maximum number of threads MusicBot will use for downloading and extracting info.
-DEFAULT_MAX_INFO_DL_THREADS: int = 2
+# Default number of threads MusicBot will use for extracting media info.
+# Info extraction is mostly waiting on the network, so it can use more threads.
+DEFAULT_MAX_INFO_THREADS: int = 4
+# Upper limit for extraction threads when sized automatically.
+DEFAULT_MAX_INFO_THREADS_AUTO: int = 8
+# Default number of threads MusicBot will use for downloading media.
+DEFAULT_MAX_DL_THREADS: int = 2
 # Maximum number of seconds to wait for HEAD request on media files.
 DEFAULT_MAX_INFO_REQUEST_TIMEOUT: int = 10
-
-# Time to wait before starting pre-download when a new song is playing.
-DEFAULT_PRE_DOWNLOAD_DELAY: float = 4.0
+# Maximum number of pooled connections used for HEAD requests on media files.
+DEFAULT_HEAD_POOL_SIZE: int = 16
+# Seconds to keep idle HEAD request connections open for reuse.
+DEFAULT_HEAD_KEEPALIVE: float = 30.0
+# Seconds to cache HEAD response headers when the URL does not say when it expires.
+DEFAULT_HEAD_CACHE_TTL: float = 600.0
+# Maximum number of URLs to keep cached HEAD response headers for.
+DEFAULT_HEAD_CACHE_MAX_SIZE: int = 1000
+# Extractors whose media content type is checked with HEAD data before queueing.
+HEAD_CONTENT_CHECKED_EXTRACTORS: Tuple[str, ...] = ("generic", "Dropbox")
+# Maximum number of ffmpeg loudness analysis runs done in the background at once.
+DEFAULT_LOUDNESS_ANALYSIS_WORKERS: int = 1
+# Single pass filter used for playback while deferred loudness analysis is pending.
+DEFERRED_EQUALIZATION_FILTER: str = "-af dynaudnorm=f=250:g=15"
+# Maximum number of files probed at once when rebuilding the audio cache manifest.
+DEFAULT_MANIFEST_SCAN_WORKERS: int = 4
+# Maximum number of cache files deleted per step of background cache eviction.
+DEFAULT_CACHE_EVICTION_BATCH: int = 20
+# Seconds to collect last played times of cache files before saving them.
+DEFAULT_CACHE_PLAYED_FLUSH_DELAY: float = 300.0
+# Upper limit for ffmpeg and ffprobe processes run at once when sized automatically.
+DEFAULT_MAX_SUBPROCESSES_AUTO: int = 4
+# Seconds to let ffprobe run before it is killed.
+DEFAULT_FFPROBE_TIMEOUT: float = 30.0
+# Seconds to let a full ffmpeg loudness analysis run before it is killed.
+DEFAULT_LOUDNESS_ANALYSIS_TIMEOUT: float = 600.0
+# Seconds to let ffmpeg run when converting a cache file to Ogg/Opus.
+DEFAULT_OPUS_TRANSCODE_TIMEOUT: float = 600.0
+# Bitrate in kbit/s used when media needs to be encoded to Opus for the cache.
+DEFAULT_OPUS_CACHE_BITRATE: int = 128
+# Upper limit for the playback read-ahead buffer, in 20 ms frames.
+MAX_READ_AHEAD_FRAMES: int = 1500
+# Upper limit for the number of queued entries downloaded ahead of playback.
+MAX_PRE_DOWNLOAD_WINDOW: int = 10
+# Seconds to collect queue changes for a guild before they are saved.
+DEFAULT_QUEUE_SAVE_INTERVAL: float = 2.0
+# Number of queue journal records written before a full snapshot replaces them.
+DEFAULT_QUEUE_SNAPSHOT_EVERY: int = 50
 
 # Time in seconds to wait before oauth2 authorization fails.
 # This provides time to authorize as well as prevent process hang at shutdown.
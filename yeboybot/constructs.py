@@ -1,9 +1,11 @@
 import asyncio
+import functools
 import inspect
 import json
 import logging
 import pydoc
 from collections import defaultdict
+from enum import IntEnum
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -13,6 +15,7 @@ from typing import (
     List,
     Optional,
     Set,
+    Tuple,
     Type,
     Union,
 )
@@ -278,6 +281,19 @@ class GuildSpecificData:
                 )
 
 
+class JobPriority(IntEnum):
+    """
+    Priority classes for background extraction and download work.
+    Lower values are handled first.
+    """
+
+    NOW_PLAYING = 0  # media needed for playback right now.
+    INTERACTIVE = 1  # user commands waiting on a reply, like play or search.
+    NEXT_UP = 2  # the entry that will be played next.
+    LOOKAHEAD = 3  # entries further ahead in the queue.
+    CACHE_PREWARM = 4  # speculative work that nobody is waiting for.
+
+
 class SkipState:
     __slots__ = ["skippers", "skip_msgs"]
 
@@ -351,6 +367,9 @@ class Response:
 
 
 class Serializer(json.JSONEncoder):
+    # Names of the arguments to inject into each _deserialize function.
+    _arg_names: Dict[Callable[..., Any], Tuple[str, ...]] = {}
+
     def default(self, o: "Serializable") -> Any:
         """
         Default method used by JSONEncoder to return serializable data for
@@ -366,19 +385,60 @@ class Serializer(json.JSONEncoder):
         """
         Read a simple JSON dict for a valid class signature, and pass the
         simple dict on to a _deserialize function in the signed class.
+        Arguments of _deserialize are found by inspecting calling frames,
+        use object_hook() to pass them explicitly instead, which is faster.
+        """
+        return cls._deserialize_object(data, None)
+
+    @classmethod
+    def object_hook(cls, **context: Any) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Get a function to use as json.loads() object_hook, which passes the
+        keyword arguments given here on to _deserialize functions by name.
+        Arguments missing from `context` are still found in calling frames.
+        """
+        return functools.partial(cls._deserialize_object, context=context)
+
+    @classmethod
+    def _deserialize_object(
+        cls, data: Dict[str, Any], context: Optional[Dict[str, Any]]
+    ) -> Any:
+        """
+        Create a Serializable from `data` if it has a class signature, using
+        the `context` dict for arguments if given.
         """
         if all(x in data for x in Serializable.CLASS_SIGNATURE):
-            # log.debug("Deserialization requested for %s", data)
-            factory = pydoc.locate(data["__module__"] + "." + data["__class__"])
-            # log.debug("Found object %s", factory)
-            if factory and issubclass(factory, Serializable):  # type: ignore[arg-type]
-                # log.debug("Deserializing %s object", factory)
-                return factory._deserialize(  # type: ignore[attr-defined]
-                    data["data"], **cls._get_vars(factory._deserialize)  # type: ignore[attr-defined]
-                )
+            factory = Serializable.get_factory(data["__module__"], data["__class__"])
+            if factory is not None:
+                func = factory._deserialize
+                if context is None:
+                    return func(data["data"], **cls._get_vars(func))
+                args = {
+                    name: context[name] if name in context else _get_variable(name)
+                    for name in cls._get_arg_names(func)
+                }
+                return func(data["data"], **args)
 
         return data
 
+    @classmethod
+    def _get_arg_names(cls, func: Callable[..., Any]) -> Tuple[str, ...]:
+        """
+        Get the names of arguments in `func` which should be injected, that
+        is positional-or-keyword arguments with a default of None.
+        Results are cached, as inspect.signature() is slow.
+        """
+        names = cls._arg_names.get(func, None)
+        if names is None:
+            params = inspect.signature(func).parameters
+            names = tuple(
+                name
+                for name, param in params.items()
+                if param.kind is param.POSITIONAL_OR_KEYWORD and param.default is None
+            )
+            cls._arg_names[func] = names
+        return names
+
     @classmethod
     def _get_vars(cls, func: Callable[..., Any]) -> Dict[str, Any]:
         """
@@ -386,23 +446,31 @@ class Serializer(json.JSONEncoder):
         to inject it's named parameters by inspecting the calling frames for
         locals which match the parameter names.
         """
-        # log.debug("Getting vars for %s", func)
-        params = inspect.signature(func).parameters.copy()
-        args = {}
-        # log.debug("Got %s", params)
-
-        for name, param in params.items():
-            # log.debug("Checking arg %s, type %s", name, param.kind)
-            if param.kind is param.POSITIONAL_OR_KEYWORD and param.default is None:
-                # log.debug("Using var %s", name)
-                args[name] = _get_variable(name)
-                # log.debug("Collected var for arg '%s': %s", name, args[name])
-
-        return args
+        return {name: _get_variable(name) for name in cls._get_arg_names(func)}
 
 
 class Serializable:
     CLASS_SIGNATURE = ("__class__", "__module__", "data")
+    # Serializable classes by module and qualified name, filled in as they are defined.
+    _registry: Dict[Tuple[str, str], Type["Serializable"]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        Serializable._registry[(cls.__module__, cls.__qualname__)] = cls
+
+    @staticmethod
+    def get_factory(module: str, name: str) -> Optional[Type["Serializable"]]:
+        """
+        Get the Serializable class with the given `module` and qualified `name`.
+        Classes from modules not imported yet are located and imported.
+        """
+        factory = Serializable._registry.get((module, name), None)
+        if factory is None:
+            located = pydoc.locate(f"{module}.{name}")
+            if isinstance(located, type) and issubclass(located, Serializable):
+                factory = located
+                Serializable._registry[(module, name)] = factory
+        return factory
 
     def _enclose_json(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Set
+
+from yt_dlp.utils import DownloadCancelled  # type: ignore[import-untyped]
+
+from .constructs import JobPriority
+from .lib.priority_executor import PriorityThreadPoolExecutor
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+log = logging.getLogger(__name__)
+
+
+class DownloadJob:
+    __slots__ = (
+        "key",
+        "priority",
+        "future",
+        "params",
+        "queued_at",
+        "started_at",
+        "cancelled",
+    )
+
+    def __init__(self, key: Hashable, priority: int) -> None:
+        """
+        Track a single download submitted to the DownloadScheduler.
+
+        :param: key:  Hashable used to find this job later, usually the entry.
+        :param: priority:  A JobPriority value for this job.
+        """
+        self.key: Hashable = key
+        self.priority: int = priority
+        self.future: Optional["Future[Any]"] = None
+        self.params: Optional[Dict[str, Any]] = None
+        self.queued_at: float = time.monotonic()
+        self.started_at: float = 0.0
+        self.cancelled: bool = False
+
+    def bind_params(self, params: Dict[str, Any]) -> None:
+        """
+        Attach the params dict of the YoutubeDL instance running this job,
+        so the scheduler can adjust its rate limit while it runs.
+        """
+        self.params = params
+
+    def progress_hook(self, _data: Dict[str, Any]) -> None:
+        """
+        A yt-dlp progress hook which aborts the download if the job was cancelled.
+
+        :raises: yt_dlp.utils.DownloadCancelled
+            if this job has been cancelled.
+        """
+        if self.cancelled:
+            raise DownloadCancelled()
+
+
+class DownloadScheduler:
+    def __init__(self, pool: PriorityThreadPoolExecutor, rate_limit: int = 0) -> None:
+        """
+        Coordinate media downloads for all guilds.
+        Jobs run in the given pool, which limits how many downloads run at once
+        and starts them in JobPriority order.  An optional bandwidth budget is
+        split evenly between running downloads using yt-dlp's ratelimit option.
+
+        :param: pool:  The executor used to run downloads.
+        :param: rate_limit:  Total bytes per second for all downloads, 0 for no limit.
+        """
+        self._pool: PriorityThreadPoolExecutor = pool
+        self._rate_limit: int = rate_limit
+        self._lock: threading.Lock = threading.Lock()
+        self._jobs: Dict[Hashable, DownloadJob] = {}
+        self._running: Set[DownloadJob] = set()
+        self._stats: Dict[int, Dict[str, float]] = {
+            int(p): self._new_class_stats() for p in JobPriority
+        }
+
+    @staticmethod
+    def _new_class_stats() -> Dict[str, float]:
+        """Make an empty set of counters for one priority class."""
+        return {
+            "submitted": 0,
+            "started": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+            "run_total": 0.0,
+        }
+
+    @property
+    def rate_limit(self) -> int:
+        """Get the total download bandwidth budget in bytes per second, or 0."""
+        return self._rate_limit
+
+    def set_rate_limit(self, rate_limit: int) -> None:
+        """Change the total bandwidth budget and apply it to running downloads."""
+        with self._lock:
+            self._rate_limit = max(0, rate_limit)
+            self._rebalance()
+
+    def _rebalance(self) -> None:
+        """Split the bandwidth budget between running jobs.  Lock must be held."""
+        share: Optional[int] = None
+        if self._rate_limit and self._running:
+            share = max(1, self._rate_limit // len(self._running))
+        for job in self._running:
+            if job.params is not None:
+                job.params["ratelimit"] = share
+
+    def is_scheduled(self, key: Hashable) -> bool:
+        """Check if a download for `key` is queued or running."""
+        return key in self._jobs
+
+    async def run(
+        self,
+        key: Optional[Hashable],
+        priority: int,
+        func: Callable[[DownloadJob], Any],
+    ) -> Any:
+        """
+        Queue `func` to run in the download pool and wait for its result.
+        The function is called with its DownloadJob, and should pass
+        job.progress_hook to yt-dlp and call job.bind_params() with the
+        params of the YoutubeDL instance it uses.
+
+        :param: key:  Hashable used to cancel or reprioritize this download.
+        :param: priority:  A JobPriority value for this download.
+
+        :raises: yt_dlp.utils.DownloadCancelled
+            if the job was cancelled while running.
+        :raises: asyncio.CancelledError
+            if the job was cancelled before it started.
+        """
+        job = DownloadJob(key if key is not None else object(), priority)
+        with self._lock:
+            self._jobs[job.key] = job
+            self._stats[self._class_of(priority)]["submitted"] += 1
+
+        job.future = self._pool.submit_with_priority(
+            priority, self._run_job, job, func
+        )
+        try:
+            return await asyncio.wrap_future(job.future)
+        except (asyncio.CancelledError, DownloadCancelled):
+            self._count(job, "cancelled")
+            raise
+        except Exception:
+            self._count(job, "failed")
+            raise
+        finally:
+            with self._lock:
+                if self._jobs.get(job.key, None) is job:
+                    del self._jobs[job.key]
+
+    def _run_job(self, job: DownloadJob, func: Callable[[DownloadJob], Any]) -> Any:
+        """Run a job inside the pool, keeping rate limits and metrics up to date."""
+        with self._lock:
+            if job.cancelled:
+                raise DownloadCancelled()
+            job.started_at = time.monotonic()
+            waited = job.started_at - job.queued_at
+            stats = self._stats[self._class_of(job.priority)]
+            stats["started"] += 1
+            stats["wait_total"] += waited
+            stats["wait_max"] = max(stats["wait_max"], waited)
+            self._running.add(job)
+            self._rebalance()
+
+        log.debug(
+            "Download job started with priority %s after waiting %.2f seconds.",
+            JobPriority(self._class_of(job.priority)).name,
+            waited,
+        )
+        try:
+            result = func(job)
+        finally:
+            with self._lock:
+                self._running.discard(job)
+                self._rebalance()
+                stats["run_total"] += time.monotonic() - job.started_at
+
+        self._count(job, "completed")
+        return result
+
+    def _count(self, job: DownloadJob, counter: str) -> None:
+        """Increment a named counter for the job's priority class."""
+        with self._lock:
+            self._stats[self._class_of(job.priority)][counter] += 1
+
+    @staticmethod
+    def _class_of(priority: int) -> int:
+        """Clamp a priority value to a known JobPriority class."""
+        return int(min(max(priority, min(JobPriority)), max(JobPriority)))
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel the download for `key`.
+        Queued downloads are dropped, running downloads are aborted by the
+        progress hook at the next progress update.
+
+        :returns:  True if a download was found for `key`.
+        """
+        with self._lock:
+            job = self._jobs.get(key, None)
+            if job is None:
+                return False
+            job.cancelled = True
+
+        if job.future is not None:
+            job.future.cancel()
+        log.debug("Cancelled download job for:  %r", key)
+        return True
+
+    def reprioritize(self, key: Hashable, priority: int) -> bool:
+        """
+        Change the priority of a queued download for `key`.
+
+        :returns:  True if a queued download was updated.
+        """
+        with self._lock:
+            job = self._jobs.get(key, None)
+            if job is None or job.future is None or job.started_at:
+                return False
+            job.priority = priority
+
+        return self._pool.reprioritize(job.future, priority)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get queue and run metrics per priority class.
+        Times are in seconds.
+        """
+        with self._lock:
+            queued: Dict[int, int] = {}
+            running: Dict[int, int] = {}
+            for job in self._jobs.values():
+                cls = self._class_of(job.priority)
+                if job in self._running:
+                    running[cls] = running.get(cls, 0) + 1
+                elif not job.started_at:
+                    queued[cls] = queued.get(cls, 0) + 1
+
+            out: Dict[str, Dict[str, Any]] = {}
+            for prio, stats in self._stats.items():
+                started = stats["started"]
+                finished = stats["completed"] + stats["failed"]
+                out[JobPriority(prio).name] = {
+                    "queued": queued.get(prio, 0),
+                    "running": running.get(prio, 0),
+                    "submitted": int(stats["submitted"]),
+                    "completed": int(stats["completed"]),
+                    "failed": int(stats["failed"]),
+                    "cancelled": int(stats["cancelled"]),
+                    "wait_avg": stats["wait_total"] / started if started else 0.0,
+                    "wait_max": stats["wait_max"],
+                    "run_avg": stats["run_total"] / finished if finished else 0.0,
+                }
+            return out
@@ -7,11 +7,22 @@ import importlib
 import logging
 import os
 import pathlib
+import time
+import urllib.parse
 from collections import UserDict
-from concurrent.futures import ThreadPoolExecutor
 from pprint import pformat
 from types import MappingProxyType
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import aiohttp
 import yt_dlp as youtube_dl  # type: ignore[import-untyped]
@@ -21,9 +32,24 @@ from yt_dlp.networking.exceptions import (  # type: ignore[import-untyped]
 from yt_dlp.utils import DownloadError  # type: ignore[import-untyped]
 from yt_dlp.utils import UnsupportedError
 
-from .constants import DEFAULT_MAX_INFO_DL_THREADS, DEFAULT_MAX_INFO_REQUEST_TIMEOUT
+from .constants import (
+    DEFAULT_HEAD_CACHE_MAX_SIZE,
+    DEFAULT_HEAD_CACHE_TTL,
+    DEFAULT_HEAD_KEEPALIVE,
+    DEFAULT_HEAD_POOL_SIZE,
+    DEFAULT_MAX_DL_THREADS,
+    DEFAULT_MAX_INFO_REQUEST_TIMEOUT,
+    DEFAULT_MAX_INFO_THREADS,
+    DEFAULT_MAX_INFO_THREADS_AUTO,
+    HEAD_CONTENT_CHECKED_EXTRACTORS,
+)
+from .constructs import JobPriority
+from .download_scheduler import DownloadJob, DownloadScheduler
 from .exceptions import ExtractionError, MusicbotException
+from .extractor_pool import ProcessExtractorPool
+from .lib.priority_executor import PriorityThreadPoolExecutor
 from .spotify import Spotify
+from .subprocess_scheduler import subprocess_scheduler
 from .ytdlp_oauth2_plugin import enable_ytdlp_oauth2_plugin
 
 if TYPE_CHECKING:
@@ -76,15 +102,43 @@ youtube_dl.utils.bug_reports_message = lambda: ""
 class Downloader:
     def __init__(self, bot: "MusicBot") -> None:
         """
-        Set up YoutubeDL and related config as well as a thread pool executor
-        to run concurrent extractions.
+        Set up YoutubeDL and related config as well as two thread pool executors.
+        One pool runs info extractions for interactive commands, the other runs
+        media downloads, so long downloads cannot starve searches.
+        Both pools run queued work in JobPriority order.
         """
         self.bot: "MusicBot" = bot
         self.download_folder: pathlib.Path = bot.config.audio_cache_path
-        # NOTE: this executor may not be good for long-running downloads...
-        self.thread_pool = ThreadPoolExecutor(
-            max_workers=DEFAULT_MAX_INFO_DL_THREADS,
+
+        # pooled session and per-URL cache used for HEAD requests on media.
+        self._head_session: Optional[aiohttp.ClientSession] = None
+        self._header_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+        info_threads, dl_threads = self._get_pool_sizes()
+        self.extract_pool = PriorityThreadPoolExecutor(
+            max_workers=info_threads,
+            thread_name_prefix="MB_Extractor",
+            default_priority=JobPriority.INTERACTIVE,
+        )
+        self.download_pool = PriorityThreadPoolExecutor(
+            max_workers=dl_threads,
             thread_name_prefix="MB_Downloader",
+            default_priority=JobPriority.NEXT_UP,
+        )
+        log.debug(
+            "Downloader using %s extraction threads and %s download threads.",
+            info_threads,
+            dl_threads,
+        )
+        self.download_scheduler = DownloadScheduler(
+            self.download_pool, bot.config.download_rate_limit
+        )
+
+        # ffmpeg and ffprobe used to probe media share one process limit.
+        subprocess_scheduler.set_max_running(bot.config.max_subprocesses)
+        log.debug(
+            "Media probing and analysis may use %s processes at once.",
+            subprocess_scheduler.max_running,
         )
 
         # force ytdlp and HEAD requests to use the same UA string.
@@ -111,6 +165,7 @@ class Downloader:
             log.info("Yt-dlp will use your configured proxy server.")
             ytdl_format_options["proxy"] = bot.config.ytdlp_proxy
 
+        oauth_opts: Optional[Dict[str, Any]] = None
         if bot.config.ytdlp_use_oauth2:
             # set the login info so oauth2 is prompted.
             ytdl_format_options["username"] = "oauth2"
@@ -141,6 +196,13 @@ class Downloader:
                 ytdl_format_options["no_warnings"] = False
             else:
                 enable_ytdlp_oauth2_plugin(self.bot.config)
+                # worker processes need to patch their own copy of yt-dlp.
+                oauth_opts = {
+                    "ytdlp_use_oauth2": True,
+                    "ytdlp_oauth2_client_id": bot.config.ytdlp_oauth2_client_id,
+                    "ytdlp_oauth2_client_secret": bot.config.ytdlp_oauth2_client_secret,
+                    "ytdlp_oauth2_url": bot.config.ytdlp_oauth2_url,
+                }
 
         if self.download_folder:
             # print("setting template to " + os.path.join(download_folder, otmpl))
@@ -154,6 +216,118 @@ class Downloader:
             {**ytdl_format_options, "ignoreerrors": True}
         )
 
+        # optionally move info extraction out into worker processes.
+        self._ytdl_opts: Dict[str, Any] = dict(ytdl_format_options)
+        self.process_pool: Optional[ProcessExtractorPool] = None
+        if bot.config.ytdlp_process_workers > 0:
+            log.info(
+                "Yt-dlp info extraction will use %s worker processes.",
+                bot.config.ytdlp_process_workers,
+            )
+            self.process_pool = ProcessExtractorPool(
+                max_workers=bot.config.ytdlp_process_workers,
+                ytdl_opts=self._get_process_ytdl_opts(),
+                oauth_opts=oauth_opts,
+            )
+
+    def _get_pool_sizes(self) -> Tuple[int, int]:
+        """
+        Get the number of extraction and download threads to use, based on
+        config options or the CPU count where options are set to 0.
+        """
+        info_threads = self.bot.config.extraction_threads
+        if info_threads <= 0:
+            cpus = os.cpu_count() or 1
+            info_threads = max(
+                DEFAULT_MAX_INFO_THREADS, min(DEFAULT_MAX_INFO_THREADS_AUTO, cpus)
+            )
+
+        dl_threads = self.bot.config.download_threads
+        if dl_threads <= 0:
+            dl_threads = DEFAULT_MAX_DL_THREADS
+
+        return (info_threads, dl_threads)
+
+    def _get_process_ytdl_opts(self) -> Dict[str, Any]:
+        """
+        Get a picklable copy of YoutubeDL options for worker processes.
+        """
+        opts = dict(self._ytdl_opts)
+        opts["http_headers"] = dict(self.http_req_headers)
+        return opts
+
+    def get_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get queue depth, worker, and wait time metrics for the executor pools,
+        download scheduler metrics for each priority class, and running and
+        queued counts for ffmpeg and ffprobe processes.
+        """
+        return {
+            "extract": self.extract_pool.stats(),
+            "download": self.download_pool.stats(),
+            "download_classes": self.download_scheduler.stats(),
+            "subprocess": subprocess_scheduler.stats(),
+        }
+
+    def shutdown(self) -> None:
+        """
+        Stop the executor pools, cancelling any work that has not started,
+        and kill any running media probing processes.
+        """
+        self.extract_pool.shutdown(wait=False, cancel_futures=True)
+        self.download_pool.shutdown(wait=False, cancel_futures=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+        subprocess_scheduler.kill_all()
+
+    async def close(self) -> None:
+        """
+        Shut down the executor pools and close the pooled HEAD request session.
+        """
+        self.shutdown()
+        self._header_cache.clear()
+        if self._head_session is not None and not self._head_session.closed:
+            await self._head_session.close()
+        self._head_session = None
+
+    def _get_head_session(self) -> aiohttp.ClientSession:
+        """
+        Get the connection-pooled session used for HEAD requests.
+        Connections are kept alive so repeated requests to the same media
+        hosts can skip TCP and TLS setup.
+        """
+        if self._head_session is None or self._head_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=DEFAULT_HEAD_POOL_SIZE,
+                keepalive_timeout=DEFAULT_HEAD_KEEPALIVE,
+                ttl_dns_cache=300,
+            )
+            self._head_session = aiohttp.ClientSession(connector=connector)
+        return self._head_session
+
+    async def _run_in_pool(
+        self,
+        func: Callable[..., Any],
+        *,
+        download: bool = False,
+        priority: int = JobPriority.INTERACTIVE,
+    ) -> Any:
+        """
+        Run `func` in the download or extraction pool with the given priority
+        and await the result.
+        """
+        pool = self.download_pool if download else self.extract_pool
+        if log.getEffectiveLevel() <= logging.EVERYTHING:  # type: ignore[attr-defined]
+            log.everything(  # type: ignore[attr-defined]
+                "Queueing %s job with priority %s, queue depth %s",
+                "download" if download else "extract",
+                JobPriority(priority).name,
+                pool.queue_depth(),
+            )
+        return await asyncio.wrap_future(
+            pool.submit_with_priority(priority, func), loop=self.bot.loop
+        )
+
     @property
     def ytdl(self) -> youtube_dl.YoutubeDL:
         """Get the Safe (errors ignored) instance of YoutubeDL."""
@@ -174,6 +348,9 @@ class Downloader:
         """
         self.safe_ytdl.params["cookiefile"] = self.bot.config.cookies_path
         self.unsafe_ytdl.params["cookiefile"] = self.bot.config.cookies_path
+        self._ytdl_opts["cookiefile"] = self.bot.config.cookies_path
+        if self.process_pool is not None:
+            self.process_pool.restart(self._get_process_ytdl_opts())
 
     def disable_ytdl_cookies(self) -> None:
         """
@@ -181,6 +358,9 @@ class Downloader:
         """
         del self.safe_ytdl.params["cookiefile"]
         del self.unsafe_ytdl.params["cookiefile"]
+        self._ytdl_opts.pop("cookiefile", None)
+        if self.process_pool is not None:
+            self.process_pool.restart(self._get_process_ytdl_opts())
 
     def randomize_user_agent_string(self) -> None:
         """
@@ -216,14 +396,23 @@ class Downloader:
         Make an HTTP HEAD request and return response headers safe for serialization.
         Header names are converted to upper case.
         If `url` is not valid the header 'X-INVALID-URL' is set to its value.
+        Requests use a pooled keep-alive session, and successful responses are
+        cached per URL until the URL expires.
         """
         test_url = self.get_url_or_none(url)
         headers: Dict[str, Any] = {}
         # do a HEAD request and add the headers to extraction info.
-        if test_url and self.bot.session:
+        if test_url:
+            cached = self._get_cached_headers(test_url)
+            if cached is not None:
+                log.everything(  # type: ignore[attr-defined]
+                    "Using cached HEAD data for:  %s", test_url
+                )
+                return cached
+
             try:
                 head_data = await self._get_headers(
-                    self.bot.session,
+                    self._get_head_session(),
                     test_url,
                     timeout=DEFAULT_MAX_INFO_REQUEST_TIMEOUT,
                     req_headers=self.http_req_headers,
@@ -239,6 +428,7 @@ class Downloader:
                         headers[new_key] = values
                     else:
                         headers[new_key] = values.pop()
+                self._set_cached_headers(test_url, headers)
             except asyncio.exceptions.TimeoutError:
                 log.warning("Checking media headers failed due to timeout.")
                 headers = {"X-HEAD-REQ-FAILED": "1"}
@@ -250,6 +440,93 @@ class Downloader:
             headers = {"X-INVALID-URL": url}
         return headers
 
+    def _get_cached_headers(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of cached HEAD headers for `url` if they have not expired."""
+        cached = self._header_cache.get(url, None)
+        if cached is None:
+            return None
+        expires_at, headers = cached
+        if expires_at <= time.time():
+            del self._header_cache[url]
+            return None
+        return dict(headers)
+
+    def _set_cached_headers(self, url: str, headers: Dict[str, Any]) -> None:
+        """
+        Cache HEAD headers for `url` until it expires.
+        Media URLs with an `expire` query parameter, like those from YouTube,
+        are cached until then.  Other URLs use a default lifetime.
+        """
+        now = time.time()
+        expires_at = now + DEFAULT_HEAD_CACHE_TTL
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        try:
+            if "expire" in query:
+                # leave a little room so the URL is not used right as it expires.
+                expires_at = min(expires_at, float(query["expire"][0]) - 30)
+        except ValueError:
+            pass
+
+        if expires_at <= now:
+            return
+
+        if len(self._header_cache) >= DEFAULT_HEAD_CACHE_MAX_SIZE:
+            for key in [k for k, v in self._header_cache.items() if v[0] <= now]:
+                del self._header_cache[key]
+            # still full, drop the oldest entries.
+            while len(self._header_cache) >= DEFAULT_HEAD_CACHE_MAX_SIZE:
+                del self._header_cache[next(iter(self._header_cache))]
+
+        self._header_cache[url] = (expires_at, dict(headers))
+
+    def _headers_from_info(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Build header data from extraction info when the extractor already
+        gave the exact size of the media, so a HEAD request can be skipped.
+        Extractors in HEAD_CONTENT_CHECKED_EXTRACTORS are never trusted here,
+        since their HEAD data is used to check the content type and to detect
+        streams.
+        A `filesize_approx` is treated as unknown, since it would fail the
+        size check of a cached file, so a HEAD request is still made for it.
+
+        :returns:  A dict of upper-case header names, or None if HEAD is needed.
+        """
+        extractor = data.get("extractor", "") or ""
+        if not extractor or extractor.startswith(HEAD_CONTENT_CHECKED_EXTRACTORS):
+            return None
+
+        filesize = data.get("filesize", None)
+        if not isinstance(filesize, int) or filesize <= 0:
+            if data.get("filesize_approx", None):
+                log.noise(  # type: ignore[attr-defined]
+                    "Extractor only gave an approximate size, using HEAD request instead."
+                )
+            return None
+
+        return {
+            "X-HEAD-REQ-SKIPPED": "1",
+            "CONTENT-LENGTH": str(filesize),
+        }
+
+    def _headers_from_manifest(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Build header data from the audio cache manifest if the media at
+        `filename` has already been downloaded, so a HEAD request can be skipped.
+
+        :returns:  A dict of upper-case header names, or None if not cached.
+        """
+        if not filename:
+            return None
+
+        record = self.bot.filecache.get_manifest_record(filename)
+        if record is None:
+            return None
+
+        return {
+            "X-HEAD-REQ-SKIPPED": "1",
+            "CONTENT-LENGTH": str(record["size"]),
+        }
+
     async def _get_headers(  # pylint: disable=dangerous-default-value
         self,
         session: aiohttp.ClientSession,
@@ -330,6 +607,7 @@ class Downloader:
 
         :param: song_subject: a song url or search subject.
         :kwparam: as_stream: If we should try to queue the URL anyway and let ffmpeg figure it out.
+        :kwparam: priority: A JobPriority used to order this call against other queued work.
 
         :returns: YtdlpResponseDict object containing sanitized extraction data.
 
@@ -380,13 +658,24 @@ class Downloader:
         if not data:
             raise ExtractionError("Song info extraction returned no data.")
 
-        # always get headers for our downloadable.
-        headers = await self.get_url_headers(data.get("url", song_subject))
+        expected_filename = self.ytdl.prepare_filename(data)
+
+        # get headers for our downloadable, unless extraction or the cache
+        # manifest already has what we need.  Content checked extractors
+        # always get a real HEAD, as their content type is validated.
+        headers = self._headers_from_info(data)
+        content_checked = str(data.get("extractor", "")).startswith(
+            HEAD_CONTENT_CHECKED_EXTRACTORS
+        )
+        if headers is None and not content_checked:
+            headers = self._headers_from_manifest(expected_filename)
+        if headers is None:
+            headers = await self.get_url_headers(data.get("url", song_subject))
 
         # if we made it here, put our request data into the extraction.
         data["__input_subject"] = song_subject
         data["__header_data"] = headers or None
-        data["__expected_filename"] = self.ytdl.prepare_filename(data)
+        data["__expected_filename"] = expected_filename
 
         # ensure the UA is randomized with each new request if not set static.
         self.randomize_user_agent_string()
@@ -414,6 +703,11 @@ class Downloader:
 
         :param: song_subject: a song url or search subject.
         :kwparam: as_stream: If we should try to queue the URL anyway and let ffmpeg figure it out.
+        :kwparam: priority: A JobPriority used to order this call against other queued work.
+            Calls with download=True go through the download scheduler, all others
+            run in the extraction pool.
+        :kwparam: download_key: A hashable, usually the entry, used to cancel or
+            reprioritize a download with the download scheduler.
 
         :returns: Dictionary of data returned from extract_info() or other
             integration. Serialization ready.
@@ -435,6 +729,9 @@ class Downloader:
         """
         log.noise(f"Called extract_info with:  '{song_subject}', {args}, {kwargs}")  # type: ignore[attr-defined]
         as_stream_url = kwargs.pop("as_stream", False)
+        priority = kwargs.pop("priority", JobPriority.INTERACTIVE)
+        download_key = kwargs.pop("download_key", None)
+        is_download = bool(kwargs.get("download", True))
 
         # check if loop is closed and exit.
         if (self.bot.loop and self.bot.loop.is_closed()) or not self.bot.loop:
@@ -474,11 +771,8 @@ class Downloader:
 
         # Actually call YoutubeDL extract_info.
         try:
-            data = await self.bot.loop.run_in_executor(
-                self.thread_pool,
-                functools.partial(
-                    self.unsafe_ytdl.extract_info, song_subject, *args, **kwargs
-                ),
+            data = await self._call_extract(
+                song_subject, is_download, priority, download_key, *args, **kwargs
             )
         except DownloadError as e:
             if not as_stream_url:
@@ -509,16 +803,10 @@ class Downloader:
             )
             song_subject = song_subject.replace(":", " ")
             # TODO: maybe this also needs some exception handling...
-            data = await self.bot.loop.run_in_executor(
-                self.thread_pool,
-                functools.partial(
-                    self.unsafe_ytdl.extract_info, song_subject, *args, **kwargs
-                ),
+            data = await self._call_extract(
+                song_subject, is_download, priority, download_key, *args, **kwargs
             )
 
-        # make sure the ytdlp data is serializable to make it more predictable.
-        data = self.ytdl.sanitize_info(data)
-
         # Extractor youtube:search returns a playlist-like result, usually with one entry
         # when searching via a play command.
         # Combine the entry dict with the info dict as if it was a top-level extraction.
@@ -534,23 +822,113 @@ class Downloader:
             log.noise(  # type: ignore[attr-defined]
                 "Extractor youtube:search returned single-entry result, replacing base info with entry info."
             )
-            entry_info = copy.deepcopy(data["entries"][0])
-            for key in entry_info:
-                data[key] = entry_info[key]
-            del data["entries"]
+            # the entries list is dropped, so the entry dict can be merged without a copy.
+            entry_info = data.pop("entries")[0]
+            data.update(entry_info)
 
         return data
 
+    async def _call_extract(
+        self,
+        song_subject: str,
+        is_download: bool,
+        priority: int,
+        download_key: Optional[Hashable],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """
+        Send an extract_info call to the extraction pool, or to the download
+        scheduler if media will be downloaded.
+        """
+        if is_download:
+            return await self.download_scheduler.run(  # type: ignore[no-any-return]
+                download_key,
+                priority,
+                functools.partial(self._download_sync, song_subject, args, kwargs),
+            )
+
+        return await self._run_in_pool(  # type: ignore[no-any-return]
+            functools.partial(self._extract_sync, song_subject, *args, **kwargs),
+            priority=priority,
+        )
+
+    def _extract_sync(
+        self, song_subject: str, *args: Any, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Blocking call to YoutubeDL.extract_info() via the unsafe instance,
+        meant to run inside the extraction pool.
+        Extractions are sent to the worker processes when enabled.
+
+        The result is passed through ytdlp's sanitize_info, so the data is
+        serializable and more predictable.
+        """
+        if self.process_pool is not None:
+            return self.process_pool.extract_info(
+                song_subject, self.http_req_headers["User-Agent"], *args, **kwargs
+            )
+
+        data = self.unsafe_ytdl.extract_info(song_subject, *args, **kwargs)
+        sanitized: Dict[str, Any] = self.unsafe_ytdl.sanitize_info(data)
+        return sanitized
+
+    def _download_sync(
+        self,
+        song_subject: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        job: DownloadJob,
+        ignore_errors: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Blocking call to YoutubeDL.extract_info() for a download job.
+        Each job gets its own YoutubeDL instance with the same options as the
+        unsafe instance, so the scheduler can cancel it through a progress
+        hook and adjust its rate limit while it runs.
+
+        :param: ignore_errors:  Use the options of the safe instance instead.
+        """
+        ytdl = youtube_dl.YoutubeDL(
+            {
+                **self._ytdl_opts,
+                "http_headers": dict(self.http_req_headers),
+                "progress_hooks": [job.progress_hook],
+                "ignoreerrors": ignore_errors,
+            }
+        )
+        job.bind_params(ytdl.params)
+        data = ytdl.extract_info(song_subject, *args, **kwargs)
+        sanitized: Dict[str, Any] = ytdl.sanitize_info(data)
+        return sanitized
+
     async def safe_extract_info(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
         """
         Awaits an event loop executor to call extract_info in a thread pool.
         Uses an instance of YoutubeDL with errors explicitly ignored to
         call extract_info with all arguments passed to this function.
+        Media is downloaded unless download is given and false, as with
+        extract_info itself.  Those calls go through the download scheduler,
+        calls with download=False run in the extraction pool.
+
+        :kwparam: priority: A JobPriority used to order this call against other queued work.
+        :kwparam: download_key: A hashable used to cancel or reprioritize a download.
         """
         log.noise(f"Called safe_extract_info with:  {args}, {kwargs}")  # type: ignore[attr-defined]
-        return await self.bot.loop.run_in_executor(
-            self.thread_pool,
+        priority = kwargs.pop("priority", JobPriority.INTERACTIVE)
+        download_key = kwargs.pop("download_key", None)
+        if kwargs.get("download", True):
+            return await self.download_scheduler.run(  # type: ignore[no-any-return]
+                download_key,
+                priority,
+                functools.partial(
+                    self._download_sync, args[0], args[1:], kwargs, ignore_errors=True
+                ),
+            )
+
+        return await self._run_in_pool(
             functools.partial(self.safe_ytdl.extract_info, *args, **kwargs),
+            priority=priority,
         )
 
     def _return_local_media(self, song_subject: str) -> "YtdlpResponseDict":
@@ -886,3 +1264,148 @@ class YtdlpResponseDict(YUserDict):
             #    return True
 
         return False
+
+
+class YtdlpRecord:
+    """
+    Compact, slotted copy of the extraction data that playlist entries use.
+    Full yt-dlp info dicts carry formats, captions, heatmaps, and thumbnail
+    lists which are never used after an entry is created.  Entries keep one
+    of these records instead, so the full dict can be freed.
+
+    The record offers the same helpers as YtdlpResponseDict where entries
+    need them.  Use the `data` property to get a small dict using yt-dlp key
+    names, suitable for serialization or for building a YtdlpResponseDict.
+    """
+
+    __slots__ = (
+        "url",
+        "webpage_url",
+        "title",
+        "duration",
+        "thumbnail_url",
+        "extractor",
+        "extractor_key",
+        "video_id",
+        "ytdl_type",
+        "input_subject",
+        "expected_filename",
+        "headers",
+    )
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        url: str = "",
+        webpage_url: str = "",
+        title: str = "",
+        duration: Optional[float] = None,
+        thumbnail_url: str = "",
+        extractor: str = "",
+        extractor_key: str = "",
+        video_id: str = "",
+        ytdl_type: str = "",
+        input_subject: str = "",
+        expected_filename: Optional[str] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.url: str = url
+        self.webpage_url: str = webpage_url
+        self.title: str = title
+        self.duration: Optional[float] = duration
+        self.thumbnail_url: str = thumbnail_url
+        self.extractor: str = extractor
+        self.extractor_key: str = extractor_key
+        self.video_id: str = video_id
+        self.ytdl_type: str = ytdl_type
+        self.input_subject: str = input_subject
+        self.expected_filename: Optional[str] = expected_filename
+        self.headers: Optional[Dict[str, Any]] = headers
+
+    @classmethod
+    def from_info(
+        cls, info: Union["YtdlpResponseDict", "YtdlpRecord"]
+    ) -> "YtdlpRecord":
+        """
+        Create a record from a YtdlpResponseDict, keeping only the fields
+        used by playlist entries.  Records are returned as-is.
+        """
+        if isinstance(info, YtdlpRecord):
+            return info
+
+        headers = info.data.get("__header_data", None)
+        return cls(
+            url=info.url,
+            webpage_url=info.webpage_url,
+            title=info.title,
+            duration=info.get("duration", None) or None,
+            thumbnail_url=info.thumbnail_url,
+            extractor=info.extractor,
+            extractor_key=info.extractor_key,
+            video_id=info.video_id,
+            ytdl_type=info.ytdl_type,
+            input_subject=info.input_subject,
+            expected_filename=info.expected_filename,
+            headers=dict(headers) if isinstance(headers, dict) else None,
+        )
+
+    def merge(self, info: Union["YtdlpResponseDict", "YtdlpRecord"]) -> None:
+        """
+        Update this record with any non-empty values from `info`.
+        """
+        other = YtdlpRecord.from_info(info)
+        for name in YtdlpRecord.__slots__:
+            value = getattr(other, name)
+            if value:
+                setattr(self, name, value)
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """
+        Get the record as a dict with the same keys used by yt-dlp info.
+        """
+        return {
+            "_type": self.ytdl_type,
+            "url": self.url,
+            "webpage_url": self.webpage_url,
+            "title": self.title,
+            "duration": self.duration,
+            "thumbnail": self.thumbnail_url,
+            "extractor": self.extractor,
+            "extractor_key": self.extractor_key,
+            "id": self.video_id,
+            "__input_subject": self.input_subject,
+            "__expected_filename": self.expected_filename,
+            "__header_data": self.headers,
+        }
+
+    @property
+    def duration_td(self) -> datetime.timedelta:
+        """
+        Returns duration as a datetime.timedelta object.
+        May contain 0 seconds duration.
+        """
+        return datetime.timedelta(seconds=self.duration or 0)
+
+    def get_playable_url(self) -> str:
+        """
+        Get a playable URL for any given response type.
+        will try 'url', then 'webpage_url'
+        """
+        if self.ytdl_type == "video":
+            if not self.webpage_url:
+                return self.url
+            return self.webpage_url
+
+        if not self.url:
+            return self.webpage_url
+        return self.url
+
+    def http_header(self, header_name: str, default: Any = None) -> Any:
+        """Get HTTP Header information if it is available."""
+        if self.headers:
+            return self.headers.get(header_name.upper(), default)
+        return default
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}(url='{self.get_playable_url()}', title='{self.title}')>"
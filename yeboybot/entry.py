@@ -1,21 +1,33 @@
 import asyncio
 import datetime
+import json
 import logging
 import os
+import pathlib
 import re
 import shutil
+import time
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Union
 
 import discord
 from yt_dlp.utils import (  # type: ignore[import-untyped]
     ContentTooShortError,
+    DownloadCancelled,
     YoutubeDLError,
 )
 
-from .constructs import Serializable
-from .downloader import YtdlpResponseDict
+from .constants import (
+    DEFAULT_FFPROBE_TIMEOUT,
+    DEFAULT_LOUDNESS_ANALYSIS_TIMEOUT,
+    DEFAULT_OPUS_CACHE_BITRATE,
+    DEFAULT_OPUS_TRANSCODE_TIMEOUT,
+    DEFERRED_EQUALIZATION_FILTER,
+)
+from .constructs import JobPriority, Serializable
+from .downloader import YtdlpRecord, YtdlpResponseDict
 from .exceptions import ExtractionError, InvalidDataError, MusicbotException
 from .spotify import Spotify
+from .subprocess_scheduler import subprocess_scheduler
 
 if TYPE_CHECKING:
     from .downloader import Downloader
@@ -57,6 +69,7 @@ class BasePlaylistEntry(Serializable):
         self.cache_busted: bool = False
         self._is_downloading: bool = False
         self._is_downloaded: bool = False
+        self._ready_priority: int = JobPriority.CACHE_PREWARM
         self._waiting_futures: List[AsyncFuture] = []
         self._task_pool: Set[AsyncTask] = set()
 
@@ -113,11 +126,16 @@ class BasePlaylistEntry(Serializable):
         """
         raise NotImplementedError
 
-    def get_ready_future(self) -> AsyncFuture:
+    def get_ready_future(
+        self, priority: int = JobPriority.NOW_PLAYING
+    ) -> AsyncFuture:
         """
         Returns a future that will fire when the song is ready to be played.
         The future will either fire with the result (being the entry) or an exception
         as to why the song download failed.
+
+        :param: priority:  A JobPriority used to order extraction and download
+            work for this entry.  The most urgent priority requested is kept.
         """
         future: AsyncFuture = asyncio.Future()
         if self.is_downloaded:
@@ -125,6 +143,10 @@ class BasePlaylistEntry(Serializable):
             future.set_result(self)
 
         else:
+            if priority < self._ready_priority:
+                self._ready_priority = priority
+                if self._is_downloading:
+                    self._reprioritize_download(priority)
             # If we request a ready future, let's ensure that it'll actually resolve at one point.
             self._waiting_futures.append(future)
             task = asyncio.create_task(self._download(), name="MB_EntryReadyTask")
@@ -135,6 +157,24 @@ class BasePlaylistEntry(Serializable):
         log.debug("Created future for %r", self)
         return future
 
+    def _reprioritize_download(self, priority: int) -> None:
+        """
+        Called when a more urgent priority is requested while the entry is
+        already getting ready.  Entries which download media should pass the
+        new priority on to any queued work.
+        """
+        return
+
+    def cancel_download(self) -> None:
+        """
+        Cancel any work being done to make this entry ready, and cancel any
+        futures waiting on it.  Used when the entry is removed from the queue.
+        """
+        for task in list(self._task_pool):
+            task.cancel()
+        self._for_each_future(lambda future: future.cancel())
+        self._ready_priority = JobPriority.CACHE_PREWARM
+
     def _for_each_future(self, cb: Callable[..., Any]) -> None:
         """
         Calls `cb` for each future that is not canceled.
@@ -165,29 +205,262 @@ class BasePlaylistEntry(Serializable):
         return f"<{type(self).__name__}(url='{self.url}', title='{self.title}' file='{self.filename}')>"
 
 
-async def run_command(command: List[str]) -> bytes:
+async def run_command(
+    command: List[str],
+    *,
+    priority: int = JobPriority.NEXT_UP,
+    timeout: float = 0,
+) -> bytes:
     """
     Use an async subprocess exec to execute the given `command`
     This method will wait for then return the output.
+    Commands run through the shared SubprocessScheduler, which limits how many
+    processes run at once and starts waiting commands by `priority`.
 
     :param: command:
         Must be a list of arguments, where element 0 is an executable path.
+    :param: priority:  A JobPriority value for this command.
+    :param: timeout:  Seconds to let the process run before killing it, 0 for no limit.
 
     :returns:  stdout concatenated with stderr as bytes.
+
+    :raises: musicbot.exceptions.FFmpegError
+        if the process was killed because it ran out of time.
+    """
+    return await subprocess_scheduler.run(command, priority=priority, timeout=timeout)
+
+
+async def probe_media(
+    input_file: str, priority: int = JobPriority.CACHE_PREWARM
+) -> Optional[Dict[str, Any]]:
+    """
+    Use ffprobe to get the duration, codec, and sample rate of `input_file`.
+    Values are taken from the container and the first audio stream.
+
+    :returns:  A dict with duration, codec, and sample_rate keys, where values
+        may be None if unknown, or None if ffprobe is not available or failed.
+    """
+    ffprobe_bin = shutil.which("ffprobe")
+    if not ffprobe_bin:
+        log.error("Could not locate ffprobe in your path!")
+        return None
+
+    ffprobe_cmd = [
+        ffprobe_bin,
+        "-v",
+        "quiet",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "format=duration:stream=codec_name,sample_rate",
+        "-of",
+        "json",
+        input_file,
+    ]
+
+    try:
+        raw_output = await run_command(
+            ffprobe_cmd, priority=priority, timeout=DEFAULT_FFPROBE_TIMEOUT
+        )
+        data = json.loads(raw_output.decode("utf8"))
+        fmt = data.get("format", {})
+        stream = (data.get("streams", None) or [{}])[0]
+        return {
+            "duration": float(fmt.get("duration", 0)) or None,
+            "codec": stream.get("codec_name", None),
+            "sample_rate": int(stream.get("sample_rate", 0)) or None,
+        }
+    except (ValueError, UnicodeError, AttributeError):
+        log.error("ffprobe returned something that could not be used.", exc_info=True)
+    return None
+
+
+# Matches measured values in the JSON printed by the ffmpeg loudnorm filter.
+LOUDNORM_VALUE_RE = re.compile(
+    r'"(input_i|input_lra|input_tp|input_thresh|target_offset)" : '
+    r'"(-?([0-9]*\.[0-9]+))"'
+)
+
+
+async def measure_loudness(
+    input_file: str, priority: int = JobPriority.CACHE_PREWARM
+) -> Optional[Dict[str, float]]:
+    """
+    Run a full ffmpeg loudnorm analysis pass over `input_file`.
+
+    :returns:  A dict with measured input_i, input_lra, input_tp, input_thresh,
+        and target_offset values, or None if ffmpeg is not available.
+        Values that could not be parsed are set to 0.
     """
-    p = await asyncio.create_subprocess_exec(
-        # The inconsistency between the various implements of subprocess, asyncio.subprocess, and
-        # all the other process calling functions tucked into python is alone enough to be dangerous.
-        # There is a time and place for everything, and this is not the time or place for shells.
-        *command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
+    log.debug("Calculating mean volume of:  %s", input_file)
+    ffmpeg_bin = shutil.which("ffmpeg")
+    if not ffmpeg_bin:
+        log.error("Could not locate ffmpeg on your path!")
+        return None
+
+    # NOTE: this command should contain JSON, but I have no idea how to make
+    # ffmpeg spit out only the JSON.
+    ffmpeg_cmd = [
+        ffmpeg_bin,
+        "-i",
+        input_file,
+        "-af",
+        "loudnorm=I=-24.0:LRA=7.0:TP=-2.0:linear=true:print_format=json",
+        "-f",
+        "null",
+        "/dev/null",
+        "-hide_banner",
+        "-nostats",
+    ]
+
+    raw_output = await run_command(
+        ffmpeg_cmd, priority=priority, timeout=DEFAULT_LOUDNESS_ANALYSIS_TIMEOUT
     )
-    log.noise(  # type: ignore[attr-defined]
-        "Starting asyncio subprocess (%s) with command: %s", p, command
+    output = raw_output.decode("utf-8")
+
+    values = {
+        "input_i": 0.0,
+        "input_lra": 0.0,
+        "input_tp": 0.0,
+        "input_thresh": 0.0,
+        "target_offset": 0.0,
+    }
+    found: Set[str] = set()
+    for match in LOUDNORM_VALUE_RE.finditer(output):
+        if match.group(1) not in found:
+            found.add(match.group(1))
+            values[match.group(1)] = float(match.group(2))
+
+    for key in values.keys() - found:
+        log.debug("Could not parse %s in normalise json.", key)
+
+    return values
+
+
+def build_loudnorm_options(values: Dict[str, float]) -> str:
+    """
+    Build ffmpeg loudnorm filter options from measured loudness `values`.
+    """
+    return (
+        "-af loudnorm=I=-24.0:LRA=7.0:TP=-2.0:linear=true:"
+        f"measured_I={values.get('input_i', 0.0)}:"
+        f"measured_LRA={values.get('input_lra', 0.0)}:"
+        f"measured_TP={values.get('input_tp', 0.0)}:"
+        f"measured_thresh={values.get('input_thresh', 0.0)}:"
+        f"offset={values.get('target_offset', 0.0)}"
     )
-    stdout, stderr = await p.communicate()
-    return stdout + stderr
+
+
+async def get_loudnorm_options(
+    filecache: "AudioFileCache",
+    input_file: str,
+    deferred: bool = False,
+    priority: int = JobPriority.NEXT_UP,
+) -> str:
+    """
+    Get loudnorm options for `input_file`, using loudness values stored by
+    the `filecache` when they are still valid for the file.
+    New measurements are stored, so re-plays can skip the analysis.
+
+    :param: deferred:  If set and no values are stored, return a single pass
+        dynamic normalization filter right away and measure the file in the
+        background instead of waiting for the analysis.
+    :param: priority:  A JobPriority for the analysis when it is waited for.
+    """
+    values = filecache.get_loudness(input_file)
+    if values is not None:
+        log.debug("Using stored loudness data for:  %s", input_file)
+        filecache.loudness_stats["hits"] += 1
+        return build_loudnorm_options(values)
+
+    if deferred:
+        log.debug("Deferring loudness analysis for:  %s", input_file)
+        filecache.defer_loudness_analysis(input_file, measure_loudness)
+        return DEFERRED_EQUALIZATION_FILTER
+
+    start = time.monotonic()
+    values = await measure_loudness(input_file, priority=priority)
+    if values is None:
+        return ""
+
+    filecache.set_loudness(input_file, values)
+    filecache.record_loudness_measured(time.monotonic() - start, deferred=False)
+    return build_loudnorm_options(values)
+
+
+async def transcode_to_opus(
+    input_file: str, copy_audio: bool, priority: int = JobPriority.NEXT_UP
+) -> str:
+    """
+    Convert `input_file` to a 48 kHz Ogg/Opus file next to it, with the
+    same name and an .opus extension, and remove the original file.
+
+    :param: copy_audio:  Set if the input audio is already Opus, so it is only
+        moved into an Ogg container instead of being encoded again.
+    :param: priority:  A JobPriority for the ffmpeg process.
+
+    :returns:  The path of the new file, or an empty string if conversion failed.
+    """
+    ffmpeg_bin = shutil.which("ffmpeg")
+    if not ffmpeg_bin:
+        log.error("Could not locate ffmpeg on your path!")
+        return ""
+
+    output_file = str(pathlib.Path(input_file).with_suffix(".opus"))
+    temp_file = f"{output_file}.part"
+    if copy_audio:
+        codec_opts = ["-c:a", "copy"]
+    else:
+        codec_opts = [
+            "-c:a",
+            "libopus",
+            "-b:a",
+            f"{DEFAULT_OPUS_CACHE_BITRATE}k",
+            "-ar",
+            "48000",
+        ]
+
+    ffmpeg_cmd = [
+        ffmpeg_bin,
+        "-hide_banner",
+        "-nostdin",
+        "-loglevel",
+        "error",
+        "-y",
+        "-i",
+        input_file,
+        "-map",
+        "0:a:0",
+        "-vn",
+        *codec_opts,
+        "-f",
+        "ogg",
+        temp_file,
+    ]
+
+    log.debug("Converting cache file to Ogg/Opus:  %s", input_file)
+    try:
+        output = await run_command(
+            ffmpeg_cmd, priority=priority, timeout=DEFAULT_OPUS_TRANSCODE_TIMEOUT
+        )
+        if not os.path.isfile(temp_file) or not os.path.getsize(temp_file):
+            log.error(
+                "ffmpeg could not convert file to Ogg/Opus:  %s\n%s",
+                input_file,
+                output.decode("utf8", errors="replace").strip(),
+            )
+            return ""
+        os.replace(temp_file, output_file)
+        if os.path.abspath(input_file) != os.path.abspath(output_file):
+            os.unlink(input_file)
+    except (OSError, MusicbotException):
+        log.exception("Failed to convert file to Ogg/Opus:  %s", input_file)
+        return ""
+    finally:
+        if os.path.isfile(temp_file):
+            os.unlink(temp_file)
+
+    return output_file
 
 
 class URLPlaylistEntry(BasePlaylistEntry):
@@ -205,6 +478,7 @@ class URLPlaylistEntry(BasePlaylistEntry):
 
         :param: playlist:  The playlist object this entry should belong to.
         :param: info:  A YtdlResponseDict from downloader.extract_info()
+            Only a compact YtdlpRecord of the info is kept by the entry.
         """
         super().__init__()
 
@@ -214,7 +488,7 @@ class URLPlaylistEntry(BasePlaylistEntry):
         self.downloader: "Downloader" = playlist.bot.downloader
         self.filecache: "AudioFileCache" = playlist.bot.filecache
 
-        self.info: YtdlpResponseDict = info
+        self.info: YtdlpRecord = YtdlpRecord.from_info(info)
 
         if self.duration is None:
             log.info(
@@ -275,11 +549,11 @@ class URLPlaylistEntry(BasePlaylistEntry):
     def duration(self) -> Optional[float]:
         """Gets available duration data or None"""
         # duration can be 0, if so we make sure it returns None instead.
-        return self.info.get("duration", None) or None
+        return self.info.duration or None
 
     @duration.setter
     def duration(self, value: float) -> None:
-        self.info["duration"] = value
+        self.info.duration = value
 
     @property
     def duration_td(self) -> datetime.timedelta:
@@ -298,7 +572,7 @@ class URLPlaylistEntry(BasePlaylistEntry):
     @property
     def expected_filename(self) -> Optional[str]:
         """Get the expected filename from info if available or None"""
-        return self.info.get("__expected_filename", None)
+        return self.info.expected_filename
 
     def __json__(self) -> Dict[str, Any]:
         """
@@ -432,6 +706,20 @@ class URLPlaylistEntry(BasePlaylistEntry):
         """Set the playback speed to be used with ffmpeg -af:atempo filter."""
         self._playback_rate = speed
 
+    def _reprioritize_download(self, priority: int) -> None:
+        """Pass a more urgent priority on to a queued download of this entry."""
+        if self.downloader.download_scheduler.reprioritize(self, priority):
+            log.debug(
+                "Raised download priority to %s for:  %r",
+                JobPriority(priority).name,
+                self,
+            )
+
+    def cancel_download(self) -> None:
+        """Cancel any queued or running download of this entry."""
+        self.downloader.download_scheduler.cancel(self)
+        super().cancel_download()
+
     async def _ensure_entry_info(self) -> None:
         """helper to ensure this entry object has critical information"""
 
@@ -439,9 +727,11 @@ class URLPlaylistEntry(BasePlaylistEntry):
         if "open.spotify.com" in self.url.lower() and Spotify.is_url_supported(
             self.url
         ):
-            info = await self.downloader.extract_info(self.url, download=False)
+            info = await self.downloader.extract_info(
+                self.url, download=False, priority=self._ready_priority
+            )
             if info.ytdl_type == "url":
-                self.info = info
+                self.info = YtdlpRecord.from_info(info)
             else:
                 raise InvalidDataError(
                     f"Cannot download spotify links, processing error with type: {info.ytdl_type}."
@@ -449,8 +739,10 @@ class URLPlaylistEntry(BasePlaylistEntry):
 
         # if this isn't set this entry is probably from a playlist and needs more info.
         if not self.expected_filename:
-            new_info = await self.downloader.extract_info(self.url, download=False)
-            self.info.data = {**self.info.data, **new_info.data}
+            new_info = await self.downloader.extract_info(
+                self.url, download=False, priority=self._ready_priority
+            )
+            self.info.merge(new_info)
 
     async def _download(self) -> None:
         if self._is_downloading:
@@ -465,8 +757,31 @@ class URLPlaylistEntry(BasePlaylistEntry):
             # Ensure the folder that we're going to move into exists.
             self.filecache.ensure_cache_dir_exists()
 
-            # check and see if the expected file already exists in cache.
+            # check the cache manifest first, a hit needs no probing or remote checks.
+            # the file is about to be played, so the record is checked against it.
+            record = None
             if self.expected_filename:
+                record = self.filecache.get_manifest_record(
+                    self.expected_filename, verify=True
+                )
+
+            # the same media may be cached under another name, found by its source.
+            if record is None and self.info.extractor_key and self.info.video_id:
+                record = self.filecache.get_record_for_source(
+                    f"{self.info.extractor_key}:{self.info.video_id}", verify=True
+                )
+
+            if record is not None:
+                self.filename = self.filecache.manifest_record_path(record)
+                self._is_downloaded = True
+                # the pre-download window counts the bytes held by ready entries.
+                self.downloaded_bytes = record.get("size", 0)
+                if self.duration is None and record.get("duration", None):
+                    self.duration = record["duration"]
+                log.debug("Download already cached at:  %s", self.filename)
+
+            # check and see if the expected file already exists in cache.
+            elif self.expected_filename:
                 # get an existing cache path if we have one.
                 file_cache_path = self.filecache.get_if_cached(self.expected_filename)
 
@@ -475,11 +790,16 @@ class URLPlaylistEntry(BasePlaylistEntry):
                     log.warning("Download cached with different extension...")
 
                 # check if cache size matches remote, basic validation.
+                # remote size may be unknown if the HEAD request was skipped or failed.
                 if file_cache_path:
                     local_size = os.path.getsize(file_cache_path)
                     remote_size = int(self.info.http_header("CONTENT-LENGTH", 0))
+                    # remote size cannot be compared once a file was converted.
+                    cached_ext = pathlib.Path(file_cache_path).suffix
+                    if cached_ext != pathlib.Path(self.expected_filename).suffix:
+                        remote_size = 0
 
-                    if local_size != remote_size:
+                    if remote_size and local_size != remote_size:
                         log.debug(
                             "Local size different from remote size. Re-downloading..."
                         )
@@ -488,11 +808,20 @@ class URLPlaylistEntry(BasePlaylistEntry):
                         log.debug("Download already cached at:  %s", file_cache_path)
                         self.filename = file_cache_path
                         self._is_downloaded = True
+                        self.downloaded_bytes = local_size
 
                 # nothing cached, time to download for real.
                 else:
                     await self._really_download()
 
+            # convert the cache file so playback can pass Opus frames through.
+            if (
+                self.playlist.bot.config.opus_cache
+                and self.filename
+                and not self.filename.endswith(".opus")
+            ):
+                record = await self._convert_to_opus(record)
+
             # check for duration and attempt to extract it if missing.
             if self.duration is None:
                 # optional pymediainfo over ffprobe?
@@ -517,6 +846,10 @@ class URLPlaylistEntry(BasePlaylistEntry):
                         self.filename,
                     )
 
+            # keep the manifest up to date, so the next cache hit is a lookup.
+            if self.filename and (record is None or not record.get("duration", None)):
+                self.filecache.update_manifest(self.filename, duration=self.duration)
+
             if self.playlist.bot.config.use_experimental_equalization:
                 try:
                     self._aopt_eq = await self.get_mean_volume(self.filename)
@@ -542,6 +875,50 @@ class URLPlaylistEntry(BasePlaylistEntry):
         finally:
             self._is_downloading = False
 
+    async def _convert_to_opus(
+        self, record: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Replace the cache file of this entry with an Ogg/Opus copy.
+        Opus audio is copied as-is, other codecs are encoded.
+        Manifest data about the media source is kept for the new file.
+
+        :param: record:  The current manifest record of the file, if any.
+
+        :returns:  The manifest record of the new file, or `record` if
+            conversion failed.
+        """
+        if record is None:
+            record = self.filecache.get_manifest_record(self.filename)
+        copy_audio = record is not None and record.get("codec", None) == "opus"
+
+        new_filename = await transcode_to_opus(
+            self.filename, copy_audio, priority=self._ready_priority
+        )
+        if not new_filename:
+            return record
+
+        self.filename = new_filename
+        self.downloaded_bytes = os.path.getsize(new_filename)
+        self.filecache.track_file(new_filename)
+        kept: Dict[str, Any] = {}
+        if record is not None:
+            # the content hash is of the downloaded file, so duplicates of it
+            # are still found after conversion.
+            keep = (
+                "source",
+                "aliases",
+                "duplicates",
+                "content_hash",
+                "duration",
+                "downloaded_at",
+            )
+            kept = {k: record[k] for k in keep if k in record}
+        self.filecache.update_manifest(
+            new_filename, codec="opus", sample_rate=48000, **kept
+        )
+        return self.filecache.get_manifest_record(new_filename)
+
     def _get_duration_pymedia(self, input_file: str) -> Optional[float]:
         """
         Tries to use pymediainfo module to extract duration, if the module is available.
@@ -579,7 +956,11 @@ class URLPlaylistEntry(BasePlaylistEntry):
         ]
 
         try:
-            raw_output = await run_command(ffprobe_cmd)
+            raw_output = await run_command(
+                ffprobe_cmd,
+                priority=self._ready_priority,
+                timeout=DEFAULT_FFPROBE_TIMEOUT,
+            )
             output = raw_output.decode("utf8")
             return float(output)
         except (ValueError, UnicodeError):
@@ -593,83 +974,16 @@ class URLPlaylistEntry(BasePlaylistEntry):
 
     async def get_mean_volume(self, input_file: str) -> str:
         """
-        Attempt to calculate the mean volume of the `input_file` by using
-        output from ffmpeg to provide values which can be used by command
-        arguments sent to ffmpeg during playback.
+        Get ffmpeg loudnorm options for `input_file` using stored loudness
+        values when available, or by measuring the file with ffmpeg.
+        With deferred equalization, measuring happens in the background.
         """
-        log.debug("Calculating mean volume of:  %s", input_file)
-        ffmpeg_bin = shutil.which("ffmpeg")
-        if not ffmpeg_bin:
-            log.error("Could not locate ffmpeg on your path!")
-            return ""
-
-        # NOTE: this command should contain JSON, but I have no idea how to make
-        # ffmpeg spit out only the JSON.
-        ffmpeg_cmd = [
-            ffmpeg_bin,
-            "-i",
+        return await get_loudnorm_options(
+            self.playlist.bot.filecache,
             input_file,
-            "-af",
-            "loudnorm=I=-24.0:LRA=7.0:TP=-2.0:linear=true:print_format=json",
-            "-f",
-            "null",
-            "/dev/null",
-            "-hide_banner",
-            "-nostats",
-        ]
-
-        raw_output = await run_command(ffmpeg_cmd)
-        output = raw_output.decode("utf-8")
-
-        i_matches = re.findall(r'"input_i" : "(-?([0-9]*\.[0-9]+))",', output)
-        if i_matches:
-            # log.debug("i_matches=%s", i_matches[0][0])
-            i_value = float(i_matches[0][0])
-        else:
-            log.debug("Could not parse I in normalise json.")
-            i_value = float(0)
-
-        lra_matches = re.findall(r'"input_lra" : "(-?([0-9]*\.[0-9]+))",', output)
-        if lra_matches:
-            # log.debug("lra_matches=%s", lra_matches[0][0])
-            lra_value = float(lra_matches[0][0])
-        else:
-            log.debug("Could not parse LRA in normalise json.")
-            lra_value = float(0)
-
-        tp_matches = re.findall(r'"input_tp" : "(-?([0-9]*\.[0-9]+))",', output)
-        if tp_matches:
-            # log.debug("tp_matches=%s", tp_matches[0][0])
-            tp_value = float(tp_matches[0][0])
-        else:
-            log.debug("Could not parse TP in normalise json.")
-            tp_value = float(0)
-
-        thresh_matches = re.findall(r'"input_thresh" : "(-?([0-9]*\.[0-9]+))",', output)
-        if thresh_matches:
-            # log.debug("thresh_matches=%s", thresh_matches[0][0])
-            thresh = float(thresh_matches[0][0])
-        else:
-            log.debug("Could not parse thresh in normalise json.")
-            thresh = float(0)
-
-        offset_matches = re.findall(r'"target_offset" : "(-?([0-9]*\.[0-9]+))', output)
-        if offset_matches:
-            # log.debug("offset_matches=%s", offset_matches[0][0])
-            offset = float(offset_matches[0][0])
-        else:
-            log.debug("Could not parse offset in normalise json.")
-            offset = float(0)
-
-        loudnorm_opts = (
-            "-af loudnorm=I=-24.0:LRA=7.0:TP=-2.0:linear=true:"
-            f"measured_I={i_value}:"
-            f"measured_LRA={lra_value}:"
-            f"measured_TP={tp_value}:"
-            f"measured_thresh={thresh}:"
-            f"offset={offset}"
+            deferred=self.playlist.bot.config.deferred_equalization,
+            priority=self._ready_priority,
         )
-        return loudnorm_opts
 
     async def _really_download(self) -> None:
         """
@@ -683,8 +997,16 @@ class URLPlaylistEntry(BasePlaylistEntry):
                 "Download attempt %s of 3...", attempt
             )
             try:
-                info = await self.downloader.extract_info(self.url, download=True)
+                info = await self.downloader.extract_info(
+                    self.url,
+                    download=True,
+                    priority=self._ready_priority,
+                    download_key=self,
+                )
                 break
+            except DownloadCancelled as e:
+                log.info("Download cancelled:  %r", self)
+                raise ExtractionError("Download was cancelled.") from e
             except ContentTooShortError as e:
                 # this typically means connection was interrupted, any
                 # download is probably partial. we should definitely do
@@ -721,8 +1043,23 @@ class URLPlaylistEntry(BasePlaylistEntry):
         self.filename = info.expected_filename or ""
 
         # It should be safe to get our newly downloaded file size now...
-        # This should also leave self.downloaded_bytes set to 0 if the file is in cache already.
         self.downloaded_bytes = os.path.getsize(self.filename)
+        self.filecache.track_file(self.filename)
+
+        self.filecache.update_manifest(
+            self.filename,
+            source=f"{info.extractor_key}:{info.video_id}",
+            duration=info.get("duration", None) or None,
+            codec=info.get("acodec", None),
+            sample_rate=info.get("asr", None),
+            downloaded_at=time.time(),
+        )
+
+        # keep a single copy of media which is already cached from another source.
+        filename = await self.filecache.deduplicate(self.filename)
+        if filename != self.filename:
+            # the existing file has the same content, so it holds the same bytes.
+            self.filename = filename
 
 
 class StreamPlaylistEntry(BasePlaylistEntry):
@@ -1160,6 +1497,11 @@ class LocalFilePlaylistEntry(BasePlaylistEntry):
 
         self._is_downloading = True
         try:
+            filecache = self.playlist.bot.filecache
+            record = filecache.get_manifest_record(self.filename)
+            if self.duration is None and record is not None:
+                self.duration = record.get("duration", None)
+
             # check for duration and attempt to extract it if missing.
             if self.duration is None:
                 # optional pymediainfo over ffprobe?
@@ -1183,6 +1525,7 @@ class LocalFilePlaylistEntry(BasePlaylistEntry):
                         self.duration,
                         self.filename,
                     )
+                    filecache.update_manifest(self.filename, duration=self.duration)
 
             if self.playlist.bot.config.use_experimental_equalization:
                 try:
@@ -1247,7 +1590,11 @@ class LocalFilePlaylistEntry(BasePlaylistEntry):
         ]
 
         try:
-            raw_output = await run_command(ffprobe_cmd)
+            raw_output = await run_command(
+                ffprobe_cmd,
+                priority=self._ready_priority,
+                timeout=DEFAULT_FFPROBE_TIMEOUT,
+            )
             output = raw_output.decode("utf8")
             return float(output)
         except (ValueError, UnicodeError):
@@ -1261,80 +1608,13 @@ class LocalFilePlaylistEntry(BasePlaylistEntry):
 
     async def get_mean_volume(self, input_file: str) -> str:
         """
-        Attempt to calculate the mean volume of the `input_file` by using
-        output from ffmpeg to provide values which can be used by command
-        arguments sent to ffmpeg during playback.
+        Get ffmpeg loudnorm options for `input_file` using stored loudness
+        values when available, or by measuring the file with ffmpeg.
+        With deferred equalization, measuring happens in the background.
         """
-        log.debug("Calculating mean volume of:  %s", input_file)
-        ffmpeg_bin = shutil.which("ffmpeg")
-        if not ffmpeg_bin:
-            log.error("Could not locate ffmpeg on your path!")
-            return ""
-
-        # NOTE: this command should contain JSON, but I have no idea how to make
-        # ffmpeg spit out only the JSON.
-        ffmpeg_cmd = [
-            ffmpeg_bin,
-            "-i",
+        return await get_loudnorm_options(
+            self.playlist.bot.filecache,
             input_file,
-            "-af",
-            "loudnorm=I=-24.0:LRA=7.0:TP=-2.0:linear=true:print_format=json",
-            "-f",
-            "null",
-            "/dev/null",
-            "-hide_banner",
-            "-nostats",
-        ]
-
-        raw_output = await run_command(ffmpeg_cmd)
-        output = raw_output.decode("utf-8")
-
-        i_matches = re.findall(r'"input_i" : "(-?([0-9]*\.[0-9]+))",', output)
-        if i_matches:
-            # log.debug("i_matches=%s", i_matches[0][0])
-            i_value = float(i_matches[0][0])
-        else:
-            log.debug("Could not parse I in normalise json.")
-            i_value = float(0)
-
-        lra_matches = re.findall(r'"input_lra" : "(-?([0-9]*\.[0-9]+))",', output)
-        if lra_matches:
-            # log.debug("lra_matches=%s", lra_matches[0][0])
-            lra_value = float(lra_matches[0][0])
-        else:
-            log.debug("Could not parse LRA in normalise json.")
-            lra_value = float(0)
-
-        tp_matches = re.findall(r'"input_tp" : "(-?([0-9]*\.[0-9]+))",', output)
-        if tp_matches:
-            # log.debug("tp_matches=%s", tp_matches[0][0])
-            tp_value = float(tp_matches[0][0])
-        else:
-            log.debug("Could not parse TP in normalise json.")
-            tp_value = float(0)
-
-        thresh_matches = re.findall(r'"input_thresh" : "(-?([0-9]*\.[0-9]+))",', output)
-        if thresh_matches:
-            # log.debug("thresh_matches=%s", thresh_matches[0][0])
-            thresh = float(thresh_matches[0][0])
-        else:
-            log.debug("Could not parse thresh in normalise json.")
-            thresh = float(0)
-
-        offset_matches = re.findall(r'"target_offset" : "(-?([0-9]*\.[0-9]+))', output)
-        if offset_matches:
-            # log.debug("offset_matches=%s", offset_matches[0][0])
-            offset = float(offset_matches[0][0])
-        else:
-            log.debug("Could not parse offset in normalise json.")
-            offset = float(0)
-
-        loudnorm_opts = (
-            "-af loudnorm=I=-24.0:LRA=7.0:TP=-2.0:linear=true:"
-            f"measured_I={i_value}:"
-            f"measured_LRA={lra_value}:"
-            f"measured_TP={tp_value}:"
-            f"measured_thresh={thresh}:"
-            f"offset={offset}"
+            deferred=self.playlist.bot.config.deferred_equalization,
+            priority=self._ready_priority,
         )
-        return loudnorm_opts
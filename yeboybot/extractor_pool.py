@@ -0,0 +1,180 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Tuple
+
+import yt_dlp as youtube_dl  # type: ignore[import-untyped]
+from yt_dlp.networking.exceptions import (  # type: ignore[import-untyped]
+    NoSupportingHandlers,
+)
+from yt_dlp.utils import (  # type: ignore[import-untyped]
+    DownloadError,
+    UnsupportedError,
+    YoutubeDLError,
+)
+
+log = logging.getLogger(__name__)
+
+# Keys used to pass errors back from worker processes.
+# yt-dlp exceptions do not reliably survive pickling, so workers return
+# a small marker dict instead and the parent re-raises a suitable exception.
+_WORKER_ERROR_KEY = "__worker_error"
+_ERR_DOWNLOAD = "download"
+_ERR_UNSUPPORTED = "unsupported"
+_ERR_NO_HANDLERS = "no_handlers"
+_ERR_YTDL = "ytdl"
+
+# Each worker process keeps one YoutubeDL instance alive for its lifetime.
+_worker_ytdl: Optional[youtube_dl.YoutubeDL] = None
+
+
+def _init_worker(ytdl_opts: Dict[str, Any], oauth_opts: Optional[Dict[str, Any]]) -> None:
+    """
+    Initializer for worker processes.
+    Sets up OAuth2 if needed and creates the worker's YoutubeDL instance,
+    then warms it up by loading the info extractors once.
+    """
+    global _worker_ytdl  # pylint: disable=global-statement
+
+    youtube_dl.utils.bug_reports_message = lambda: ""
+
+    if oauth_opts is not None:
+        # pylint: disable=import-outside-toplevel
+        from .ytdlp_oauth2_plugin import enable_ytdlp_oauth2_plugin
+
+        enable_ytdlp_oauth2_plugin(SimpleNamespace(**oauth_opts))
+
+    _worker_ytdl = youtube_dl.YoutubeDL(ytdl_opts)
+    # loading the extractor list up front keeps the first real request fast.
+    _worker_ytdl.get_info_extractor("Generic")
+
+
+def _worker_extract(
+    song_subject: str,
+    user_agent: str,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Run extract_info in a worker process and return sanitized info.
+    Errors from yt-dlp are returned as a marker dict.
+    """
+    if _worker_ytdl is None:
+        raise RuntimeError("Extractor worker was not initialized.")
+
+    _worker_ytdl.params["http_headers"]["User-Agent"] = user_agent
+    try:
+        data = _worker_ytdl.extract_info(song_subject, *args, **kwargs)
+    except DownloadError as e:
+        err = _ERR_DOWNLOAD
+        if e.exc_info and e.exc_info[0] == UnsupportedError:
+            err = _ERR_UNSUPPORTED
+        return {_WORKER_ERROR_KEY: err, "msg": str(e)}
+    except NoSupportingHandlers as e:
+        return {_WORKER_ERROR_KEY: _ERR_NO_HANDLERS, "msg": str(e)}
+    except YoutubeDLError as e:
+        return {_WORKER_ERROR_KEY: _ERR_YTDL, "msg": str(e)}
+
+    sanitized: Dict[str, Any] = _worker_ytdl.sanitize_info(data)
+    return sanitized
+
+
+class ProcessExtractorPool:
+    def __init__(
+        self,
+        max_workers: int,
+        ytdl_opts: Dict[str, Any],
+        oauth_opts: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Manage a pool of long-lived worker processes which each hold a
+        YoutubeDL instance, so CPU heavy info extraction does not compete
+        with the event loop for the GIL.
+
+        Worker processes are started with the "spawn" method, so options must
+        be picklable.  Only sanitized info dicts are sent back to the parent.
+
+        :param: max_workers:  Number of worker processes to run.
+        :param: ytdl_opts:  Options passed to YoutubeDL in each worker.
+        :param: oauth_opts:  Config values for the OAuth2 plugin, or None to disable it.
+        """
+        self._max_workers = max_workers
+        self._ytdl_opts = ytdl_opts
+        self._oauth_opts = oauth_opts
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._start()
+
+    @property
+    def max_workers(self) -> int:
+        """Get the number of worker processes used by this pool."""
+        return self._max_workers
+
+    def _start(self) -> None:
+        """Create the process pool executor."""
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._ytdl_opts, self._oauth_opts),
+        )
+
+    def restart(self, ytdl_opts: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Replace the worker processes, optionally with new YoutubeDL options.
+        Work already running in old workers is allowed to finish.
+        """
+        if ytdl_opts is not None:
+            self._ytdl_opts = ytdl_opts
+        old_pool = self._pool
+        self._start()
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        """Stop all worker processes, cancelling queued work."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def extract_info(
+        self, song_subject: str, user_agent: str, *args: Any, **kwargs: Any
+    ) -> Dict[str, Any]:
+        """
+        Blocking call to extract info in a worker process.
+        This is meant to be called from a thread pool, not the event loop.
+
+        :returns:  Sanitized info dict from YoutubeDL.extract_info()
+
+        :raises: yt_dlp.utils.DownloadError
+            if extraction failed.  UnsupportedError is kept as exc_info type.
+        :raises: yt_dlp.networking.exceptions.NoSupportingHandlers
+            if no request handler could be used for the subject.
+        :raises: yt_dlp.utils.YoutubeDLError
+            for any other errors raised by yt-dlp.
+        """
+        if self._pool is None:
+            raise RuntimeError("Extractor process pool is shut down.")
+
+        try:
+            data = self._pool.submit(
+                _worker_extract, song_subject, user_agent, args, kwargs
+            ).result()
+        except BrokenProcessPool as e:
+            log.error("Extractor worker process died, restarting the process pool.")
+            self.restart()
+            raise YoutubeDLError("Extractor worker process failed.") from e
+
+        err = data.get(_WORKER_ERROR_KEY, None)
+        if err is None:
+            return data
+
+        msg = data.get("msg", "")
+        if err == _ERR_UNSUPPORTED:
+            raise DownloadError(msg, exc_info=(UnsupportedError, None, None))
+        if err == _ERR_DOWNLOAD:
+            raise DownloadError(msg)
+        if err == _ERR_NO_HANDLERS:
+            raise NoSupportingHandlers([], [])
+        raise YoutubeDLError(msg)
@@ -1,14 +1,35 @@
 import asyncio
 import glob
+import hashlib
 import json
 import logging
 import os
 import pathlib
 import shutil
 import time
-from typing import TYPE_CHECKING, Dict, Tuple
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
-from .constants import DATA_FILE_CACHEMAP, DEFAULT_DATA_DIR
+from .constants import (
+    DATA_FILE_CACHE_MANIFEST,
+    DATA_FILE_CACHEMAP,
+    DEFAULT_CACHE_EVICTION_BATCH,
+    DEFAULT_CACHE_PLAYED_FLUSH_DELAY,
+    DEFAULT_DATA_DIR,
+    DEFAULT_LOUDNESS_ANALYSIS_WORKERS,
+    DEFAULT_MANIFEST_SCAN_WORKERS,
+)
 from .utils import format_size_from_bytes
 
 if TYPE_CHECKING:
@@ -19,6 +40,20 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 
+class CachedFile:
+    __slots__ = ["path", "size", "last_played"]
+
+    def __init__(self, path: pathlib.Path, size: int, last_played: float) -> None:
+        """
+        Index record of a file in the audio cache directory.
+
+        :param: last_played:  Timestamp of the last time the file was used.
+        """
+        self.path: pathlib.Path = path
+        self.size: int = size
+        self.last_played: float = last_played
+
+
 class AudioFileCache:
     """
     This class provides methods to manage the audio file cache and get info about it.
@@ -37,13 +72,65 @@ class AudioFileCache:
         self.size_bytes: int = 0
         self.file_count: int = 0
 
+        # Index of files in the cache directory by name without extension, so
+        # lookups need no file system calls.  It is complete once a scan ran,
+        # and is kept up to date as files are downloaded or deleted.
+        # Records are kept in least recently played order, for eviction.
+        self._index: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._index_ready: bool = False
+        # changes made while a background scan runs, applied over its result.
+        self._index_changes: Optional[Dict[str, Optional[CachedFile]]] = None
+        self._evicting: bool = False
+        # last played times not yet added to the manifest, by name without extension.
+        self._played_pending: Dict[str, float] = {}
+        self._played_flush_scheduled: bool = False
+        self.eviction_stats: Dict[str, int] = {
+            "runs": 0,
+            "files": 0,
+            "bytes": 0,
+            "failed": 0,
+        }
+
         # Stores filenames without extension associated to a playlist URL.
         self.auto_playlist_cachemap: Dict[str, str] = {}
         self.cachemap_file_lock: asyncio.Lock = asyncio.Lock()
 
+        # Stores media info for cached files, keyed by cache file name without
+        # extension, so cache hits do not need to probe files or check remotes.
+        self.manifest_file = pathlib.Path(DEFAULT_DATA_DIR).joinpath(
+            DATA_FILE_CACHE_MANIFEST
+        )
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        # source ID and content hash -> manifest key of the cache file holding it.
+        self._source_keys: Dict[str, str] = {}
+        self._content_keys: Dict[str, str] = {}
+        self.dedup_stats: Dict[str, int] = {
+            "downloads_avoided": 0,
+            "duplicates_removed": 0,
+            "bytes_saved": 0,
+        }
+        self.manifest_file_lock: asyncio.Lock = asyncio.Lock()
+        self.manifest_rebuild_needed: bool = False
+        self._manifest_save_pending: bool = False
+
+        # Bounds background loudness analysis used by deferred equalization.
+        self._loudness_semaphore: asyncio.Semaphore = asyncio.Semaphore(
+            DEFAULT_LOUDNESS_ANALYSIS_WORKERS
+        )
+        self._loudness_pending: Set[str] = set()
+        self.loudness_stats: Dict[str, float] = {
+            "hits": 0,
+            "measured": 0,
+            "deferred": 0,
+            "failed": 0,
+            "ready_time_saved": 0.0,
+        }
+
         if self.config.auto_playlist:
             self.load_autoplay_cachemap()
 
+        self.load_manifest()
+
     @property
     def folder(self) -> pathlib.Path:
         """Get the configured cache path as a pathlib.Path"""
@@ -55,27 +142,217 @@ class AudioFileCache:
         The `filename` will be reduced to its basename and joined with the current cache_path.
         If `ignore_ext` is set, the filename will be matched without its last suffix / extension.
         An exact match is preferred, but only the first of many possible matches will be returned.
+        The first call starts building the cache index, once it is ready this
+        is a lookup without file system calls.
 
         :returns: a path string or empty string if not found.
         """
-        file_path = pathlib.Path(filename)
-        filename = file_path.name
-        cache_file_path = self.cache_path.with_name(filename)
+        filename = pathlib.Path(filename).name
+        self.start_index_scan()
+        if self._index_ready:
+            record = self._index.get(pathlib.Path(filename).stem, None)
+            if record is not None and (ignore_ext or record.path.name == filename):
+                return str(record.path)
+            return ""
 
-        if ignore_ext:
-            if cache_file_path.is_file():
-                return str(cache_file_path)
+        cache_file_path = self.cache_path.joinpath(filename)
+        if cache_file_path.is_file():
+            return str(cache_file_path)
 
+        if ignore_ext:
             safe_stem = glob.escape(pathlib.Path(filename).stem)
             for item in self.cache_path.glob(f"{safe_stem}.*"):
                 if item.is_file():
                     return str(item)
 
-        elif cache_file_path.is_file():
-            return str(file_path)
-
         return ""
 
+    def _is_cache_file(self, path: pathlib.Path) -> bool:
+        """Check if `path` is directly inside the cache directory."""
+        return os.path.dirname(os.path.abspath(path)) == os.path.abspath(
+            self.cache_path
+        )
+
+    def _set_index_record(self, stem: str, record: Optional[CachedFile]) -> None:
+        """Replace or remove the index record for `stem`, keeping totals in sync."""
+        old = self._index.pop(stem, None)
+        if old is not None:
+            self.size_bytes -= old.size
+            self.file_count -= 1
+        if record is not None:
+            self._index[stem] = record
+            self.size_bytes += record.size
+            self.file_count += 1
+        if self._index_changes is not None:
+            self._index_changes[stem] = record
+
+    def track_file(self, path: Union[pathlib.Path, str]) -> None:
+        """
+        Add or update the index record for a new file at `path` in the cache
+        directory, like after a download or conversion.
+        The record replaces any other file with the same name and extension.
+        """
+        file_path = pathlib.Path(path)
+        if not self._is_cache_file(file_path):
+            return
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            log.warning("Cannot index missing cache file:  %s", file_path)
+            return
+        self._set_index_record(
+            file_path.stem, CachedFile(file_path, size, time.time())
+        )
+
+    def untrack_file(self, path: Union[pathlib.Path, str]) -> None:
+        """Remove the index record for `path` after the file was deleted."""
+        file_path = pathlib.Path(path)
+        if not self._is_cache_file(file_path):
+            return
+        record = self._index.get(file_path.stem, None)
+        if record is None or record.path.name == file_path.name:
+            self._set_index_record(file_path.stem, None)
+
+    def mark_played(self, path: Union[pathlib.Path, str]) -> None:
+        """
+        Record that the cache file at `path` was just played, making it the
+        last file to be evicted.  The time is kept in the index, and added to
+        the manifest by flush_played_times() after a delay, so it is kept
+        across restarts without saving the manifest for every play.
+        """
+        file_path = pathlib.Path(path)
+        if not self._is_cache_file(file_path):
+            return
+        now = time.time()
+        record = self._index.get(file_path.stem, None)
+        if record is not None and record.path.name == file_path.name:
+            record.last_played = now
+            self._index.move_to_end(file_path.stem)
+            if self._index_changes is not None:
+                self._index_changes[file_path.stem] = record
+
+        self._played_pending[file_path.stem] = now
+        if not self._played_flush_scheduled:
+            self._played_flush_scheduled = True
+            self.bot.create_task(
+                self._flush_played_later(), name="MB_FlushCachePlayedTimes"
+            )
+
+    async def _flush_played_later(self) -> None:
+        """Wait for more plays to collect, then flush all their times at once."""
+        await asyncio.sleep(DEFAULT_CACHE_PLAYED_FLUSH_DELAY)
+        self.flush_played_times()
+
+    def flush_played_times(self) -> None:
+        """Add last played times collected by mark_played() to the manifest."""
+        self._played_flush_scheduled = False
+        if self._apply_played_times():
+            self._schedule_manifest_save()
+
+    def _apply_played_times(self) -> bool:
+        """
+        Copy pending last played times into manifest records.
+
+        :returns:  True if any record changed.
+        """
+        pending, self._played_pending = self._played_pending, {}
+        changed = False
+        for key, played in pending.items():
+            record = self.manifest.get(key, None)
+            if record is not None:
+                record["last_played"] = played
+                changed = True
+        return changed
+
+    async def close(self) -> None:
+        """Save last played times and any other pending manifest changes."""
+        if self._apply_played_times() or self._manifest_save_pending:
+            await self.save_manifest()
+
+    def _scan_cache_dir(self) -> Dict[str, CachedFile]:
+        """
+        Build index records for all files in the cache directory, in one pass.
+        Files are considered last played at their access time, or at their
+        creation time on Windows.  If names without extension collide, only
+        the most recently used file is indexed.
+        """
+        index: Dict[str, CachedFile] = {}
+        use_ctime = os.name == "nt"
+        try:
+            with os.scandir(self.cache_path) as it:
+                for item in it:
+                    if not item.is_file():
+                        continue
+                    stat = item.stat()
+                    path = pathlib.Path(item.path)
+                    record = CachedFile(
+                        path,
+                        stat.st_size,
+                        stat.st_ctime if use_ctime else stat.st_atime,
+                    )
+                    old = index.get(path.stem, None)
+                    if old is None or record.last_played > old.last_played:
+                        index[path.stem] = record
+        except FileNotFoundError:
+            pass
+        return index
+
+    def _install_index(self, index: Dict[str, CachedFile]) -> None:
+        """
+        Replace the index and recount cache size from it.
+        Last played times saved in the manifest, or not flushed to it yet,
+        replace those from the scan.
+        """
+        for stem, record in index.items():
+            manifest_record = self.manifest.get(stem, None)
+            if manifest_record and manifest_record.get("name") == record.path.name:
+                record.last_played = manifest_record.get(
+                    "last_played", record.last_played
+                )
+            if stem in self._played_pending:
+                record.last_played = self._played_pending[stem]
+        self._index = OrderedDict(
+            sorted(index.items(), key=lambda item: item[1].last_played)
+        )
+        self._index_ready = True
+        self.size_bytes = sum(r.size for r in index.values())
+        self.file_count = len(index)
+
+    def start_index_scan(self) -> None:
+        """
+        Build the cache index in a background task, unless it is already
+        built or being built.  Until it is ready, lookups check the disk.
+        """
+        if self._index_ready or self._index_changes is not None:
+            return
+        self._index_changes = {}
+        self.bot.create_task(self._build_index(), name="MB_IndexAudioCache")
+
+    async def _build_index(self) -> None:
+        """
+        Scan the cache directory in a thread and replace the index with the
+        result.  Files added or removed during the scan are applied on top.
+        """
+        try:
+            index = await asyncio.to_thread(self._scan_cache_dir)
+            for stem, record in (self._index_changes or {}).items():
+                if record is None:
+                    index.pop(stem, None)
+                else:
+                    index[stem] = record
+            self._install_index(index)
+            log.debug(
+                "Indexed audio cache with %s file(s), total of %s.",
+                self.file_count,
+                format_size_from_bytes(self.size_bytes),
+            )
+            if self.config.save_videos:
+                self.schedule_eviction()
+        except OSError:
+            log.exception("Failed to index the audio cache directory.")
+        finally:
+            self._index_changes = None
+
     def ensure_cache_dir_exists(self) -> None:
         """Check for and create the cache directory path or raise an error"""
         if not self.cache_dir_exists():
@@ -93,18 +370,10 @@ class AudioFileCache:
 
     def scan_audio_cache(self) -> Tuple[int, int]:
         """
-        Scan the audio cache directory and return a tuple with info.
+        Scan the audio cache directory, rebuild the cache index, and return a tuple with info.
         Returns (size_in_bytes:int, number_of_files:int)
         """
-        cached_bytes = 0
-        cached_files = 0
-        if os.path.isdir(self.cache_path):
-            for cache_file in pathlib.Path(self.cache_path).iterdir():
-                cached_files += 1
-                cached_bytes += os.path.getsize(cache_file)
-        self.size_bytes = cached_bytes
-        self.file_count = cached_files
-
+        self._install_index(self._scan_cache_dir())
         return self.get_cache_size()
 
     def _delete_cache_file(self, path: pathlib.Path) -> bool:
@@ -113,6 +382,8 @@ class AudioFileCache:
         """
         try:
             path.unlink(missing_ok=True)
+            self.untrack_file(path)
+            self.remove_manifest_record(path)
             return True
         except (OSError, PermissionError, IsADirectoryError):
             log.warning("Failed to delete cache file:  %s", path, exc_info=True)
@@ -124,8 +395,8 @@ class AudioFileCache:
         """
         try:
             shutil.rmtree(self.cache_path)
-            self.size_bytes = 0
-            self.file_count = 0
+            self._install_index({})
+            self._clear_cached_manifest()
             log.debug("Audio cache directory has been removed.")
             return True
         except (OSError, PermissionError, NotADirectoryError):
@@ -137,78 +408,179 @@ class AudioFileCache:
                 return False
             try:
                 shutil.rmtree(new_path)
+                self._install_index({})
+                self._clear_cached_manifest()
                 return True
             except (OSError, PermissionError, NotADirectoryError):
                 new_path.rename(self.cache_path)
                 log.debug("Audio cache directory could not be removed.")
                 return False
 
-    def _process_cache_delete(self) -> bool:
+    def _eviction_limits(self) -> Tuple[int, float]:
         """
-        Sorts cache by access or creation time and deletes any that are older than set limits.
-        Will retain cached autoplaylist if enabled and files are in the cachemap.
+        Get the cache size to evict down to and the oldest last played time
+        to keep, where 0 means no limit.
         """
-        if self.config.storage_limit_bytes == 0 and self.config.storage_limit_days == 0:
-            log.debug("Audio cache has no limits set, nothing to delete.")
+        target_bytes = 0
+        if self.config.storage_limit_bytes:
+            target_bytes = max(
+                1,
+                self.config.storage_limit_bytes
+                * self.config.storage_limit_low_percent
+                // 100,
+            )
+        max_age = 0.0
+        if self.config.storage_limit_days:
+            max_age = time.time() - (86400 * self.config.storage_limit_days)
+        return target_bytes, max_age
+
+    def _needs_eviction(self) -> bool:
+        """
+        Check if the cache is over StorageLimitBytes, the high watermark, or
+        if its least recently played file is older than StorageLimitDays.
+        Files retained for the autoplaylist are skipped, so a cache kept over
+        its limits only by retained files does not start eviction runs which
+        cannot remove anything.
+        """
+        limit = self.config.storage_limit_bytes
+        target_bytes, max_age = self._eviction_limits()
+        over_size = limit and self.size_bytes > limit
+        too_old = False
+        if max_age and self._index:
+            oldest = next(iter(self._index.values()))
+            too_old = oldest.last_played < max_age
+        if not (over_size or too_old):
             return False
+        victims, _retained = self._pick_evictions(target_bytes, max_age, max_files=1)
+        return bool(victims)
 
-        if os.name == "nt":
-            # On Windows, creation time (ctime) is the only reliable way to do this.
-            # mtime is usually older than download time. atime is changed on multiple files by some part of the player.
-            # To make this consistent everywhere, we need to store last-played times for songs on our own.
-            cached_files = sorted(
-                self.cache_path.iterdir(),
-                key=os.path.getctime,
-                reverse=True,
-            )
-        else:
-            cached_files = sorted(
-                self.cache_path.iterdir(),
-                key=os.path.getatime,
-                reverse=True,
-            )
+    def _pick_evictions(
+        self, target_bytes: int, max_age: float, max_files: int = 0
+    ) -> Tuple[List[CachedFile], List[CachedFile]]:
+        """
+        Pick the least recently played files to delete, until the cache
+        would be at most `target_bytes` and no file is older than `max_age`.
+        Files retained for the autoplaylist are skipped.
 
-        max_age = time.time() - (86400 * self.config.storage_limit_days)
-        cached_size = 0
-        removed_count = 0
-        removed_size = 0
-        retained_count = 0
-        retained_size = 0
-        # Accumulate file sizes until a set limit is reached and purge remaining files.
-        for cache_file in cached_files:
-            file_size = os.path.getsize(cache_file)
+        :param: max_files:  Stop after picking this many files, if set.
+
+        :returns:  Files to delete, and the retained files which were skipped.
+        """
+        victims: List[CachedFile] = []
+        retained: List[CachedFile] = []
+        size = self.size_bytes
+        for record in self._index.values():
+            over_size = target_bytes and size > target_bytes
+            too_old = max_age and record.last_played < max_age
+            # records are ordered, so every later file is newer.
+            if not (over_size or too_old):
+                break
+            if max_files and len(victims) >= max_files:
+                break
 
             # Do not purge files from autoplaylist if retention is enabled.
-            if self._check_autoplay_cachemap(cache_file):
-                retained_count += 1
-                retained_size += file_size
-                cached_size += file_size
+            if self._check_autoplay_cachemap(record.path):
+                retained.append(record)
                 continue
 
-            # get file access/creation time.
-            if os.name == "nt":
-                file_time = os.path.getctime(cache_file)
-            else:
-                file_time = os.path.getatime(cache_file)
+            victims.append(record)
+            size -= record.size
+        return victims, retained
 
-            # enforce size limit before time limit.
-            if (
-                self.config.storage_limit_bytes
-                and self.config.storage_limit_bytes < cached_size
-            ):
-                self._delete_cache_file(cache_file)
+    def _evict(self, victims: List[CachedFile]) -> Tuple[int, int]:
+        """
+        Delete the `victims` from the cache.  Files which cannot be deleted,
+        usually because they are in use, are treated as just played.
+
+        :returns:  Number of files and bytes removed.
+        """
+        removed_count = 0
+        removed_size = 0
+        for record in victims:
+            if self._delete_cache_file(record.path):
                 removed_count += 1
-                removed_size += file_size
-                continue
+                removed_size += record.size
+            else:
+                self.eviction_stats["failed"] += 1
+                if record.path.stem in self._index:
+                    record.last_played = time.time()
+                    self._index.move_to_end(record.path.stem)
+        self.eviction_stats["files"] += removed_count
+        self.eviction_stats["bytes"] += removed_size
+        return removed_count, removed_size
 
-            if self.config.storage_limit_days:
-                if file_time < max_age:
-                    self._delete_cache_file(cache_file)
-                    removed_count += 1
-                    removed_size += file_size
-                    continue
+    def schedule_eviction(self) -> None:
+        """
+        Start evicting files in the background if the cache went over its
+        limits, unless eviction is already running.
+        Once started, files are evicted down to StorageLimitLowPercent of the
+        size limit, so eviction does not run again after every download.
+        """
+        if not self._index_ready:
+            # the index is needed to pick files, eviction runs once it is built.
+            self.start_index_scan()
+            return
+        if self._evicting or not self._needs_eviction():
+            return
+        self._evicting = True
+        self.bot.create_task(self._evict_in_background(), name="MB_EvictAudioCache")
+
+    async def _evict_in_background(self) -> None:
+        """
+        Evict files in small batches, yielding to other tasks between them.
+        """
+        self.eviction_stats["runs"] += 1
+        log.debug(
+            "Audio cache level requires cleanup. %s",
+            format_size_from_bytes(self.size_bytes),
+        )
+        removed_count = 0
+        removed_size = 0
+        try:
+            while True:
+                target_bytes, max_age = self._eviction_limits()
+                victims, _retained = self._pick_evictions(
+                    target_bytes, max_age, DEFAULT_CACHE_EVICTION_BATCH
+                )
+                if not victims:
+                    break
+                count, size = self._evict(victims)
+                removed_count += count
+                removed_size += size
+                if not count:
+                    # nothing could be deleted, try again after the next download.
+                    break
+                await asyncio.sleep(0)
+        finally:
+            self._evicting = False
+
+        log.debug(
+            "Audio cache deleted %s file(s), total of %s removed.  "
+            "Cache is now %s over %s file(s).",
+            removed_count,
+            format_size_from_bytes(removed_size),
+            format_size_from_bytes(self.size_bytes),
+            self.file_count,
+        )
+
+    def _process_cache_delete(self) -> bool:
+        """
+        Deletes the least recently played files until the cache is within set limits.
+        Will retain cached autoplaylist if enabled and files are in the cachemap.
+        """
+        if self.config.storage_limit_bytes == 0 and self.config.storage_limit_days == 0:
+            log.debug("Audio cache has no limits set, nothing to delete.")
+            return False
+
+        if not self._index_ready:
+            self.scan_audio_cache()
+
+        if not self._needs_eviction():
+            return True
 
-            cached_size += file_size
+        target_bytes, max_age = self._eviction_limits()
+        victims, retained = self._pick_evictions(target_bytes, max_age)
+        removed_count, removed_size = self._evict(victims)
 
         if removed_count:
             log.debug(
@@ -216,14 +588,12 @@ class AudioFileCache:
                 removed_count,
                 format_size_from_bytes(removed_size),
             )
-        if retained_count:
+        if retained:
             log.debug(
                 "Audio cached retained %s file(s) from autoplaylist, total of %s retained.",
-                retained_count,
-                format_size_from_bytes(retained_size),
+                len(retained),
+                format_size_from_bytes(sum(r.size for r in retained)),
             )
-        self.file_count = len(cached_files) - removed_count
-        self.size_bytes = cached_size
         log.debug(
             "Audio cache is now %s over %s file(s).",
             format_size_from_bytes(self.size_bytes),
@@ -264,18 +634,8 @@ class AudioFileCache:
                 self.add_autoplay_cachemap_entry(entry)
 
         if self.config.save_videos:
-            if self.config.storage_limit_bytes:
-                # TODO: This could be improved with min/max options, preventing calls to clear on each new entry.
-                self.size_bytes = self.size_bytes + entry.downloaded_bytes
-                if self.size_bytes > self.config.storage_limit_bytes:
-                    log.debug(
-                        "Cache level requires cleanup. %s",
-                        format_size_from_bytes(self.size_bytes),
-                    )
-                    self.delete_old_audiocache()
-            elif self.config.storage_limit_days:
-                # Only running time check if it is the only option enabled, cuts down on IO.
-                self.delete_old_audiocache()
+            # size_bytes already counts the new file, the download added it to the index.
+            self.schedule_eviction()
 
     def load_autoplay_cachemap(self) -> None:
         """
@@ -343,7 +703,20 @@ class AudioFileCache:
 
         change_made = False
         filename = pathlib.Path(entry.filename).stem
-        if filename in self.auto_playlist_cachemap:
+        # a deduplicated download plays a file cached under another name, so
+        # the name it would have had is mapped too, and it keeps resolving.
+        expected = getattr(entry, "expected_filename", None)
+        original = pathlib.Path(expected).stem if expected else filename
+        if original != filename:
+            if self.auto_playlist_cachemap.get(original, None) != entry.url:
+                self.auto_playlist_cachemap[original] = entry.url
+                change_made = True
+            # the shared file keeps the URL it was first cached for, the
+            # duplicate names in its manifest record retain it for this URL.
+            if filename not in self.auto_playlist_cachemap:
+                self.auto_playlist_cachemap[filename] = entry.url
+                change_made = True
+        elif filename in self.auto_playlist_cachemap:
             if self.auto_playlist_cachemap[filename] != entry.url:
                 log.warning(
                     "Autoplaylist cache map conflict on Key: %s  Old: %s  New: %s",
@@ -374,8 +747,20 @@ class AudioFileCache:
             return
 
         filename = pathlib.Path(entry.filename).stem
-        if filename in self.auto_playlist_cachemap:
-            del self.auto_playlist_cachemap[filename]
+        expected = getattr(entry, "expected_filename", None)
+        original = pathlib.Path(expected).stem if expected else filename
+        if original != filename:
+            # only drop the keys of this entry, the file may be shared.
+            keys = [
+                key
+                for key in (original, filename)
+                if self.auto_playlist_cachemap.get(key, None) == entry.url
+            ]
+        else:
+            keys = [filename] if filename in self.auto_playlist_cachemap else []
+        for key in keys:
+            del self.auto_playlist_cachemap[key]
+        if keys:
             self.bot.create_task(
                 self.save_autoplay_cachemap(), name="MB_SaveAutoPlayCachemap"
             )
@@ -417,9 +802,462 @@ class AudioFileCache:
         ):
             return False
 
-        if filename.stem in self.auto_playlist_cachemap:
-            cached_url = self.auto_playlist_cachemap[filename.stem]
+        # files kept for deduplicated downloads are also retained for them.
+        record = self.manifest.get(filename.stem, None) or {}
+        for key in [filename.stem, *record.get("duplicates", [])]:
+            cached_url = self.auto_playlist_cachemap.get(key, None)
             if cached_url in self.bot.playlist_mgr.loaded_tracks:
                 return True
 
         return False
+
+    def _manifest_key(self, path: Union[pathlib.Path, str]) -> str:
+        """
+        Get the manifest key for `path`.
+        Files in the audio cache use their file name without extension, which
+        holds the extractor and media ID, so lookups match get_if_cached().
+        Other files, like local media, use their full path.
+        """
+        file_path = os.path.abspath(path)
+        if os.path.dirname(file_path) == os.path.abspath(self.cache_path):
+            return pathlib.Path(file_path).stem
+        return file_path
+
+    def _manifest_name(self, path: Union[pathlib.Path, str]) -> str:
+        """Get the file name stored in manifest records for `path`."""
+        file_path = os.path.abspath(path)
+        if os.path.dirname(file_path) == os.path.abspath(self.cache_path):
+            return os.path.basename(file_path)
+        return file_path
+
+    def get_manifest_record(
+        self, path: Union[pathlib.Path, str], verify: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the manifest record for the file at `path`.
+        For audio cache files, the extension of `path` is ignored, like with
+        get_if_cached(), and the file named in the record is used instead.
+        The manifest is trusted, so lookups do no disk I/O unless `verify`
+        is set, see verify_manifest_record().
+
+        :param: verify:  Check the file first, and drop the record if stale.
+
+        :returns:  A dict with name, size, mtime, and any known source,
+            duration, codec, sample_rate, loudness, and downloaded_at values.
+            None if there is no current record for the file.
+        """
+        record = self.manifest.get(self._manifest_key(path), None)
+        if record is None or (verify and not self.verify_manifest_record(record)):
+            return None
+        return record
+
+    def verify_manifest_record(self, record: Dict[str, Any]) -> bool:
+        """
+        Check that the file of a manifest `record` still has the recorded size
+        and modification time, dropping the record if it does not.
+        Meant to be called once a file is about to be opened for playback.
+
+        :returns:  True if the record is current.
+        """
+        path = self.manifest_record_path(record)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+
+        if (
+            stat is not None
+            and record.get("size") == stat.st_size
+            and record.get("mtime") == stat.st_mtime_ns
+        ):
+            return True
+
+        key = self._manifest_key(path)
+        log.debug("Dropping stale manifest record for:  %s", key)
+        if self.manifest.get(key, None) is record:
+            self._unindex_manifest_record(key, self.manifest.pop(key))
+            self._schedule_manifest_save()
+        return False
+
+    def _index_manifest_record(self, key: str, record: Dict[str, Any]) -> None:
+        """Map the source IDs and content hash of a cache file `record` to `key`."""
+        if os.path.isabs(key):
+            return
+        for source in [record.get("source", None), *record.get("aliases", [])]:
+            if source:
+                self._source_keys[source] = key
+        if record.get("content_hash", None):
+            self._content_keys[record["content_hash"]] = key
+
+    def _unindex_manifest_record(self, key: str, record: Dict[str, Any]) -> None:
+        """Remove mappings to `key` added by _index_manifest_record()."""
+        for source in [record.get("source", None), *record.get("aliases", [])]:
+            if source and self._source_keys.get(source, None) == key:
+                del self._source_keys[source]
+        content_hash = record.get("content_hash", None)
+        if content_hash and self._content_keys.get(content_hash, None) == key:
+            del self._content_keys[content_hash]
+
+    def get_record_for_source(
+        self, source: str, verify: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the manifest record of a cache file holding the media with the
+        given `source` ID, even if it was cached under another file name.
+        A hit is counted as a download avoided.
+
+        :param: source:  An ID made of the extractor key and media ID.
+        :param: verify:  Check the file first, like get_manifest_record().
+
+        :returns:  The current manifest record, or None if not cached.
+        """
+        key = self._source_keys.get(source, None)
+        if key is None:
+            return None
+        record = self.get_manifest_record(self.cache_path.joinpath(key), verify)
+        if record is not None:
+            self.dedup_stats["downloads_avoided"] += 1
+            self.dedup_stats["bytes_saved"] += record["size"]
+            log.debug(
+                "Media source %s is already cached as:  %s", source, record["name"]
+            )
+        return record
+
+    @staticmethod
+    def _hash_file(path: str) -> str:
+        """Get the SHA-256 hex digest of the file at `path`."""
+        sha = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    async def deduplicate(self, path: str) -> str:
+        """
+        Hash a newly downloaded cache file at `path`, and if another cache
+        file has the same content, delete the new one and add its source ID
+        to the existing file instead.  The name of the deleted file is kept
+        in the record's duplicates, so autoplaylist retention still finds it.
+
+        Files are not stored under their hash.  They keep their extractor and
+        ID names, which get_if_cached(), the autoplaylist cachemap, and the
+        cache index look them up by, and the content hash index maps each hash
+        to the name of the first file with that content.
+
+        :returns:  The path of the file to use, the existing one for duplicates.
+        """
+        try:
+            content_hash = await asyncio.to_thread(self._hash_file, path)
+        except OSError:
+            log.warning("Failed to hash cache file:  %s", path, exc_info=True)
+            return path
+
+        key = self._manifest_key(path)
+        other_key = self._content_keys.get(content_hash, None)
+        other = None
+        if other_key is not None and other_key != key:
+            # the new file is deleted for it, so the other file must still exist.
+            other = self.get_manifest_record(
+                self.cache_path.joinpath(other_key), verify=True
+            )
+
+        if other is None:
+            self.update_manifest(path, content_hash=content_hash)
+            return path
+
+        record = self.manifest.get(key, {})
+        aliases = list(other.get("aliases", []))
+        if record.get("source", None) and record["source"] != other.get("source"):
+            aliases.append(record["source"])
+        duplicates = list(other.get("duplicates", []))
+        if key not in duplicates:
+            duplicates.append(key)
+
+        size = os.path.getsize(path)
+        if not self._delete_cache_file(pathlib.Path(path)):
+            self.update_manifest(path, content_hash=content_hash)
+            return path
+
+        other_path = self.manifest_record_path(other)
+        self.update_manifest(other_path, aliases=aliases, duplicates=duplicates)
+        self.dedup_stats["duplicates_removed"] += 1
+        self.dedup_stats["bytes_saved"] += size
+        log.info(
+            "Download is a duplicate of a cached file, %s saved:  %s",
+            format_size_from_bytes(size),
+            other["name"],
+        )
+        return other_path
+
+    def manifest_record_path(self, record: Dict[str, Any]) -> str:
+        """Get the full path of the file described by a manifest `record`."""
+        # names of local files are absolute, so joining keeps them as they are.
+        return str(self.cache_path.joinpath(record["name"]))
+
+    def update_manifest(self, path: Union[pathlib.Path, str], **fields: Any) -> None:
+        """
+        Create or update the manifest record for the file at `path`.
+        File size and modification time are refreshed, and a record for a file
+        which changed since it was recorded is replaced instead of updated.
+        Fields with a None value are ignored.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            log.warning("Cannot add manifest record for missing file:  %s", path)
+            return
+
+        key = self._manifest_key(path)
+        name = self._manifest_name(path)
+        record = self.manifest.get(key, None)
+        if record is not None:
+            self._unindex_manifest_record(key, record)
+        if (
+            record is None
+            or record.get("name") != name
+            or record.get("size") != stat.st_size
+            or record.get("mtime") != stat.st_mtime_ns
+        ):
+            record = {"name": name}
+            self.manifest[key] = record
+
+        record["size"] = stat.st_size
+        record["mtime"] = stat.st_mtime_ns
+        for field, value in fields.items():
+            if value is not None:
+                record[field] = value
+        self._index_manifest_record(key, record)
+        self._schedule_manifest_save()
+
+    def remove_manifest_record(self, path: Union[pathlib.Path, str]) -> None:
+        """Remove the manifest record for the file at `path`, if any."""
+        key = self._manifest_key(path)
+        record = self.manifest.pop(key, None)
+        if record is not None:
+            self._unindex_manifest_record(key, record)
+            self._schedule_manifest_save()
+
+    def _clear_cached_manifest(self) -> None:
+        """Remove manifest records for all audio cache files."""
+        keys = [k for k in self.manifest if not os.path.isabs(k)]
+        for key in keys:
+            del self.manifest[key]
+        self._source_keys.clear()
+        self._content_keys.clear()
+        if keys:
+            self._schedule_manifest_save()
+
+    async def rebuild_manifest(
+        self, prober: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> int:
+        """
+        Scan the audio cache directory and add manifest records for files
+        without a current record, using `prober` to get their media info.
+        Up to DEFAULT_MANIFEST_SCAN_WORKERS files are probed at once.
+        Records of cache files which no longer exist are removed.
+
+        :returns:  The number of records added.
+        """
+        if not self.cache_dir_exists():
+            self._clear_cached_manifest()
+            return 0
+
+        files = [p for p in self.cache_path.iterdir() if p.is_file()]
+        present = {p.stem for p in files}
+        gone = [k for k in self.manifest if not os.path.isabs(k) and k not in present]
+        for key in gone:
+            self._unindex_manifest_record(key, self.manifest.pop(key))
+        if gone:
+            self._schedule_manifest_save()
+
+        todo = [p for p in files if self.get_manifest_record(p, verify=True) is None]
+        if not todo:
+            return 0
+
+        log.info("Rebuilding audio cache manifest for %s file(s).", len(todo))
+        semaphore = asyncio.Semaphore(DEFAULT_MANIFEST_SCAN_WORKERS)
+
+        async def _probe(path: pathlib.Path) -> bool:
+            async with semaphore:
+                try:
+                    info = await prober(str(path))
+                except Exception:  # pylint: disable=broad-exception-caught
+                    log.exception("Failed to probe cache file:  %s", path)
+                    info = None
+            self.update_manifest(path, **(info or {}))
+            return info is not None
+
+        results = await asyncio.gather(*[_probe(p) for p in todo])
+        self.manifest_rebuild_needed = False
+        log.info(
+            "Audio cache manifest rebuilt, %s of %s file(s) probed.",
+            sum(results),
+            len(todo),
+        )
+        return len(todo)
+
+    def get_loudness(
+        self, path: Union[pathlib.Path, str]
+    ) -> Optional[Dict[str, float]]:
+        """
+        Get stored loudness analysis values for the file at `path`.
+
+        :returns:  A dict of loudnorm measurements or None if not available.
+        """
+        record = self.get_manifest_record(path)
+        if record is None:
+            return None
+
+        values = record.get("loudness", None)
+        if isinstance(values, dict):
+            return values
+        return None
+
+    def set_loudness(
+        self, path: Union[pathlib.Path, str], values: Dict[str, float]
+    ) -> None:
+        """
+        Store loudness analysis values for the file at `path` and save them.
+        """
+        self.update_manifest(path, loudness=dict(values))
+
+    def defer_loudness_analysis(
+        self,
+        path: Union[pathlib.Path, str],
+        analyzer: Callable[[str], Awaitable[Optional[Dict[str, float]]]],
+    ) -> None:
+        """
+        Run `analyzer` for the file at `path` in a background task and store
+        the values it returns, so later plays can use them.
+        Analysis runs are bounded by a semaphore and duplicate requests for
+        the same file are ignored while one is pending.
+        The time spent on each analysis is counted as ready-time saved.
+        """
+        key = self._manifest_key(path)
+        if key in self._loudness_pending:
+            return
+        self._loudness_pending.add(key)
+        self.loudness_stats["deferred"] += 1
+        self.bot.create_task(
+            self._run_loudness_analysis(key, str(path), analyzer),
+            name="MB_LoudnessAnalysis",
+        )
+
+    async def _run_loudness_analysis(
+        self,
+        key: str,
+        path: str,
+        analyzer: Callable[[str], Awaitable[Optional[Dict[str, float]]]],
+    ) -> None:
+        """Run a deferred loudness analysis job under the analysis semaphore."""
+        try:
+            async with self._loudness_semaphore:
+                if not os.path.isfile(path):
+                    return
+                start = time.monotonic()
+                values = await analyzer(path)
+                elapsed = time.monotonic() - start
+                if values is None:
+                    self.loudness_stats["failed"] += 1
+                    return
+                self.set_loudness(path, values)
+                self.record_loudness_measured(elapsed, deferred=True)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.loudness_stats["failed"] += 1
+            log.exception("Background loudness analysis failed for:  %s", path)
+        finally:
+            self._loudness_pending.discard(key)
+
+    def record_loudness_measured(self, elapsed: float, deferred: bool) -> None:
+        """
+        Count a finished loudness analysis which took `elapsed` seconds.
+        If it was `deferred`, the time is counted as ready-time saved.
+        """
+        self.loudness_stats["measured"] += 1
+        if deferred:
+            self.loudness_stats["ready_time_saved"] += elapsed
+            log.debug(
+                "Deferred loudness analysis took %.2f seconds, "
+                "%.2f seconds of ready-time saved in total.",
+                elapsed,
+                self.loudness_stats["ready_time_saved"],
+            )
+
+    def load_manifest(self) -> None:
+        """
+        Load the audio cache manifest from the data directory.
+        If it is missing while the cache has files, manifest_rebuild_needed is
+        set and the manifest is rebuilt by probing the files in the background.
+        """
+        self.manifest = {}
+        self._source_keys.clear()
+        self._content_keys.clear()
+        if self.manifest_file.is_file():
+            with open(self.manifest_file, "r", encoding="utf8") as fh:
+                try:
+                    self.manifest = json.load(fh)
+                    for key, record in self.manifest.items():
+                        self._index_manifest_record(key, record)
+                    log.debug(
+                        "Loaded audio cache manifest with %s records.",
+                        len(self.manifest),
+                    )
+                    return
+                except json.JSONDecodeError:
+                    log.exception("Failed to load audio cache manifest.")
+                    self.manifest = {}
+
+        if self.cache_dir_exists() and any(self.cache_path.iterdir()):
+            self.manifest_rebuild_needed = True
+            self.bot.create_task(
+                self._rebuild_missing_manifest(), name="MB_RebuildCacheManifest"
+            )
+
+    async def _rebuild_missing_manifest(self) -> None:
+        """
+        Probe the files of an existing audio cache with ffprobe, to rebuild a
+        manifest which was missing at startup.
+        """
+        # entry pulls in the downloader, so it is only imported when needed.
+        from .entry import probe_media  # pylint: disable=import-outside-toplevel
+
+        try:
+            await self.rebuild_manifest(probe_media)
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception("Failed to rebuild the audio cache manifest.")
+
+    def _schedule_manifest_save(self) -> None:
+        """Save the manifest in a task, unless a save is already waiting to run."""
+        if self._manifest_save_pending:
+            return
+        self._manifest_save_pending = True
+        self.bot.create_task(self.save_manifest(), name="MB_SaveCacheManifest")
+
+    async def save_manifest(self) -> None:
+        """
+        Uses asyncio.Lock to save the audio cache manifest as a json file.
+        The file is encoded and written in a thread, see _write_manifest().
+        """
+        async with self.manifest_file_lock:
+            self._manifest_save_pending = False
+            # records are updated in place, so the thread gets copies of them.
+            manifest = {key: dict(record) for key, record in self.manifest.items()}
+            try:
+                await asyncio.to_thread(self._write_manifest, manifest)
+                log.debug(
+                    "Saved audio cache manifest with %s records.", len(self.manifest)
+                )
+            except (OSError, TypeError, ValueError, RecursionError):
+                log.exception("Failed to save audio cache manifest.")
+
+    def _write_manifest(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Encode `manifest` to a temporary file and atomically replace the
+        manifest file with it, so a crash mid-write cannot truncate it.
+        """
+        tmp_file = self.manifest_file.with_name(self.manifest_file.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf8") as fh:
+            json.dump(manifest, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_file, self.manifest_file)
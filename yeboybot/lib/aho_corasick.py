@@ -0,0 +1,79 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List
+
+
+class AhoCorasick:
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """
+        An Aho-Corasick automaton which finds if a text contains any of the
+        given `patterns`, in a single pass over the text.
+        Building takes time linear in the total length of all patterns, and
+        each search is linear in the length of the text, no matter how many
+        patterns there are.
+
+        :param: patterns:  Strings to search for, matched with case sensitivity.
+        """
+        # state -> {char: next state}, where state 0 is the root.
+        self._goto: List[Dict[str, int]] = [{}]
+        # state -> True if a pattern ends at this state or one of its suffixes.
+        self._out: List[bool] = [False]
+        # state -> longest proper suffix state, followed when a char has no goto.
+        self._fail: List[int] = [0]
+        self._count: int = 0
+
+        for pattern in patterns:
+            self._add_pattern(pattern)
+        self._build_fail_links()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _add_pattern(self, pattern: str) -> None:
+        """Add the states needed to spell `pattern` from the root."""
+        goto = self._goto
+        state = 0
+        for char in pattern:
+            nxt = goto[state].get(char, None)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][char] = nxt
+                goto.append({})
+                self._out.append(False)
+            state = nxt
+        self._out[state] = True
+        self._count += 1
+
+    def _build_fail_links(self) -> None:
+        """Link each state to its longest suffix state, in breadth-first order."""
+        goto = self._goto
+        out = self._out
+        fail = self._fail = [0] * len(goto)
+        queue: Deque[int] = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] = out[state] or out[fail[state]]
+            for char, nxt in goto[state].items():
+                if state:
+                    link = fail[state]
+                    while link and char not in goto[link]:
+                        link = fail[link]
+                    fail[nxt] = goto[link].get(char, 0)
+                queue.append(nxt)
+
+    def contains_any(self, text: str) -> bool:
+        """Check if `text` contains at least one of the patterns."""
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        if out[0]:
+            # an empty pattern is found in any text.
+            return True
+
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                return True
+        return False
@@ -0,0 +1,305 @@
+import logging
+import time
+from threading import Condition, Thread
+from typing import Any, Dict, List, Optional, Union
+
+from discord import AudioSource, FFmpegOpusAudio, PCMVolumeTransformer
+from discord.opus import Encoder as OpusEncoder
+
+log = logging.getLogger(__name__)
+
+
+class PlaybackStats:
+    # Audio is sent in 20 ms frames, a read slower than this cannot keep up.
+    FRAME_LENGTH = 0.02
+    # Extra time allowed between reads before a frame is counted as late.
+    LATE_TOLERANCE = 0.01
+    # Upper bounds of the read latency histogram buckets, in milliseconds.
+    LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100)
+
+    def __init__(self, opened_at: Optional[float] = None) -> None:
+        """
+        Collect playback health metrics for one playback source.
+        Reads are made by the voice client's audio thread, so the counters
+        are only written from that thread and read as a snapshot elsewhere.
+
+        Read latency is the time the source took to return a frame.
+        An underrun is a read which took longer than one frame to return.
+        A late frame is a read which started too long after the previous one,
+        which usually means the audio thread was starved of CPU.
+
+        :param: opened_at:  time.perf_counter() value from when playback was
+            requested, used to measure ffmpeg startup time.
+        """
+        self.opened_at: float = (
+            opened_at if opened_at is not None else time.perf_counter()
+        )
+        self.startup_time: Optional[float] = None
+        self.frames: int = 0
+        self.underruns: int = 0
+        self.late_frames: int = 0
+        self.latency_total: float = 0.0
+        self.latency_max: float = 0.0
+        self.latency_histogram: List[int] = [0] * (len(self.LATENCY_BUCKETS_MS) + 1)
+        self.read_ahead: Optional["ReadAheadAudioSource"] = None
+        self._last_read_at: Optional[float] = None
+
+    def record_read(self, started: float, finished: float, got_frame: bool) -> None:
+        """
+        Record a single read of the source, timed with time.perf_counter().
+
+        :param: got_frame:  False if the read returned no data.
+        """
+        latency = finished - started
+        if self._last_read_at is not None:
+            if started - self._last_read_at > self.FRAME_LENGTH + self.LATE_TOLERANCE:
+                self.late_frames += 1
+        self._last_read_at = started
+
+        if not got_frame:
+            return
+
+        if self.startup_time is None:
+            self.startup_time = finished - self.opened_at
+
+        self.frames += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        if latency > self.FRAME_LENGTH:
+            self.underruns += 1
+
+        latency_ms = latency * 1000
+        for idx, bound in enumerate(self.LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.latency_histogram[idx] += 1
+                break
+        else:
+            self.latency_histogram[-1] += 1
+
+    def reset_timing(self) -> None:
+        """
+        Forget when the last read happened, so the gap left by pausing
+        playback is not counted as a late frame.
+        """
+        self._last_read_at = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get a JSON friendly snapshot of the metrics.
+        Times are in seconds, histogram keys are bucket upper bounds in ms.
+        """
+        histogram = list(self.latency_histogram)
+        buckets: Dict[str, int] = {
+            f"<={bound}ms": histogram[idx]
+            for idx, bound in enumerate(self.LATENCY_BUCKETS_MS)
+        }
+        buckets[f">{self.LATENCY_BUCKETS_MS[-1]}ms"] = histogram[-1]
+
+        frames = self.frames
+        return {
+            "frames": frames,
+            "startup_time": self.startup_time,
+            "underruns": self.underruns,
+            "late_frames": self.late_frames,
+            "latency_avg": self.latency_total / frames if frames else 0.0,
+            "latency_max": self.latency_max,
+            "latency_histogram": buckets,
+            "read_ahead": self.read_ahead.stats() if self.read_ahead else None,
+        }
+
+
+class ReadAheadAudioSource(AudioSource):
+    # Frames buffered before the first read returns, so a large buffer does
+    # not delay the start of playback.  Five frames are 100 ms of audio.
+    PREFILL_FRAMES = 5
+
+    def __init__(self, source: AudioSource, frames: int) -> None:
+        """
+        Buffer PCM frames from `source` ahead of playback.
+        A background thread reads frames into a preallocated ring buffer,
+        and read() is served from memory, so short stalls in ffmpeg or the
+        network are absorbed by the buffer instead of being heard.
+        The first read only waits for a few frames, so playback starts quickly
+        and the rest of the buffer fills while it plays.  Later reads only
+        wait if the buffer has run dry.
+
+        :param: source:  A PCM source which returns whole 20 ms frames.
+        :param: frames:  Number of frames to buffer, must be above 0.
+        """
+        if frames <= 0:
+            raise ValueError("frames must be greater than 0")
+
+        self._source = source
+        self._capacity: int = frames
+        self._prefill: int = min(frames, self.PREFILL_FRAMES)
+        self._frame_size: int = OpusEncoder.FRAME_SIZE
+        self._ring = memoryview(bytearray(frames * self._frame_size))
+        self._head: int = 0  # next slot to read from.
+        self._count: int = 0  # number of buffered frames.
+        self._cond = Condition()
+        self._eof: bool = False
+        self._closed: bool = False
+        self._primed: bool = False
+        self._underruns: int = 0
+        self._min_fill: Optional[int] = None
+
+        self._thread = Thread(
+            target=self._fill,
+            name="ReadAheadAudioSource",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _fill(self) -> None:
+        """Read frames from the wrapped source until it ends or we are closed."""
+        while True:
+            with self._cond:
+                while self._count >= self._capacity and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                tail = (self._head + self._count) % self._capacity
+
+            try:
+                data = self._source.read()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # reads fail once cleanup() has stopped ffmpeg, which is expected.
+                if not self._closed:
+                    log.exception("Read-ahead buffer failed to read from the source.")
+                data = b""
+
+            with self._cond:
+                if len(data) != self._frame_size:
+                    self._eof = True
+                    self._cond.notify_all()
+                    return
+                # only this thread writes, and the reader never touches free slots.
+                offset = tail * self._frame_size
+                self._ring[offset : offset + self._frame_size] = data
+                self._count += 1
+                self._cond.notify_all()
+
+    def read(self) -> bytes:
+        with self._cond:
+            if not self._primed:
+                while (
+                    self._count < self._prefill and not self._eof and not self._closed
+                ):
+                    self._cond.wait()
+                self._primed = True
+            elif not self._count and not self._eof:
+                self._underruns += 1
+            while not self._count and not self._eof and not self._closed:
+                self._cond.wait()
+            if not self._count:
+                return b""
+
+            offset = self._head * self._frame_size
+            data = bytes(self._ring[offset : offset + self._frame_size])
+            self._head = (self._head + 1) % self._capacity
+            self._count -= 1
+            if self._min_fill is None or self._count < self._min_fill:
+                self._min_fill = self._count
+            self._cond.notify_all()
+            return data
+
+    def is_opus(self) -> bool:
+        return False
+
+    def cleanup(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        # stops ffmpeg, which also unblocks a pending read in the fill thread.
+        self._source.cleanup()
+
+    @property
+    def fill_level(self) -> float:
+        """Get how full the buffer is, from 0.0 to 1.0."""
+        return self._count / self._capacity
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the buffer size and fill metrics.
+        Underruns count reads which found the buffer empty and had to wait.
+        """
+        with self._cond:
+            return {
+                "capacity": self._capacity,
+                "buffered": self._count,
+                "fill_level": self._count / self._capacity,
+                "min_buffered": self._min_fill,
+                "underruns": self._underruns,
+                "eof": self._eof,
+            }
+
+
+class SourcePlaybackCounter(AudioSource):
+    def __init__(
+        self,
+        source: Union[PCMVolumeTransformer[AudioSource], FFmpegOpusAudio],
+        start_time: float = 0,
+        playback_speed: float = 1.0,
+        stats: Optional[PlaybackStats] = None,
+    ) -> None:
+        """
+        Manage playback source and attempt to count progress frames used
+        to measure playback progress.
+        The source may be an FFmpegOpusAudio, which passes Opus frames from
+        the file straight through without decoding or volume scaling.
+        Each read is timed and recorded in a PlaybackStats object.
+
+        :param: start_time:  A time in seconds that was used in ffmpeg -ss flag.
+        :param: stats:  Existing stats to add to, so they can outlive a source
+            that gets replaced mid-playback.
+        """
+        # NOTE: PCMVolumeTransformer will let you set any crazy value.
+        # But internally it limits between 0 and 2.0.
+        self._source = source
+        self._num_reads: int = 0
+        self._start_time: float = start_time
+        self._playback_speed: float = playback_speed
+        self.stats: PlaybackStats = stats if stats is not None else PlaybackStats()
+
+    def read(self) -> bytes:
+        started = time.perf_counter()
+        res = self._source.read()
+        self.stats.record_read(started, time.perf_counter(), bool(res))
+        if res:
+            self._num_reads += 1
+        return res
+
+    def is_opus(self) -> bool:
+        return self._source.is_opus()
+
+    def cleanup(self) -> None:
+        log.noise(  # type: ignore[attr-defined]
+            "Cleanup got called on the audio source:  %r", self
+        )
+        self._source.cleanup()
+
+    @property
+    def source(self) -> Union[PCMVolumeTransformer[AudioSource], FFmpegOpusAudio]:
+        """Get the wrapped audio source, for example to change its volume."""
+        return self._source
+
+    @property
+    def frames(self) -> int:
+        """
+        Number of read frames since this source was opened.
+        This is not the total playback time.
+        """
+        return self._num_reads
+
+    @property
+    def session_progress(self) -> float:
+        """
+        Like progress but only counts frames from this session.
+        Adjusts the estimated time by playback speed.
+        """
+        return (self._num_reads * 0.02) * self._playback_speed
+
+    @property
+    def progress(self) -> float:
+        """Get an approximate playback progress time."""
+        return self._start_time + self.session_progress
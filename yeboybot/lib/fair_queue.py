@@ -0,0 +1,296 @@
+import random
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import (
+    Callable,
+    Deque,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class FairQueue(Generic[T]):
+    def __init__(
+        self, key: Callable[[T], Optional[Hashable]], items: Iterable[T] = ()
+    ) -> None:
+        """
+        A queue which takes turns between owners, one item at a time.
+        Each owner has a FIFO of items, and owners are kept in a ring where
+        the owner of the next item is first.  Taking an item moves its owner
+        to the back of the ring, so adding, taking, and peeking are O(1) and
+        iteration gives the full round-robin order without rebuilding it.
+
+        Items without an owner are kept in a separate FIFO played after all
+        owned items, except items added to the front which are played first.
+
+        :param: key:  Function which returns the owner of an item, or None.
+        :param: items:  Initial items, as if added with append() in order.
+        """
+        self._key = key
+        # owner -> FIFO of their items, in ring order.
+        self._owners: "OrderedDict[Hashable, Deque[T]]" = OrderedDict()
+        self._unowned: Deque[T] = deque()
+        # number of unowned items at the very front of the queue.
+        self._unowned_front: int = 0
+        self._len: int = 0
+
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> Iterator[T]:
+        yield from islice(self._unowned, self._unowned_front)
+
+        # take the n-th item of each owner in turn, until all run out.
+        iters = [iter(q) for q in self._owners.values()]
+        while iters:
+            remaining = []
+            for it in iters:
+                for item in islice(it, 1):
+                    yield item
+                    remaining.append(it)
+            iters = remaining
+
+        yield from islice(self._unowned, self._unowned_front, None)
+
+    def __getitem__(self, index: int) -> T:
+        """
+        Get the item at `index` in round-robin order.  The first item is O(1)
+        and the last is O(owners), other positions walk the queue in O(n) like
+        indexing the middle of a deque, and are meant for single lookups such
+        as a remove command rather than loops.
+        """
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("FairQueue index out of range")
+        if index == 0:
+            return self.first()  # type: ignore[return-value]
+        if index == self._len - 1:
+            return self.last()  # type: ignore[return-value]
+        return next(islice(self, index, None))
+
+    def __delitem__(self, index: int) -> None:
+        """Remove the item at `index` in round-robin order, in O(n)."""
+        self.remove(self[index])
+
+    def __repr__(self) -> str:
+        return f"FairQueue({list(self)!r})"
+
+    def first(self) -> Optional[T]:
+        """Get the item which would be taken next in O(1), or None if empty."""
+        if self._unowned_front:
+            return self._unowned[0]
+        if self._owners:
+            return next(iter(self._owners.values()))[0]
+        return self._unowned[0] if self._unowned else None
+
+    def last(self) -> Optional[T]:
+        """
+        Get the item which would be taken last, or None if the queue is empty.
+        The last item belongs to the last owner in the ring with the most
+        items, so this scans owners in O(owners).  Owners are the users with
+        entries queued, which are few, while a tail pointer would have to be
+        moved on every take to follow the longest FIFO.
+        """
+        if len(self._unowned) > self._unowned_front:
+            return self._unowned[-1]
+        longest: Optional[Deque[T]] = None
+        for queue in self._owners.values():
+            if longest is None or len(queue) >= len(longest):
+                longest = queue
+        if longest is not None:
+            return longest[-1]
+        return self._unowned[-1] if self._unowned else None
+
+    def previous(self, item: T) -> Optional[T]:
+        """
+        Get the item taken right before `item`, which must be the last item
+        of its owner, as it is after append().  This is O(owners), as the
+        position of the item follows from the length of each owner's FIFO.
+
+        :returns:  The item before `item`, or None if `item` is taken first.
+        :raises: ValueError  if `item` is not the last item of its owner.
+        """
+        owner = self._key(item)
+        if owner is None:
+            back = len(self._unowned) - self._unowned_front
+            if not back or self._unowned[-1] is not item:
+                raise ValueError("item is not the last unowned item")
+            if back > 1:
+                return self._unowned[-2]
+            # the last item of the longest owner is taken before the back FIFO.
+            longest: Optional[Deque[T]] = None
+            for queue in self._owners.values():
+                if longest is None or len(queue) >= len(longest):
+                    longest = queue
+            if longest is not None:
+                return longest[-1]
+        else:
+            queue = self._owners.get(owner, None)
+            if not queue or queue[-1] is not item:
+                raise ValueError("item is not the last item of its owner")
+            # the item is taken in turn `depth`, after owners ahead of it in
+            # the ring which still have an item in that turn.  Otherwise it
+            # follows the last owner with an item in the turn before.
+            depth = len(queue) - 1
+            ahead: Optional[Deque[T]] = None
+            turn_before: Optional[Deque[T]] = None
+            seen = False
+            for other_owner, other in self._owners.items():
+                if other_owner == owner:
+                    seen = True
+                elif not seen and len(other) > depth:
+                    ahead = other
+                if depth and len(other) >= depth:
+                    turn_before = other
+            if ahead is not None:
+                return ahead[depth]
+            if turn_before is not None:
+                return turn_before[depth - 1]
+        if self._unowned_front:
+            return self._unowned[self._unowned_front - 1]
+        return None
+
+    def append(self, item: T) -> None:
+        """Add `item` to the end of its owner's FIFO."""
+        owner = self._key(item)
+        if owner is None:
+            self._unowned.append(item)
+        else:
+            queue = self._owners.get(owner, None)
+            if queue is None:
+                queue = self._owners[owner] = deque()
+            queue.append(item)
+        self._len += 1
+
+    def appendleft(self, item: T) -> None:
+        """Add `item` so it is the next item taken from the queue."""
+        owner = self._key(item)
+        if owner is None:
+            self._unowned.appendleft(item)
+            self._unowned_front += 1
+        else:
+            queue = self._owners.get(owner, None)
+            if queue is None:
+                queue = self._owners[owner] = deque()
+            queue.appendleft(item)
+            self._owners.move_to_end(owner, last=False)
+        self._len += 1
+
+    def extend(self, items: Iterable[T]) -> None:
+        """Add each of `items` with append(), in order."""
+        for item in items:
+            self.append(item)
+
+    def extendleft(self, items: Iterable[T]) -> None:
+        """
+        Add each of `items` with appendleft(), in order.  Like a deque, this
+        puts them at the front in reverse order.
+        """
+        for item in items:
+            self.appendleft(item)
+
+    def insert(self, index: int, item: T) -> None:
+        """
+        Add `item` to the front of the queue if `index` is 0 or less.
+        Owners decide the order of all other items, so they cannot be placed
+        at a given position.
+
+        :raises: ValueError  if `index` is above 0.
+        """
+        if index > 0:
+            raise ValueError("FairQueue items can only be inserted at the front")
+        self.appendleft(item)
+
+    def popleft(self) -> T:
+        """
+        Remove and return the next item, then move its owner to the back.
+
+        :raises: IndexError  if the queue is empty.
+        """
+        if self._unowned_front:
+            self._unowned_front -= 1
+            item = self._unowned.popleft()
+        elif self._owners:
+            owner, queue = next(iter(self._owners.items()))
+            item = queue.popleft()
+            if queue:
+                self._owners.move_to_end(owner)
+            else:
+                del self._owners[owner]
+        elif self._unowned:
+            item = self._unowned.popleft()
+        else:
+            raise IndexError("pop from an empty FairQueue")
+        self._len -= 1
+        return item
+
+    def remove(self, item: T) -> None:
+        """
+        Remove `item` from the queue.
+
+        :raises: ValueError  if the item is not queued.
+        """
+        owner = self._key(item)
+        if owner is None:
+            idx = self._unowned.index(item)
+            del self._unowned[idx]
+            if idx < self._unowned_front:
+                self._unowned_front -= 1
+        else:
+            queue = self._owners.get(owner, None)
+            if queue is None:
+                raise ValueError("item is not in the FairQueue")
+            queue.remove(item)
+            if not queue:
+                del self._owners[owner]
+        self._len -= 1
+
+    def clear(self) -> None:
+        """Remove all items."""
+        self._owners.clear()
+        self._unowned.clear()
+        self._unowned_front = 0
+        self._len = 0
+
+    def shuffle(self) -> None:
+        """Shuffle the order of owners, and the items of each owner."""
+        owners = list(self._owners.items())
+        random.shuffle(owners)
+        self._owners = OrderedDict(owners)
+        for queue in self._owners.values():
+            random.shuffle(queue)
+        random.shuffle(self._unowned)
+
+    def drop_unowned(self) -> List[T]:
+        """Remove all items without an owner and return them."""
+        items = list(self._unowned)
+        self._unowned.clear()
+        self._unowned_front = 0
+        self._len -= len(items)
+        return items
+
+    def count_for(self, owner: Optional[Hashable]) -> int:
+        """Get the number of items queued by `owner`, or without one if None."""
+        if owner is None:
+            return len(self._unowned)
+        queue = self._owners.get(owner, None)
+        return len(queue) if queue else 0
+
+    def first_for(self, owner: Hashable) -> Optional[T]:
+        """Get the next item queued by `owner`, if any."""
+        queue = self._owners.get(owner, None)
+        return queue[0] if queue else None
@@ -0,0 +1,63 @@
+from typing import List, Optional, Sequence
+
+
+class FenwickTree:
+    def __init__(self, size: int, values: Optional[Sequence[float]] = None) -> None:
+        """
+        A binary indexed tree over `size` slots, which can change the value
+        of a slot or sum a range of slots in O(log n).
+
+        :param: size:  Number of slots, all starting at 0.
+        :param: values:  Initial values for the first slots, built in O(n).
+        """
+        self._size: int = size
+        self._tree: List[float] = [0] * (size + 1)
+        if values:
+            tree = self._tree
+            for idx, value in enumerate(values[:size], 1):
+                tree[idx] += value
+                parent = idx + (idx & -idx)
+                if parent <= size:
+                    tree[parent] += tree[idx]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, index: int, delta: float) -> None:
+        """Add `delta` to the value of the slot at `index`."""
+        idx = index + 1
+        while idx <= self._size:
+            self._tree[idx] += delta
+            idx += idx & -idx
+
+    def prefix_sum(self, count: int) -> float:
+        """Get the sum of the first `count` slots."""
+        total: float = 0
+        idx = min(count, self._size)
+        while idx > 0:
+            total += self._tree[idx]
+            idx -= idx & -idx
+        return total
+
+    def range_sum(self, start: int, end: int) -> float:
+        """Get the sum of slots from `start` up to but not including `end`."""
+        if end <= start:
+            return 0
+        return self.prefix_sum(end) - self.prefix_sum(start)
+
+    def find(self, total: float) -> int:
+        """
+        Get the first slot at which the prefix sum reaches `total`, in O(log n).
+        Slot values must not be negative, for example counts of used slots.
+
+        :returns:  The slot index, or the number of slots if no prefix reaches `total`.
+        """
+        pos = 0
+        step = 1 << self._size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self._size and self._tree[nxt] < total:
+                pos = nxt
+                total -= self._tree[nxt]
+            step >>= 1
+        return pos
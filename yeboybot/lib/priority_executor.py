@@ -0,0 +1,223 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# (priority, sequence, enqueue time, future, callable, args, kwargs)
+_WorkItem = Tuple[int, int, float, "Future[Any]", Callable[..., Any], Any, Any]
+
+
+class PriorityThreadPoolExecutor(Executor):
+    def __init__(
+        self,
+        max_workers: int,
+        thread_name_prefix: str = "",
+        default_priority: int = 0,
+    ) -> None:
+        """
+        A thread pool executor which runs queued work in priority order.
+        Lower priority values are run first, work with equal priority is run
+        in the order it was submitted.
+        Worker threads are started only when queued work exceeds idle workers,
+        up to the `max_workers` limit.
+
+        The executor also keeps simple counters for queue depth and the time
+        work spends waiting in the queue before a worker picks it up.
+
+        :param: max_workers:  Maximum number of worker threads, must be above 0.
+        :param: thread_name_prefix:  Prefix used to name worker threads.
+        :param: default_priority:  Priority used by plain submit() calls.
+        """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+
+        self._max_workers: int = max_workers
+        self._thread_name_prefix: str = (
+            thread_name_prefix or f"PriorityThreadPoolExecutor-{id(self)}"
+        )
+        self._default_priority: int = default_priority
+
+        self._cond: threading.Condition = threading.Condition()
+        self._queue: List[_WorkItem] = []
+        self._seq = itertools.count()
+        self._threads: Set[threading.Thread] = set()
+        self._idle: int = 0
+        self._running: int = 0
+        self._shutdown: bool = False
+
+        # metrics
+        self._submitted: int = 0
+        self._completed: int = 0
+        self._wait_total: float = 0.0
+        self._wait_max: float = 0.0
+        self._wait_last: float = 0.0
+
+    @property
+    def max_workers(self) -> int:
+        """Get the maximum number of worker threads for this executor."""
+        return self._max_workers
+
+    def submit(  # type: ignore[override]
+        self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        """
+        Schedule `fn` to be run with the default priority of this executor.
+        """
+        return self.submit_with_priority(self._default_priority, fn, *args, **kwargs)
+
+    def submit_with_priority(
+        self, priority: int, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        """
+        Schedule `fn` to be run with the given `priority`.
+
+        :returns:  A Future for the result of the call.
+
+        :raises:  RuntimeError
+            if the executor has been shut down.
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+
+            future: "Future[Any]" = Future()
+            item: _WorkItem = (
+                int(priority),
+                next(self._seq),
+                time.monotonic(),
+                future,
+                fn,
+                args,
+                kwargs,
+            )
+            heapq.heappush(self._queue, item)
+            self._submitted += 1
+            self._adjust_thread_count()
+            self._cond.notify()
+            return future
+
+    def reprioritize(self, future: "Future[Any]", priority: int) -> bool:
+        """
+        Change the priority of queued work, keeping its original submit order
+        among work with the same priority.
+
+        :returns:  True if the work was still queued and was updated.
+        """
+        with self._cond:
+            for idx, item in enumerate(self._queue):
+                if item[3] is future:
+                    if item[0] == priority:
+                        return True
+                    self._queue[idx] = (int(priority),) + item[1:]  # type: ignore[assignment]
+                    heapq.heapify(self._queue)
+                    return True
+        return False
+
+    def _adjust_thread_count(self) -> None:
+        """Start a new worker if queued work exceeds idle workers.  Lock must be held."""
+        if len(self._queue) <= self._idle:
+            return
+        if len(self._threads) >= self._max_workers:
+            return
+
+        t = threading.Thread(
+            target=self._worker,
+            name=f"{self._thread_name_prefix}_{len(self._threads)}",
+            daemon=True,
+        )
+        self._threads.add(t)
+        t.start()
+
+    def _worker(self) -> None:
+        """Main loop for worker threads, pulls work from the queue until shutdown."""
+        while True:
+            with self._cond:
+                while not self._queue and not self._shutdown:
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+
+                if not self._queue:
+                    # shutdown with nothing left to do.
+                    self._threads.discard(threading.current_thread())
+                    return
+
+                _prio, _seq, queued_at, future, fn, args, kwargs = heapq.heappop(
+                    self._queue
+                )
+                waited = time.monotonic() - queued_at
+                self._wait_total += waited
+                self._wait_last = waited
+                self._wait_max = max(self._wait_max, waited)
+                self._running += 1
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        result = fn(*args, **kwargs)
+                    except BaseException as e:  # pylint: disable=broad-exception-caught
+                        future.set_exception(e)
+                    else:
+                        future.set_result(result)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._completed += 1
+                # drop references to work early so results can be collected.
+                del future, fn, args, kwargs
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop accepting new work and let workers exit once the queue is empty.
+
+        :param: wait:  Block until all worker threads have exited.
+        :param: cancel_futures:  Cancel all work that has not started yet.
+        """
+        with self._cond:
+            self._shutdown = True
+            if cancel_futures:
+                for item in self._queue:
+                    item[3].cancel()
+                self._queue.clear()
+            self._cond.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for t in threads:
+                t.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of worker, queue depth, and wait time metrics.
+        Wait times are in seconds.
+        """
+        with self._cond:
+            queued_by_priority: Dict[int, int] = {}
+            for item in self._queue:
+                queued_by_priority[item[0]] = queued_by_priority.get(item[0], 0) + 1
+
+            started = self._completed + self._running
+            return {
+                "max_workers": self._max_workers,
+                "workers": len(self._threads),
+                "idle": self._idle,
+                "running": self._running,
+                "queued": len(self._queue),
+                "queued_by_priority": dict(sorted(queued_by_priority.items())),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "wait_avg": (self._wait_total / started) if started else 0.0,
+                "wait_max": self._wait_max,
+                "wait_last": self._wait_last,
+            }
+
+    def queue_depth(self, priority: Optional[int] = None) -> int:
+        """
+        Get the number of queued work items, optionally only those with `priority`.
+        """
+        with self._cond:
+            if priority is None:
+                return len(self._queue)
+            return sum(1 for item in self._queue if item[0] == priority)
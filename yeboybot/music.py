@@ -1,6 +1,8 @@
+import io
 import os
 import pathlib
 import json
+import time
 import asyncio
 import logging
 import configparser
@@ -15,6 +17,13 @@ import yt_dlp as youtube_dl
 import spotipy
 from spotipy.oauth2 import SpotifyClientCredentials
 
+from yeboybot.constants import MAX_READ_AHEAD_FRAMES
+from yeboybot.lib.audio_sources import (
+    PlaybackStats,
+    ReadAheadAudioSource,
+    SourcePlaybackCounter,
+)
+
 # Налаштування логування
 logging.basicConfig(
     level=logging.INFO,
@@ -98,6 +107,8 @@ class Music(commands.Cog):
 
         self.queues: Dict[int, List[Dict[str, Any]]] = {}
         self.current_tracks: Dict[int, Optional[Dict[str, Any]]] = {}
+        # Метрики відтворення останнього треку для кожного сервера
+        self.playback_stats: Dict[int, PlaybackStats] = {}
 
         self.data_path = "data/music"
         self.queue_path = "data/queues"
@@ -154,6 +165,14 @@ class Music(commands.Cog):
         if not client_id or not client_secret:
             raise ValueError("Потрібно вказати Spotify_ClientID та Spotify_ClientSecret у config/options.ini")
 
+        # Буфер кадрів наперед (ReadAheadFrames), обмежений MAX_READ_AHEAD_FRAMES
+        try:
+            read_ahead_frames = config_parser.getint("MusicBot", "ReadAheadFrames", fallback=0)
+        except ValueError:
+            logger.warning("Невірне значення ReadAheadFrames, буфер наперед вимкнено.")
+            read_ahead_frames = 0
+        self._read_ahead_frames = min(max(0, read_ahead_frames), MAX_READ_AHEAD_FRAMES)
+
         self.spotify = spotipy.Spotify(
             auth_manager=SpotifyClientCredentials(client_id=client_id, client_secret=client_secret)
         )
@@ -180,6 +199,11 @@ class Music(commands.Cog):
             return parsed.geturl()
         return url
 
+    @property
+    def read_ahead_frames(self) -> int:
+        """Кількість кадрів по 20 мс, що буферизуються наперед, з опції ReadAheadFrames (0 – вимкнено)."""
+        return self._read_ahead_frames
+
     ##########################################
     # Методи роботи з кешем та файлами
     ##########################################
@@ -385,7 +409,11 @@ class Music(commands.Cog):
 
     @commands.command(help="Відновити відтворення.")
     async def resume(self, ctx: commands.Context) -> None:
-        if ctx.voice_client and ctx.voice_client.is_paузed():
+        if ctx.voice_client and ctx.voice_client.is_paused():
+            stats = self.playback_stats.get(ctx.guild.id)
+            if stats:
+                # Пауза не повинна рахуватись як запізнілі кадри
+                stats.reset_timing()
             ctx.voice_client.resume()
             await self._send_embed_footer(ctx, "▶️ Відтворення відновлено.")
         else:
@@ -415,8 +443,11 @@ class Music(commands.Cog):
         if 0 <= volume <= 100:
             self.default_volume = volume / 100
             if ctx.voice_client and ctx.voice_client.source:
-                if isinstance(ctx.voice_client.source, discord.PCMVolumeTransformer):
-                    ctx.voice_client.source.volume = self.default_volume
+                source = ctx.voice_client.source
+                if isinstance(source, SourcePlaybackCounter):
+                    source = source.source
+                if isinstance(source, discord.PCMVolumeTransformer):
+                    source.volume = self.default_volume
             await self._send_embed_footer(ctx, f"🔊 Гучність встановлено на: {volume}%.")
         else:
             await self._send_embed_footer(ctx, "❌ Невірне значення (0-100).")
@@ -437,6 +468,45 @@ class Music(commands.Cog):
         else:
             await self._send_embed_footer(ctx, "❌ Наразі нічого не грає.")
 
+    @commands.command(help="Показати метрики відтворення (json – надіслати файлом).")
+    async def playstats(self, ctx: commands.Context, fmt: str = "") -> None:
+        guild_id = ctx.guild.id
+        stats = self.playback_stats.get(guild_id)
+        if not stats:
+            await self._send_embed_footer(ctx, "❌ Ще немає даних про відтворення.")
+            return
+
+        data = stats.to_dict()
+        if fmt.lower() == "json":
+            current = self.current_tracks.get(guild_id) or {}
+            dump = {
+                "guild_id": guild_id,
+                "timestamp": time.time(),
+                "title": current.get("title"),
+                "playing": bool(ctx.voice_client and ctx.voice_client.is_playing()),
+                "stats": data,
+            }
+            payload = json.dumps(dump, indent=2, ensure_ascii=False).encode("utf-8")
+            await ctx.send(file=discord.File(io.BytesIO(payload), filename=f"playback_stats_{guild_id}.json"))
+            return
+
+        startup = data["startup_time"]
+        embed = discord.Embed(title="📊 Метрики відтворення")
+        embed.add_field(name="Кадрів", value=str(data["frames"]))
+        embed.add_field(name="Запуск ffmpeg", value=f"{startup * 1000:.0f} мс" if startup is not None else "—")
+        embed.add_field(name="Недобори", value=str(data["underruns"]))
+        embed.add_field(name="Запізнілі кадри", value=str(data["late_frames"]))
+        embed.add_field(
+            name="Затримка читання",
+            value=f"сер. {data['latency_avg'] * 1000:.2f} мс, макс. {data['latency_max'] * 1000:.2f} мс",
+        )
+        embed.add_field(
+            name="Гістограма затримки",
+            value="\n".join(f"{k}: {v}" for k, v in data["latency_histogram"].items()),
+            inline=False,
+        )
+        await ctx.send(embed=embed)
+
     @commands.command(help="Видалити трек із черги за індексом.")
     async def remove(self, ctx: commands.Context, index: int) -> None:
         guild_id = ctx.guild.id
@@ -720,6 +790,8 @@ class Music(commands.Cog):
 
                 ffmpeg_opts = "-vn"
                 before_opts = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+                # Час запуску ffmpeg рахується звідси до першого кадру
+                stats = PlaybackStats()
                 try:
                     source = discord.FFmpegPCMAudio(
                         stream_url,
@@ -727,19 +799,27 @@ class Music(commands.Cog):
                         before_options=before_opts,
                         options=ffmpeg_opts
                     )
+                    # Буфер згладжує затримки мережі (-reconnect) та ffmpeg
+                    read_ahead_frames = self.read_ahead_frames
+                    if read_ahead_frames:
+                        source = ReadAheadAudioSource(source, read_ahead_frames)
+                        stats.read_ahead = source
                     source = discord.PCMVolumeTransformer(source, volume=self.default_volume)
+                    source = SourcePlaybackCounter(source, stats=stats)
                 except Exception as e:
                     logger.exception(f"Помилка створення FFmpegPCMAudio для {title}: {e}")
                     retry_count += 1
                     continue
 
                 self.current_tracks[guild_id] = {"title": title, "duration": data.get("duration")}
+                self.playback_stats[guild_id] = stats
 
                 def after_playing(error: Optional[Exception]) -> None:
                     if error:
                         logger.error(f"Помилка після програвання {title}: {error}", exc_info=True)
                     else:
                         logger.debug(f"Трек '{title}' завершив відтворення.")
+                    logger.debug(f"Метрики відтворення '{title}': {stats.to_dict()}")
                     self.current_tracks[guild_id] = None
                     # Запускаємо наступний трек у окремій задачі
                     asyncio.run_coroutine_threadsafe(self._play_next(ctx), self.bot.loop)
@@ -3,17 +3,29 @@ import io
 import json
 import logging
 import os
+import re
 import sys
 import time
 from enum import Enum
 from threading import Thread
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import IO, TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
 
-from discord import AudioSource, FFmpegPCMAudio, PCMVolumeTransformer, VoiceClient
+from discord import (
+    AudioSource,
+    FFmpegOpusAudio,
+    FFmpegPCMAudio,
+    PCMVolumeTransformer,
+    VoiceClient,
+)
 
 from .constructs import Serializable, Serializer, SkipState
 from .entry import LocalFilePlaylistEntry, StreamPlaylistEntry, URLPlaylistEntry
 from .exceptions import FFmpegError, FFmpegWarning
+from .lib.audio_sources import (
+    PlaybackStats,
+    ReadAheadAudioSource,
+    SourcePlaybackCounter,
+)
 from .lib.event_emitter import EventEmitter
 
 if TYPE_CHECKING:
@@ -29,6 +41,9 @@ EntryTypes = Union[URLPlaylistEntry, StreamPlaylistEntry, LocalFilePlaylistEntry
 
 log = logging.getLogger(__name__)
 
+# Only exists on Windows, isinstance() against an empty tuple is always False.
+_ProactorEventLoop: Any = getattr(asyncio, "ProactorEventLoop", ())
+
 
 class MusicPlayerState(Enum):
     STOPPED = 0  # When the player isn't playing anything
@@ -43,60 +58,6 @@ class MusicPlayerState(Enum):
         return self.name
 
 
-class SourcePlaybackCounter(AudioSource):
-    def __init__(
-        self,
-        source: PCMVolumeTransformer[FFmpegPCMAudio],
-        start_time: float = 0,
-        playback_speed: float = 1.0,
-    ) -> None:
-        """
-        Manage playback source and attempt to count progress frames used
-        to measure playback progress.
-
-        :param: start_time:  A time in seconds that was used in ffmpeg -ss flag.
-        """
-        # NOTE: PCMVolumeTransformer will let you set any crazy value.
-        # But internally it limits between 0 and 2.0.
-        self._source = source
-        self._num_reads: int = 0
-        self._start_time: float = start_time
-        self._playback_speed: float = playback_speed
-
-    def read(self) -> bytes:
-        res = self._source.read()
-        if res:
-            self._num_reads += 1
-        return res
-
-    def cleanup(self) -> None:
-        log.noise(  # type: ignore[attr-defined]
-            "Cleanup got called on the audio source:  %r", self
-        )
-        self._source.cleanup()
-
-    @property
-    def frames(self) -> int:
-        """
-        Number of read frames since this source was opened.
-        This is not the total playback time.
-        """
-        return self._num_reads
-
-    @property
-    def session_progress(self) -> float:
-        """
-        Like progress but only counts frames from this session.
-        Adjusts the estimated time by playback speed.
-        """
-        return (self._num_reads * 0.02) * self._playback_speed
-
-    @property
-    def progress(self) -> float:
-        """Get an approximate playback progress time."""
-        return self._start_time + self.session_progress
-
-
 class MusicPlayer(EventEmitter, Serializable):
     def __init__(
         self,
@@ -134,8 +95,15 @@ class MusicPlayer(EventEmitter, Serializable):
         self._source: Optional[SourcePlaybackCounter] = None
 
         self.playlist.on("entry-added", self.on_entry_added)
+        self.playlist.on("entries-added", self.on_entries_added)
+        self.playlist.on("entries-changed", self.on_entries_changed)
         self.playlist.on("entry-failed", self.on_entry_failed)
 
+        # the queue and current entry are saved by the bot's debounced store.
+        queue_store = getattr(bot, "queue_store", None)
+        if queue_store is not None:
+            queue_store.watch(self)
+
     @property
     def volume(self) -> float:
         """Get the volume level as last set by config or command."""
@@ -146,10 +114,120 @@ class MusicPlayer(EventEmitter, Serializable):
         """
         Set volume to the given `value` and immediately apply it to any
         active playback source.
+        Opus passthrough playback cannot scale volume, so it is switched
+        over to a PCM source at the current position instead.
         """
         self._volume = value
-        if self._source:
-            self._source._source.volume = value
+        if not self._source:
+            return
+        if self._source.is_opus():
+            if value != 1.0:
+                self._switch_to_pcm_source()
+            return
+        self._source._source.volume = value  # type: ignore[union-attr]
+
+    def _switch_to_pcm_source(self) -> None:
+        """
+        Replace an Opus passthrough source with a PCM source which supports
+        volume, starting at the current playback progress.
+        """
+        entry = self._current_entry
+        old_source = self._source
+        if entry is None or old_source is None or self._current_player is None:
+            return
+
+        progress = old_source.progress
+        log.debug(
+            "Switching from Opus passthrough to PCM playback at %.2f seconds.",
+            progress,
+        )
+        aoptions = "-vn"
+        if isinstance(entry, (URLPlaylistEntry, LocalFilePlaylistEntry)):
+            aoptions = entry.aoptions
+        stderr_pipe = None
+        if self._stderr_future is not None:
+            # the old pipe closes with the old ffmpeg, the new one needs its own future.
+            self._stderr_future = asyncio.Future()
+            stderr_pipe = stderr_monitor.open_pipe(self.loop, self._stderr_future)
+        try:
+            self._source = self._create_source(
+                entry,
+                before_options=f"-nostdin -ss {progress}",
+                options=aoptions,
+                start_time=progress,
+                passthrough=False,
+                stderr=stderr_pipe,
+                stats=old_source.stats,
+            )
+        finally:
+            if stderr_pipe is not None:
+                stderr_pipe.close()
+        self._current_player.source = self._source
+        old_source.cleanup()
+
+    def _create_source(
+        self,
+        entry: EntryTypes,
+        before_options: str,
+        options: str,
+        start_time: float,
+        passthrough: bool,
+        stderr: Optional[IO[bytes]] = None,
+        stats: Optional[PlaybackStats] = None,
+    ) -> SourcePlaybackCounter:
+        """
+        Create a playback source for `entry` with the given ffmpeg options.
+        If `passthrough` is set, Opus frames are copied from the file as-is.
+        The ffmpeg process writes its stderr output to `stderr`, if given.
+        Playback metrics are added to `stats`, or a new PlaybackStats.
+        PCM sources are wrapped in a read-ahead buffer if ReadAheadFrames is set.
+        """
+        if stats is None:
+            stats = PlaybackStats()
+        if passthrough:
+            source: Union[PCMVolumeTransformer[AudioSource], FFmpegOpusAudio] = (
+                FFmpegOpusAudio(
+                    entry.filename,
+                    before_options=before_options,
+                    options=options,
+                    codec="copy",
+                    stderr=stderr,
+                )
+            )
+            stats.read_ahead = None
+        else:
+            pcm: AudioSource = FFmpegPCMAudio(
+                entry.filename,
+                before_options=before_options,
+                options=options,
+                stderr=stderr,
+            )
+            # volume is applied after the buffer, so changes are heard right away.
+            if self.bot.config.read_ahead_frames:
+                pcm = ReadAheadAudioSource(pcm, self.bot.config.read_ahead_frames)
+                stats.read_ahead = pcm
+            else:
+                stats.read_ahead = None
+            source = PCMVolumeTransformer(pcm, self.volume)
+        return SourcePlaybackCounter(
+            source,
+            start_time=start_time,
+            playback_speed=entry.playback_speed,
+            stats=stats,
+        )
+
+    def _can_passthrough(self, entry: EntryTypes, options: str) -> bool:
+        """
+        Check if `entry` can be played by passing its Opus frames through,
+        which needs an Ogg/Opus cache file, no audio filters, and 100% volume.
+        """
+        return (
+            self.bot.config.opus_cache
+            and self.volume == 1.0
+            and options == "-vn"
+            and not isinstance(entry, StreamPlaylistEntry)
+            and entry.filename.endswith(".opus")
+        )
 
     def on_entry_added(
         self, playlist: "Playlist", entry: EntryTypes, defer_serialize: bool = False
@@ -165,6 +243,20 @@ class MusicPlayer(EventEmitter, Serializable):
             defer_serialize=defer_serialize,
         )
 
+    def on_entries_added(self, playlist: "Playlist", entries: List[EntryTypes]) -> None:
+        """
+        Event dispatched by Playlist when many entries are added to the queue
+        at once, like from a playlist import.
+        """
+        self.emit("entries-added", player=self, playlist=playlist, entries=entries)
+
+    def on_entries_changed(self, playlist: "Playlist") -> None:
+        """
+        Event dispatched by Playlist when entries are removed, moved, or
+        shuffled, or the queue is cleared.
+        """
+        self.emit("entries-changed", player=self, playlist=playlist)
+
     def on_entry_failed(self, entry: EntryTypes, error: Exception) -> None:
         """
         Event dispatched by Playlist when an entry failed to ready or play.
@@ -206,6 +298,8 @@ class MusicPlayer(EventEmitter, Serializable):
             "MusicPlayer.resume() is called:  %s", repr(self)
         )
         if self.is_paused and self._current_player:
+            if self._source:
+                self._source.stats.reset_timing()
             self._current_player.resume()
             self.state = MusicPlayerState.PLAYING
             self.emit("resume", player=self, entry=self.current_entry)
@@ -274,10 +368,15 @@ class MusicPlayer(EventEmitter, Serializable):
             log.debug("Playback finished, but _current_entry is None.")
             return
 
+        if self._source:
+            log.voicedebug(  # type: ignore[attr-defined]
+                "Playback stats for %r:  %s", entry, self._source.stats.to_dict()
+            )
+
         if self.repeatsong:
-            self.playlist.entries.appendleft(entry)
+            self.playlist.requeue_entry(entry, head=True)
         elif self.loopqueue:
-            self.playlist.entries.append(entry)
+            self.playlist.requeue_entry(entry)
 
         # TODO: investigate if this is cruft code or not.
         if self._current_player:
@@ -415,21 +514,31 @@ class MusicPlayer(EventEmitter, Serializable):
                     entry.filename,
                 )
 
-                stderr_io = io.BytesIO()
-
-                self._source = SourcePlaybackCounter(
-                    PCMVolumeTransformer(
-                        FFmpegPCMAudio(
-                            entry.filename,
-                            before_options=boptions,
-                            options=aoptions,
-                            stderr=stderr_io,
-                        ),
-                        self.volume,
-                    ),
-                    start_time=entry.start_time,
-                    playback_speed=entry.playback_speed,
-                )
+                passthrough = self._can_passthrough(entry, aoptions)
+                if passthrough:
+                    log.voicedebug(  # type: ignore[attr-defined]
+                        "Using Opus passthrough for:  %s", entry.filename
+                    )
+
+                # ffmpeg startup time is measured from here to the first frame.
+                stats = PlaybackStats()
+
+                # ffmpeg stderr is checked by the shared monitor, which sets this future.
+                self._stderr_future = asyncio.Future()
+                stderr_pipe = stderr_monitor.open_pipe(self.loop, self._stderr_future)
+                try:
+                    self._source = self._create_source(
+                        entry,
+                        before_options=boptions,
+                        options=aoptions,
+                        start_time=entry.start_time,
+                        passthrough=passthrough,
+                        stderr=stderr_pipe,
+                        stats=stats,
+                    )
+                finally:
+                    # ffmpeg has its own copy now, the monitor sees EOF when it exits.
+                    stderr_pipe.close()
                 log.voicedebug(  # type: ignore[attr-defined]
                     "Playing %r using %r", self._source, self.voice_client
                 )
@@ -441,15 +550,9 @@ class MusicPlayer(EventEmitter, Serializable):
                 self.state = MusicPlayerState.PLAYING
                 self._current_entry = entry
 
-                self._stderr_future = asyncio.Future()
-
-                stderr_thread = Thread(
-                    target=filter_stderr,
-                    args=(stderr_io, self._stderr_future),
-                    name="MB_FFmpegStdErrReader",
-                )
-
-                stderr_thread.start()
+                if isinstance(entry, URLPlaylistEntry):
+                    # keeps recently played files in the cache the longest.
+                    self.bot.filecache.mark_played(entry.filename)
 
                 self.emit("play", player=self, entry=entry)
 
@@ -470,6 +573,7 @@ class MusicPlayer(EventEmitter, Serializable):
                 for _ in range(3):
                     try:
                         os.unlink(filename)
+                        self.bot.filecache.untrack_file(filename)
                         log.debug("File deleted:  %s", filename)
                         break
                     except PermissionError as e:
@@ -504,7 +608,8 @@ class MusicPlayer(EventEmitter, Serializable):
                     "entry": self.current_entry,
                     "progress": self.progress if self.progress > 1 else None,
                 },
-                "entries": self.playlist,
+                # a copy of the entries, so the result can be encoded in another thread.
+                "entries": self.playlist.__json__(),
             }
         )
 
@@ -525,7 +630,7 @@ class MusicPlayer(EventEmitter, Serializable):
 
         data_pl = raw_json.get("entries")
         if data_pl and data_pl.entries:
-            player.playlist.entries = data_pl.entries
+            player.playlist.replace_entries(data_pl.entries)
 
         current_entry_data = raw_json["current_entry"]
         if current_entry_data["entry"]:
@@ -535,24 +640,27 @@ class MusicPlayer(EventEmitter, Serializable):
                 entry, (URLPlaylistEntry, LocalFilePlaylistEntry)
             ):
                 entry.set_start_time(progress)
-            player.playlist.entries.appendleft(current_entry_data["entry"])
+            player.playlist.requeue_entry(entry, head=True)
         return player
 
     @classmethod
     def from_json(
         cls,
         raw_json: str,
-        bot: "MusicBot",  # pylint: disable=unused-argument
-        voice_client: VoiceClient,  # pylint: disable=unused-argument
-        playlist: "Playlist",  # pylint: disable=unused-argument
+        bot: "MusicBot",
+        voice_client: VoiceClient,
+        playlist: "Playlist",
     ) -> Optional["MusicPlayer"]:
         """
         Create a MusicPlayer instance from serialized `raw_json` string data.
-        The remaining arguments are made available to the MusicPlayer
-        and other serialized instances via call frame inspection.
+        The remaining arguments are passed to the _deserialize methods of
+        the MusicPlayer and other serialized instances.
         """
+        hook = Serializer.object_hook(
+            bot=bot, voice_client=voice_client, playlist=playlist
+        )
         try:
-            obj = json.loads(raw_json, object_hook=Serializer.deserialize)
+            obj = json.loads(raw_json, object_hook=hook)
             if isinstance(obj, MusicPlayer):
                 return obj
             log.error(
@@ -598,6 +706,15 @@ class MusicPlayer(EventEmitter, Serializable):
             return self._source.progress
         return 0
 
+    @property
+    def playback_stats(self) -> Optional[PlaybackStats]:
+        """
+        Get playback health metrics for the current or last played source.
+        """
+        if self._source:
+            return self._source.stats
+        return None
+
     @property
     def session_progress(self) -> float:
         """
@@ -612,45 +729,215 @@ class MusicPlayer(EventEmitter, Serializable):
 # TODO: I need to add a check if the event loop is closed?
 
 
-def filter_stderr(stderr: io.BytesIO, future: AsyncFuture) -> None:
-    """
-    Consume a `stderr` bytes stream and check it for errors or warnings.
-    Set the given `future` with either an error found in the stream or
-    set the future with a successful result.
-    """
-    last_ex = None
-    while not future.done():
-        data = stderr.readline()
-        if data:
+class FFmpegStderrMonitor:
+    def __init__(self) -> None:
+        """
+        Watch stderr output of playback ffmpeg processes for errors and warnings.
+        Each process gets its own pipe, which is read by the event loop without
+        blocking, so no thread or polling is needed per playback.
+        On Windows the proactor event loop reads an overlapped named pipe.
+        Where the event loop cannot watch pipes, like the Windows selector
+        loop, a blocking reader thread is used for each pipe instead.
+        """
+        self._active: int = 0
+        # the loop only keeps weak references to tasks, so they are kept here.
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def active(self) -> int:
+        """Get the number of stderr pipes currently being watched."""
+        return self._active
+
+    def open_pipe(
+        self, loop: asyncio.AbstractEventLoop, future: AsyncFuture
+    ) -> IO[bytes]:
+        """
+        Create a pipe for the stderr of one ffmpeg process and start watching it.
+        The `future` is given an FFmpegError if one is found in the output,
+        or True once the process closes the pipe.
+
+        :returns:  The write end of the pipe, to pass as stderr to ffmpeg.
+            The caller must close it once the process has been started.
+        """
+        self._active += 1
+        if os.name == "nt" and isinstance(loop, _ProactorEventLoop):
+            overlapped_reader, write_fd = self._open_overlapped_pipe()
+            self._start_watch(loop, overlapped_reader, future)
+        else:
+            read_fd, write_fd = os.pipe()
+            reader = os.fdopen(read_fd, "rb", buffering=0)
+            if os.name == "nt":
+                self._start_reader_thread(loop, reader, future)
+            else:
+                self._start_watch(loop, reader, future)
+        return os.fdopen(write_fd, "wb", buffering=0)
+
+    @staticmethod
+    def _open_overlapped_pipe() -> Tuple[Any, int]:
+        """
+        Create a pipe which the Windows proactor loop can read without a thread,
+        the same way asyncio creates pipes for subprocesses.
+
+        :returns:  A PipeHandle for the overlapped read end, and a file
+            descriptor for the write end.
+        """
+        # pylint: disable=import-outside-toplevel
+        import msvcrt
+        from asyncio import windows_utils
+
+        # these only exist on Windows, so type checks elsewhere cannot see them.
+        pipe = windows_utils.pipe  # type: ignore[attr-defined]
+        pipe_handle = windows_utils.PipeHandle  # type: ignore[attr-defined]
+        read_handle, write_handle = pipe(overlapped=(True, False))
+        write_fd = msvcrt.open_osfhandle(write_handle, 0)  # type: ignore[attr-defined]
+        return pipe_handle(read_handle), write_fd
+
+    def _start_watch(
+        self, loop: asyncio.AbstractEventLoop, pipe: Any, future: AsyncFuture
+    ) -> None:
+        """Start a task reading `pipe` in the event loop, and keep a reference to it."""
+        task = loop.create_task(self._watch(loop, pipe, future))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _start_reader_thread(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pipe: IO[bytes],
+        future: AsyncFuture,
+    ) -> None:
+        """Start a blocking reader thread for `pipe`."""
+        Thread(
+            target=self._read_blocking,
+            args=(loop, pipe, future),
+            name="MB_FFmpegStdErrReader",
+            daemon=True,
+        ).start()
+
+    async def _watch(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pipe: Any,
+        future: AsyncFuture,
+    ) -> None:
+        """
+        Read lines from `pipe` in the event loop until ffmpeg closes it.
+        The pipe is a file object, or a PipeHandle on Windows.
+        """
+        reader = asyncio.StreamReader()
+        try:
+            transport, _ = await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), pipe
+            )
+        except (OSError, NotImplementedError):
+            if isinstance(pipe, io.IOBase):
+                log.debug("Event loop cannot watch pipes, using a reader thread.")
+                self._start_reader_thread(loop, pipe, future)  # type: ignore[arg-type]
+            else:
+                log.exception("Failed to watch ffmpeg stderr pipe.")
+                pipe.close()
+                self._finish(future, None)
+            return
+
+        last_ex: Optional[Exception] = None
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # line was longer than the buffer limit, skip it.
+                    continue
+                if not line:
+                    break
+                last_ex = self._handle_line(line, future) or last_ex
+        finally:
+            transport.close()
+            self._finish(future, last_ex)
+
+    def _read_blocking(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pipe: IO[bytes],
+        future: AsyncFuture,
+    ) -> None:
+        """
+        Read lines from `pipe` with blocking calls, passing them to the loop.
+        This is the fallback for event loops which cannot watch pipes.
+        """
+        try:
+            with pipe:
+                for line in pipe:
+                    loop.call_soon_threadsafe(self._handle_line, line, future)
+        except (OSError, ValueError):
             log.ffmpeg(  # type: ignore[attr-defined]
-                "Data from ffmpeg: %s",
-                repr(data),
+                "Reading ffmpeg stderr stopped with an error.", exc_info=True
             )
-            try:
-                if check_stderr(data):
-                    sys.stderr.buffer.write(data)
-                    sys.stderr.buffer.flush()
+        finally:
+            loop.call_soon_threadsafe(self._finish, future, None)
 
-            except FFmpegError as e:
-                log.ffmpeg(  # type: ignore[attr-defined]
-                    "Error from ffmpeg: %s", str(e).strip()
-                )
-                last_ex = e
-                if not future.done():
-                    future.set_exception(e)
+    def _handle_line(self, line: bytes, future: AsyncFuture) -> Optional[Exception]:
+        """
+        Check a line of ffmpeg output and set `future` if it holds an error.
 
-            except FFmpegWarning as e:
-                log.ffmpeg(  # type: ignore[attr-defined]
-                    "Warning from ffmpeg:  %s", str(e).strip()
-                )
-        else:
-            time.sleep(0.5)
+        :returns:  The FFmpegError found in the line, if any.
+        """
+        log.ffmpeg("Data from ffmpeg: %s", repr(line))  # type: ignore[attr-defined]
+        try:
+            if check_stderr(line):
+                sys.stderr.buffer.write(line)
+                sys.stderr.buffer.flush()
 
-    if not future.done():
-        if last_ex:
-            future.set_exception(last_ex)
-        else:
-            future.set_result(True)
+        except FFmpegError as e:
+            log.ffmpeg(  # type: ignore[attr-defined]
+                "Error from ffmpeg: %s", str(e).strip()
+            )
+            if not future.done():
+                future.set_exception(e)
+            return e
+
+        except FFmpegWarning as e:
+            log.ffmpeg(  # type: ignore[attr-defined]
+                "Warning from ffmpeg:  %s", str(e).strip()
+            )
+        return None
+
+    def _finish(self, future: AsyncFuture, last_ex: Optional[Exception]) -> None:
+        """Resolve `future` once its pipe is closed, if nothing else did."""
+        self._active -= 1
+        if not future.done():
+            if last_ex:
+                future.set_exception(last_ex)
+            else:
+                future.set_result(True)
+
+
+# Shared by all players, so stderr monitoring does not add threads per guild.
+stderr_monitor = FFmpegStderrMonitor()
+
+# Known ffmpeg messages, matched in a single pass over each line of output.
+FFMPEG_STDERR_RE = re.compile(
+    "(?P<warning>"
+    + "|".join(
+        re.escape(msg)
+        for msg in [
+            "Header missing",
+            "Estimating duration from birate, this may be inaccurate",
+            "Using AVStream.codec to pass codec parameters to muxers is deprecated, use AVStream.codecpar instead.",
+            "Application provided invalid, non monotonically increasing dts to muxer in stream",
+            "Last message repeated",
+            "Failed to send close message",
+            "decode_band_types: Input buffer exhausted before END element found",
+        ]
+    )
+    + ")|(?P<error>"
+    + "|".join(
+        re.escape(msg)
+        for msg in [
+            "Invalid data found when processing input",  # need to regex this properly, its both a warning and an error
+        ]
+    )
+    + ")"
+)
 
 
 def check_stderr(data: bytes) -> bool:
@@ -676,24 +963,13 @@ def check_stderr(data: bytes) -> bool:
 
     log.ffmpeg("Decoded data from ffmpeg: %s", ddata)  # type: ignore[attr-defined]
 
-    # TODO: Regex
-    warnings = [
-        "Header missing",
-        "Estimating duration from birate, this may be inaccurate",
-        "Using AVStream.codec to pass codec parameters to muxers is deprecated, use AVStream.codecpar instead.",
-        "Application provided invalid, non monotonically increasing dts to muxer in stream",
-        "Last message repeated",
-        "Failed to send close message",
-        "decode_band_types: Input buffer exhausted before END element found",
-    ]
-    errors = [
-        "Invalid data found when processing input",  # need to regex this properly, its both a warning and an error
-    ]
-
-    if any(msg in ddata for msg in warnings):
-        raise FFmpegWarning(ddata)
-
-    if any(msg in ddata for msg in errors):
+    is_error = False
+    for match in FFMPEG_STDERR_RE.finditer(ddata):
+        if match.lastgroup == "warning":
+            raise FFmpegWarning(ddata)
+        is_error = True
+
+    if is_error:
         raise FFmpegError(ddata)
 
     return True
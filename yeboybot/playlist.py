@@ -1,5 +1,6 @@
 import asyncio
 import datetime
+import functools
 import logging
 from collections import deque
 from itertools import islice
@@ -9,6 +10,7 @@ from typing import (
     Any,
     Deque,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
@@ -18,11 +20,18 @@ from typing import (
 
 import discord
 
-from .constants import DEFAULT_PRE_DOWNLOAD_DELAY
-from .constructs import Serializable
-from .entry import LocalFilePlaylistEntry, StreamPlaylistEntry, URLPlaylistEntry
+from .constants import HEAD_CONTENT_CHECKED_EXTRACTORS
+from .constructs import JobPriority, Serializable
+from .entry import (
+    AsyncFuture,
+    LocalFilePlaylistEntry,
+    StreamPlaylistEntry,
+    URLPlaylistEntry,
+)
 from .exceptions import ExtractionError, InvalidDataError, WrongEntryTypeError
 from .lib.event_emitter import EventEmitter
+from .lib.fair_queue import FairQueue
+from .lib.fenwick import FenwickTree
 
 if TYPE_CHECKING:
     from .bot import MusicBot
@@ -31,6 +40,7 @@ if TYPE_CHECKING:
 
 # type aliases
 EntryTypes = Union[URLPlaylistEntry, StreamPlaylistEntry, LocalFilePlaylistEntry]
+EntryQueue = Union[Deque[EntryTypes], FairQueue[EntryTypes]]
 
 GuildMessageableChannels = Union[
     discord.VoiceChannel,
@@ -42,6 +52,289 @@ GuildMessageableChannels = Union[
 log = logging.getLogger(__name__)
 
 
+def _get_entry_author(entry: EntryTypes) -> Optional["discord.abc.User"]:
+    """Get the author of `entry`, used to take turns in round-robin mode."""
+    return entry.author
+
+
+class QueueDurationIndex:
+    # Free slots left after each entry when the index is rebuilt, so entries
+    # can be inserted between others without another rebuild.
+    SLOT_GAP = 16
+
+    def __init__(self) -> None:
+        """
+        Keep running duration totals over queue positions, so the time until
+        any position can be estimated in O(log n).
+        Entries take slots in queue order, spaced SLOT_GAP apart, in three
+        Fenwick trees: one summing known durations, one counting entries with
+        unknown duration, and one counting used slots to find the slot of any
+        queue position.
+        Adding an entry at either end or after a given entry, taking from the
+        front, and removing an entry are O(log n) updates.  The slot between
+        two entries is used for an insert, so the index is only rebuilt once
+        the gap there is used up, or after changes like a shuffle which mark
+        it stale.  Rebuilds are O(n) and happen the next time it is used.
+        """
+        self._stale: bool = True
+        self._len: int = 0
+        self._slots: List[Optional[EntryTypes]] = []
+        self._slot_of: Dict[EntryTypes, int] = {}
+        self._durations: List[Optional[float]] = []
+        self._seconds: FenwickTree = FenwickTree(0)
+        self._unknown: FenwickTree = FenwickTree(0)
+        self._used: FenwickTree = FenwickTree(0)
+
+    def invalidate(self) -> None:
+        """Mark the index as stale, so it is rebuilt before the next use."""
+        self._stale = True
+
+    def rebuild(self, entries: Iterable[EntryTypes]) -> None:
+        """Rebuild the index from `entries` in queue order, in O(n)."""
+        items = list(entries)
+        # leave room to add half as many entries again at either end.
+        pad = len(items) // 2 + 8
+        size = (len(items) + pad * 2) * self.SLOT_GAP
+
+        self._slots = [None] * size
+        self._durations = [None] * size
+        seconds: List[float] = [0] * size
+        unknown: List[float] = [0] * size
+        used: List[float] = [0] * size
+        self._slot_of = {}
+        for idx, entry in enumerate(items, pad):
+            slot = idx * self.SLOT_GAP
+            duration = entry.duration
+            self._slots[slot] = entry
+            self._durations[slot] = duration
+            self._slot_of[entry] = slot
+            used[slot] = 1
+            if duration is None:
+                unknown[slot] = 1
+            else:
+                seconds[slot] = duration
+
+        self._seconds = FenwickTree(size, seconds)
+        self._unknown = FenwickTree(size, unknown)
+        self._used = FenwickTree(size, used)
+        self._len = len(items)
+        self._stale = False
+
+    def _set_slot(self, slot: int, entry: EntryTypes) -> None:
+        """Put `entry` in an empty slot and add its duration to the totals."""
+        duration = entry.duration
+        self._slots[slot] = entry
+        self._durations[slot] = duration
+        self._slot_of[entry] = slot
+        self._used.add(slot, 1)
+        if duration is None:
+            self._unknown.add(slot, 1)
+        else:
+            self._seconds.add(slot, duration)
+        self._len += 1
+
+    def _clear_slot(self, slot: int) -> None:
+        """Empty a slot and take its duration out of the totals."""
+        entry = self._slots[slot]
+        duration = self._durations[slot]
+        if duration is None:
+            self._unknown.add(slot, -1)
+        else:
+            self._seconds.add(slot, -duration)
+        self._used.add(slot, -1)
+        self._slots[slot] = None
+        self._durations[slot] = None
+        if entry is not None:
+            self._slot_of.pop(entry, None)
+        self._len -= 1
+
+    def _slot_at(self, position: int) -> int:
+        """Get the slot of the entry at queue `position`, counted from 1."""
+        return self._used.find(position)
+
+    def append(self, entry: EntryTypes) -> None:
+        """Record `entry` being added to the end of the queue."""
+        if self._stale:
+            return
+        if self._len:
+            slot = self._slot_at(self._len) + self.SLOT_GAP
+        else:
+            slot = len(self._slots) // 2
+        if slot >= len(self._slots):
+            self._stale = True
+            return
+        self._set_slot(slot, entry)
+
+    def appendleft(self, entry: EntryTypes) -> None:
+        """Record `entry` being added to the front of the queue."""
+        if self._stale:
+            return
+        if self._len:
+            slot = self._slot_at(1) - self.SLOT_GAP
+        else:
+            slot = len(self._slots) // 2
+        if slot < 0:
+            self._stale = True
+            return
+        self._set_slot(slot, entry)
+
+    def insert_after(self, previous: Optional[EntryTypes], entry: EntryTypes) -> None:
+        """
+        Record `entry` being inserted right after the queued entry `previous`,
+        or at the front of the queue if `previous` is None.
+        """
+        if self._stale:
+            return
+        if previous is None:
+            self.appendleft(entry)
+            return
+        slot = self._slot_of.get(previous, None)
+        if slot is None:
+            self._stale = True
+            return
+        position = int(self._used.prefix_sum(slot + 1))
+        if position == self._len:
+            self.append(entry)
+            return
+        following = self._slot_at(position + 1)
+        if following - slot < 2:
+            self._stale = True
+            return
+        self._set_slot((slot + following) // 2, entry)
+
+    def popleft(self, entry: EntryTypes) -> None:
+        """Record `entry` being taken from the front of the queue."""
+        if self._stale:
+            return
+        if not self._len or self._slots[self._slot_at(1)] is not entry:
+            self._stale = True
+            return
+        self._clear_slot(self._slot_at(1))
+
+    def remove(self, entry: EntryTypes) -> None:
+        """Record `entry` being removed, with other entries keeping their order."""
+        if self._stale:
+            return
+        slot = self._slot_of.get(entry, None)
+        if slot is None:
+            self._stale = True
+            return
+        self._clear_slot(slot)
+
+    def update(self, entry: EntryTypes) -> None:
+        """Update the totals if the duration of a queued `entry` has changed."""
+        if self._stale:
+            return
+        slot = self._slot_of.get(entry, None)
+        if slot is None or self._durations[slot] == entry.duration:
+            return
+        self._clear_slot(slot)
+        self._set_slot(slot, entry)
+
+    def time_until(self, entries: EntryQueue, count: int) -> Tuple[float, int]:
+        """
+        Get the total duration of the first `count` entries of the queue, and
+        how many of them have unknown duration.
+        The index is rebuilt first if it is stale or does not match `entries`,
+        which could have been changed directly.
+        """
+        if (
+            self._stale
+            or len(entries) != self._len
+            or (self._len and entries[0] is not self._slots[self._slot_at(1)])
+        ):
+            self.rebuild(entries)
+
+        count = min(max(count, 0), self._len)
+        if not count:
+            return 0, 0
+        end = self._slot_at(count) + 1
+        return (
+            self._seconds.prefix_sum(end),
+            int(self._unknown.prefix_sum(end)),
+        )
+
+
+class PreDownloadWindow:
+    def __init__(self, playlist: "Playlist") -> None:
+        """
+        Keep the first few entries of the queue downloading ahead of playback.
+        The next entry is downloaded with NEXT_UP priority and the rest of
+        the window with LOOKAHEAD priority.  The window stops short while
+        its downloaded entries hold PreDownloadLimitBytes or more, or while
+        the audio cache is at its storage limit, but the next entry is
+        always downloaded.
+        Entries which leave the window, like after a shuffle, keep any
+        download already asked for, as they are still queued and the byte
+        budget bounds how much is held.  Downloads are only cancelled when
+        their entry is removed from the queue.
+
+        :param: playlist:  The Playlist whose queue is watched.
+        """
+        self.playlist: "Playlist" = playlist
+        # entry -> most urgent priority requested for it by the window.
+        self._requested: Dict[EntryTypes, int] = {}
+
+    def _over_budget(self, held_bytes: int) -> bool:
+        """Check if the window may not grow past the bytes it already holds."""
+        config = self.playlist.bot.config
+        limit = config.pre_download_limit_bytes
+        if limit and held_bytes >= limit:
+            return True
+
+        filecache = self.playlist.bot.filecache
+        return bool(
+            config.save_videos
+            and config.storage_limit_bytes
+            and filecache.size_bytes >= config.storage_limit_bytes
+        )
+
+    def refresh(self) -> None:
+        """Start or reprioritize downloads for entries in the window."""
+        config = self.playlist.bot.config
+        window: Dict[EntryTypes, int] = {}
+        if config.pre_download_next_song:
+            held_bytes = 0
+            upcoming = islice(self.playlist.entries, config.pre_download_window)
+            for idx, entry in enumerate(upcoming):
+                if idx and self._over_budget(held_bytes):
+                    break
+                window[entry] = JobPriority.LOOKAHEAD if idx else JobPriority.NEXT_UP
+                if entry.is_downloaded:
+                    held_bytes += entry.downloaded_bytes
+
+        for entry, priority in window.items():
+            # only ask again for a download which became more urgent.
+            requested = self._requested.get(entry, None)
+            if entry.is_downloaded or (requested is not None and requested <= priority):
+                continue
+            if requested is None:
+                log.everything(  # type: ignore[attr-defined]
+                    "Pre-downloading track:  %r", entry
+                )
+            self._requested[entry] = priority
+            future = entry.get_ready_future(priority=priority)
+            future.add_done_callback(functools.partial(self._on_entry_ready, entry))
+
+    def _on_entry_ready(self, entry: EntryTypes, future: AsyncFuture) -> None:
+        """Update queue time estimates once a pre-downloaded entry is ready."""
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            # the error is reported again when the entry is played.
+            log.debug("Pre-download failed for entry:  %r", entry)
+            return
+        self.playlist.update_entry_duration(entry)
+
+    def take(self, entry: EntryTypes) -> None:
+        """Stop tracking `entry`, without cancelling it, as it will be played."""
+        self._requested.pop(entry, None)
+
+    def clear(self) -> None:
+        """Stop tracking all entries, without cancelling them."""
+        self._requested.clear()
+
+
 class Playlist(EventEmitter, Serializable):
     """
     A playlist that manages the queue of songs that will be played.
@@ -55,7 +348,11 @@ class Playlist(EventEmitter, Serializable):
         super().__init__()
         self.bot: "MusicBot" = bot
         self.loop: asyncio.AbstractEventLoop = bot.loop
-        self.entries: Deque[EntryTypes] = deque()
+        self.entries: EntryQueue = deque()
+        if bot.config.round_robin_queue:
+            self.entries = FairQueue(_get_entry_author)
+        self._durations: QueueDurationIndex = QueueDurationIndex()
+        self._pre_downloads: PreDownloadWindow = PreDownloadWindow(self)
 
     def __iter__(self) -> Iterator[EntryTypes]:
         return iter(self.entries)
@@ -64,35 +361,107 @@ class Playlist(EventEmitter, Serializable):
         return len(self.entries)
 
     def shuffle(self) -> None:
-        """Shuffle the deque of entries, in place."""
-        shuffle(self.entries)
+        """
+        Shuffle the deque of entries, in place.
+        In round-robin mode the order of authors and of each author's entries
+        is shuffled instead, so the queue still takes turns between authors.
+        """
+        if isinstance(self.entries, FairQueue):
+            self.entries.shuffle()
+        else:
+            shuffle(self.entries)
+        self._durations.invalidate()
+        self._pre_downloads.refresh()
+        self.emit("entries-changed", playlist=self)
 
     def clear(self) -> None:
-        """Clears the deque of entries."""
+        """Clears the deque of entries, cancelling any of their downloads."""
+        for entry in self.entries:
+            entry.cancel_download()
         self.entries.clear()
+        self._durations.rebuild([])
+        self._pre_downloads.clear()
+        self.emit("entries-changed", playlist=self)
+
+    def requeue_entry(self, entry: EntryTypes, *, head: bool = False) -> None:
+        """
+        Put a played `entry` back in the queue, for repeat and loop modes.
+        No "entry-added" event is emitted, as the entry is not new.
+
+        :param: head:  Add the entry to the front, so it is played again next.
+        """
+        if head:
+            self.entries.appendleft(entry)
+        else:
+            self.entries.append(entry)
+        self._track_added(entry, head=head)
+        self._pre_downloads.refresh()
+
+    def replace_entries(self, entries: Iterable[EntryTypes]) -> None:
+        """
+        Replace the queued entries with `entries`, without cancelling any
+        downloads, like when restoring a saved queue.
+        """
+        self.entries.clear()
+        self.entries.extend(entries)
+        self._durations.invalidate()
+        self._pre_downloads.clear()
 
     def get_entry_at_index(self, index: int) -> EntryTypes:
         """
-        Uses deque rotate to seek to the given `index` and reference the
-        entry at that position.
+        Get a reference to the entry at the given `index`.
         """
-        self.entries.rotate(-index)
-        entry = self.entries[0]
-        self.entries.rotate(index)
-        return entry
+        return self.entries[index]
 
-    def delete_entry_at_index(self, index: int) -> EntryTypes:
-        """Remove and return the entry at the given index."""
-        self.entries.rotate(-index)
-        entry = self.entries.popleft()
-        self.entries.rotate(index)
+    def delete_entry_at_index(
+        self, index: int, *, cancel_download: bool = True
+    ) -> EntryTypes:
+        """
+        Remove and return the entry at the given index.
+
+        :param: cancel_download:  Cancel any download for the removed entry.
+            Set this False when the entry will be added back, like when moving it.
+        """
+        entry = self.entries[index]
+        author = _get_entry_author(entry)
+        if (
+            isinstance(self.entries, FairQueue)
+            and author is not None
+            and self.entries.count_for(author) > 1
+        ):
+            # the author's later entries move up a turn, changing their positions.
+            self._durations.invalidate()
+        else:
+            self._durations.remove(entry)
+        del self.entries[index]
+        self._pre_downloads.take(entry)
+        if cancel_download:
+            entry.cancel_download()
+        self._pre_downloads.refresh()
+        self.emit("entries-changed", playlist=self)
         return entry
 
     def insert_entry_at_index(self, index: int, entry: EntryTypes) -> None:
-        """Add entry to the queue at the given index."""
-        self.entries.rotate(-index)
-        self.entries.appendleft(entry)
-        self.entries.rotate(index)
+        """
+        Add entry to the queue at the given index.
+        In round-robin mode authors take turns, so entries can only be
+        inserted at the front.  Commands which move entries should check
+        config.round_robin_queue before removing the entry.
+
+        :raises: ValueError  if `index` is above 0 in round-robin mode.
+        """
+        if isinstance(self.entries, FairQueue):
+            self.entries.insert(index, entry)
+            self._track_added(entry, head=True)
+        else:
+            # find the entry before the new one, as deque.insert() would.
+            size = len(self.entries)
+            position = min(index if index >= 0 else max(0, size + index), size)
+            previous = self.entries[position - 1] if position else None
+            self.entries.insert(index, entry)
+            self._durations.insert_after(previous, entry)
+        self._pre_downloads.refresh()
+        self.emit("entries-changed", playlist=self)
 
     async def add_stream_from_info(
         self,
@@ -154,6 +523,25 @@ class Playlist(EventEmitter, Serializable):
         :raises: WrongEntryTypeError  If the info is identified as a playlist.
         """
 
+        entry = self._create_entry_from_info(info, author=author, channel=channel)
+        self._add_entry(entry, head=head, defer_serialize=defer_serialize)
+        if isinstance(entry, StreamPlaylistEntry):
+            return entry, len(self.entries)
+        return entry, (1 if head else len(self.entries))
+
+    def _create_entry_from_info(
+        self,
+        info: "YtdlpResponseDict",
+        author: Optional["discord.Member"] = None,
+        channel: Optional[GuildMessageableChannels] = None,
+    ) -> EntryTypes:
+        """
+        Validate the `info` and create the matching entry for it, without
+        adding it to the queue.
+
+        :raises: ExtractionError  If data is missing or the content type is invalid.
+        :raises: WrongEntryTypeError  If the info is identified as a playlist.
+        """
         if not info:
             raise ExtractionError("Could not extract information")
 
@@ -167,27 +555,21 @@ class Playlist(EventEmitter, Serializable):
 
         # check if this is a local file entry.
         if info.ytdl_type == "local":
-            return await self.add_local_file_entry(
-                info,
-                author=author,
-                channel=channel,
-                head=head,
-                defer_serialize=defer_serialize,
+            log.noise(  # type: ignore[attr-defined]
+                f"Adding LocalFilePlaylistEntry for: {info.input_subject}"
             )
+            return LocalFilePlaylistEntry(self, info, author=author, channel=channel)
 
         # check if this is a stream, just in case.
         if info.is_stream:
             log.debug("Entry info appears to be a stream, adding stream entry...")
-            return await self.add_stream_from_info(
-                info,
-                author=author,
-                channel=channel,
-                head=head,
-                defer_serialize=defer_serialize,
+            log.noise(  # type: ignore[attr-defined]
+                f"Adding stream entry for URL:  {info.url}"
             )
+            return StreamPlaylistEntry(self, info, author=author, channel=channel)
 
         # TODO: Extract this to its own function
-        if any(info.extractor.startswith(x) for x in ["generic", "Dropbox"]):
+        if info.extractor.startswith(HEAD_CONTENT_CHECKED_EXTRACTORS):
             content_type = info.http_header("content-type", None)
 
             if content_type:
@@ -204,7 +586,10 @@ class Playlist(EventEmitter, Serializable):
                     log.warning(
                         "Got text/html for content-type, this might be a stream."
                     )
-                    return await self.add_stream_from_info(info, head=head)
+                    log.noise(  # type: ignore[attr-defined]
+                        f"Adding stream entry for URL:  {info.url}"
+                    )
+                    return StreamPlaylistEntry(self, info)
                     # TODO: Check for shoutcast/icecast
 
                 elif not content_type.startswith(("audio/", "video/")):
@@ -217,9 +602,7 @@ class Playlist(EventEmitter, Serializable):
         log.noise(  # type: ignore[attr-defined]
             f"Adding URLPlaylistEntry for: {info.input_subject}"
         )
-        entry = URLPlaylistEntry(self, info, author=author, channel=channel)
-        self._add_entry(entry, head=head, defer_serialize=defer_serialize)
-        return entry, (1 if head else len(self.entries))
+        return URLPlaylistEntry(self, info, author=author, channel=channel)
 
     async def add_local_file_entry(
         self,
@@ -250,6 +633,8 @@ class Playlist(EventEmitter, Serializable):
     ) -> Tuple[List[EntryTypes], int]:
         """
         Validates the songs from `info` and queues them to be played.
+        Entries are checked and created first, then added to the queue in one
+        step, which emits a single "entries-added" event for the whole batch.
 
         Returns a list of entries that have been queued, and the queue
         position where the first entry was added.
@@ -258,98 +643,99 @@ class Playlist(EventEmitter, Serializable):
         :param: head:  Toggle adding the entries to the front of the queue.
         """
         position = 1 if head else len(self.entries) + 1
-        entry_list = []
-        baditems = 0
-        entries = info.get_entries_objects()
-        author_perms = None
-        defer_serialize = True
+        items = self._filter_import_items(info, ignore_video_id, author)
+        baditems = info.entry_count - len(items)
+        entry_list: List[EntryTypes] = []
+
+        for item in items:
+            try:
+                entry_list.append(
+                    self._create_entry_from_info(item, author=author, channel=channel)
+                )
+            except (WrongEntryTypeError, ExtractionError):
+                baditems += 1
+                log.warning("Could not add item")
+                log.debug("Item: %s", item, exc_info=True)
+
+        if baditems:
+            log.info("Skipped %s bad entries", baditems)
 
+        self._add_entries(entry_list, head=head)
+        return entry_list, position
+
+    def _filter_import_items(
+        self,
+        info: "YtdlpResponseDict",
+        ignore_video_id: str = "",
+        author: Optional["discord.Member"] = None,
+    ) -> List["YtdlpResponseDict"]:
+        """
+        Check all entries of a playlist `info` against the song block list,
+        the `author` permissions, and youtube placeholders in one pass.
+        Settings used by the checks are looked up once for the whole playlist.
+
+        :returns:  The entry info which passed all checks, in playlist order.
+        """
+        max_song_length = 0
         if author:
-            author_perms = self.bot.permissions.for_user(author)
+            max_song_length = self.bot.permissions.for_user(author).max_song_length
 
-        if head:
-            entries.reverse()
+        blocklist = None
+        if self.bot.config.song_blocklist_enabled:
+            blocklist = self.bot.config.song_blocklist
+
+        from_youtube = info.extractor.startswith("youtube")
+        has_title = "title" in info
 
-        track_number = 0
-        for item in entries:
-            # count tracks regardless of conditions, used for missing track names
-            # and also defers serialization of the queue for playlists.
-            track_number += 1
+        items = []
+        # count tracks regardless of conditions, used for missing track names.
+        for track_number, item in enumerate(info.get_entries_objects(), 1):
             # Ignore playlist entry when it comes from compound links.
             if ignore_video_id and ignore_video_id == item.video_id:
                 log.debug(
                     "Ignored video from compound playlist link with ID:  %s",
                     item.video_id,
                 )
-                baditems += 1
                 continue
 
             # Check if the item is in the song block list.
-            if self.bot.config.song_blocklist_enabled and (
-                self.bot.config.song_blocklist.is_blocked(item.url)
-                or self.bot.config.song_blocklist.is_blocked(item.title)
+            if blocklist and (
+                blocklist.is_blocked(item.url) or blocklist.is_blocked(item.title)
             ):
                 log.info(
                     "Not allowing entry that is in song block list:  %s  URL: %s",
                     item.title,
                     item.url,
                 )
-                baditems += 1
                 continue
 
             # Exclude entries over max permitted duration.
-            if (
-                author_perms
-                and author_perms.max_song_length
-                and item.duration > author_perms.max_song_length
-            ):
+            if max_song_length and item.duration > max_song_length:
                 log.debug(
                     "Ignoring song in entries by '%s', duration longer than permitted maximum.",
                     author,
                 )
-                baditems += 1
                 continue
 
             # Check youtube data to preemptively avoid adding Private or Deleted videos to the queue.
-            if info.extractor.startswith("youtube") and (
-                "[private video]" == item.get("title", "").lower()
-                or "[deleted video]" == item.get("title", "").lower()
+            if from_youtube and item.get("title", "").lower() in (
+                "[private video]",
+                "[deleted video]",
             ):
                 log.warning(
                     "Not adding youtube video because it is marked private or deleted:  %s",
                     item.get_playable_url(),
                 )
-                baditems += 1
                 continue
 
             # Soundcloud playlists don't get titles in flat extraction. A bug maybe?
             # Anyway we make a temp title here, the real one is fetched at play.
-            if "title" in info and "title" not in item:
+            if has_title and "title" not in item:
                 item["title"] = f"{info.title} - #{track_number}"
 
-            if track_number >= info.entry_count:
-                defer_serialize = False
-
-            try:
-                entry, _pos = await self.add_entry_from_info(
-                    item,
-                    head=head,
-                    defer_serialize=defer_serialize,
-                    author=author,
-                    channel=channel,
-                )
-                entry_list.append(entry)
-            except (WrongEntryTypeError, ExtractionError):
-                baditems += 1
-                log.warning("Could not add item")
-                log.debug("Item: %s", item, exc_info=True)
-
-        if baditems:
-            log.info("Skipped %s bad entries", baditems)
+            items.append(item)
 
-        if head:
-            entry_list.reverse()
-        return entry_list, position
+        return items
 
     def get_next_song_from_author(
         self, author: "discord.abc.User"
@@ -357,6 +743,9 @@ class Playlist(EventEmitter, Serializable):
         """
         Get the next song in the queue that was added by the given `author`
         """
+        if isinstance(self.entries, FairQueue):
+            return self.entries.first_for(author)
+
         for entry in self.entries:
             if entry.author == author:
                 return entry
@@ -366,48 +755,28 @@ class Playlist(EventEmitter, Serializable):
     def reorder_for_round_robin(self) -> None:
         """
         Reorders the current queue for round-robin, one song per author.
-        Entries added by the auto playlist will be removed.
+        Entries without an author, like those added by the auto playlist,
+        will be removed if any entry has an author.
+        The queue is kept in round-robin order by a FairQueue afterwards,
+        so later calls only need to remove entries without an author.
         """
-        new_queue: Deque[EntryTypes] = deque()
-        all_authors: List["discord.abc.User"] = []
-
-        # Make a list of unique authors from the current queue.
-        for entry in self.entries:
-            if entry.author and entry.author not in all_authors:
-                all_authors.append(entry.author)
+        if not isinstance(self.entries, FairQueue):
+            self.entries = FairQueue(_get_entry_author, self.entries)
+            self._durations.invalidate()
 
         # If all queue entries have no author, do nothing.
-        if len(all_authors) == 0:
+        if self.entries.count_for(None) == len(self.entries):
             return
 
-        # Loop over the queue and organize it by requesting author.
-        # This will remove entries which are added by the auto-playlist.
-        request_counter = 0
-        song: Optional[EntryTypes] = None
-        while self.entries:
-            log.everything(  # type: ignore[attr-defined]
-                "Reorder looping over entries."
-            )
-            # Do not continue if we have no more authors.
-            if len(all_authors) == 0:
-                break
-
-            # Reset the requesting author if needed.
-            if request_counter >= len(all_authors):
-                request_counter = 0
-
-            song = self.get_next_song_from_author(all_authors[request_counter])
-
-            # Remove the authors with no further songs.
-            if song is None:
-                all_authors.pop(request_counter)
-                continue
-
-            new_queue.append(song)
-            self.entries.remove(song)
-            request_counter += 1
-
-        self.entries = new_queue
+        # anything without an author is dropped from the queue.
+        dropped = self.entries.drop_unowned()
+        for entry in dropped:
+            self._durations.remove(entry)
+            self._pre_downloads.take(entry)
+            entry.cancel_download()
+        if dropped:
+            self._pre_downloads.refresh()
+            self.emit("entries-changed", playlist=self)
 
     def _add_entry(
         self, entry: EntryTypes, *, head: bool = False, defer_serialize: bool = False
@@ -423,53 +792,92 @@ class Playlist(EventEmitter, Serializable):
             self.entries.appendleft(entry)
         else:
             self.entries.append(entry)
+        self._track_added(entry, head=head)
 
         if self.bot.config.round_robin_queue and not entry.from_auto_playlist:
             self.reorder_for_round_robin()
 
+        self._pre_downloads.refresh()
         self.emit(
             "entry-added", playlist=self, entry=entry, defer_serialize=defer_serialize
         )
 
-    async def get_next_entry(self) -> Any:
+    def _track_added(self, entry: EntryTypes, *, head: bool = False) -> None:
         """
-        A coroutine which will return the next song or None if no songs left to play.
+        Record `entry`, just added to the queue, in the duration index.
+        In round-robin mode the entry joins its author's turn, which may be
+        mid-queue, so it is recorded after the entry taken right before it.
 
-        Additionally, if predownload_next is set to True, it will attempt to download the next
-        song to be played - so that it's ready by the time we get to it.
+        :param: head:  The entry was added to the front of the queue.
         """
-        if not self.entries:
-            return None
-
-        entry = self.entries.popleft()
-        self.bot.create_task(
-            self._pre_download_entry_after_next(entry),
-            name="MB_PreDownloadNextUp",
-        )
+        if not isinstance(self.entries, FairQueue):
+            if head:
+                self._durations.appendleft(entry)
+            else:
+                self._durations.append(entry)
+            return
 
-        return await entry.get_ready_future()
+        author = _get_entry_author(entry)
+        if head and author is None:
+            self._durations.appendleft(entry)
+        elif not head or self.entries.count_for(author) == 1:
+            self._durations.insert_after(self.entries.previous(entry), entry)
+        else:
+            # the author's turn moved to the front, with their other entries.
+            self._durations.invalidate()
 
-    async def _pre_download_entry_after_next(self, last_entry: EntryTypes) -> None:
+    def _add_entries(self, entries: List[EntryTypes], *, head: bool = False) -> None:
         """
-        Enforces a delay before doing pre-download of the "next" song.
-        Should only be called from get_next_entry() after pop.
+        Handle adding many `entries` to the queue at once, keeping their order.
+        The queue is reordered for round-robin at most once, and a single
+        "entries-added" event is emitted instead of one event per entry.
+
+        :param: head:  Toggle adding the entries to the front of the queue.
         """
-        if not self.bot.config.pre_download_next_song:
+        if not entries:
             return
 
+        if head:
+            self.entries.extendleft(reversed(entries))
+            if isinstance(self.entries, FairQueue):
+                # the authors' turns moved to the front, with their other entries.
+                self._durations.invalidate()
+            else:
+                for entry in reversed(entries):
+                    self._durations.appendleft(entry)
+        else:
+            # round-robin positions depend on the entries added before.
+            for entry in entries:
+                self.entries.append(entry)
+                self._track_added(entry)
+
+        if self.bot.config.round_robin_queue and not all(
+            entry.from_auto_playlist for entry in entries
+        ):
+            self.reorder_for_round_robin()
+
+        self._pre_downloads.refresh()
+        self.emit("entries-added", playlist=self, entries=entries)
+
+    async def get_next_entry(self) -> Any:
+        """
+        A coroutine which will return the next song or None if no songs left to play.
+
+        Additionally, if PreDownloadNextSong is enabled, the next few songs in the
+        queue will be downloaded, so they are ready by the time we get to them.
+        """
         if not self.entries:
-            return
+            return None
 
-        # get the next entry to pre-download before we wait.
-        next_entry = self.peek()
+        entry = self.entries.popleft()
+        self._durations.popleft(entry)
+        self._pre_downloads.take(entry)
 
-        await asyncio.sleep(DEFAULT_PRE_DOWNLOAD_DELAY)
+        # ask for this entry first, so it is not queued behind pre-downloads.
+        future = entry.get_ready_future()
+        self._pre_downloads.refresh()
 
-        if next_entry and next_entry != last_entry:
-            log.everything(  # type: ignore[attr-defined]
-                "Pre-downloading next track:  %r", next_entry
-            )
-            next_entry.get_ready_future()
+        return await future
 
     def peek(self) -> Optional[EntryTypes]:
         """
@@ -492,12 +900,11 @@ class Playlist(EventEmitter, Serializable):
 
         :raises: musicbot.exceptions.InvalidDataError  if duration data cannot be calculated.
         """
-        if any(e.duration is None for e in islice(self.entries, position - 1)):
-            raise InvalidDataError("no duration data")
-
-        estimated_time = sum(
-            e.duration_td.total_seconds() for e in islice(self.entries, position - 1)
+        estimated_time, unknown = self._durations.time_until(
+            self.entries, position - 1
         )
+        if unknown:
+            raise InvalidDataError("no duration data")
 
         # When the player plays a song, it eats the first playlist item, so we just have to add the time back
         if not player.is_stopped and player.current_entry:
@@ -510,8 +917,17 @@ class Playlist(EventEmitter, Serializable):
 
         return datetime.timedelta(seconds=estimated_time)
 
+    def update_entry_duration(self, entry: EntryTypes) -> None:
+        """
+        Update queue time estimates after the duration of a queued `entry`
+        became known or changed, for example once it was downloaded.
+        """
+        self._durations.update(entry)
+
     def count_for_user(self, user: "discord.abc.User") -> int:
         """Get a sum of entries added to the playlist by the given `user`"""
+        if isinstance(self.entries, FairQueue):
+            return self.entries.count_for(user)
         return sum(1 for e in self.entries if e.author == user)
 
     def __json__(self) -> Dict[str, Any]:
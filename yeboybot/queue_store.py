@@ -0,0 +1,364 @@
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from .constants import (
+    DATA_GUILD_FILE_QUEUE,
+    DATA_GUILD_FILE_QUEUE_JOURNAL,
+    DEFAULT_QUEUE_SAVE_INTERVAL,
+    DEFAULT_QUEUE_SNAPSHOT_EVERY,
+)
+from .constructs import Serializer
+from .player import MusicPlayer
+
+if TYPE_CHECKING:
+    from discord import VoiceClient
+
+    from .bot import MusicBot
+    from .player import EntryTypes
+    from .playlist import Playlist
+
+log = logging.getLogger(__name__)
+
+# Key added to queue snapshots, holding the last journal record they include.
+SNAPSHOT_SEQ_KEY = "journal_seq"
+
+# (entries removed from the front, entries added to the front, entries added to the end)
+_QueueDiff = Tuple[int, List["EntryTypes"], List["EntryTypes"]]
+
+
+class _GuildQueueState:
+    __slots__ = [
+        "player",
+        "lock",
+        "save_pending",
+        "dirty",
+        "force_snapshot",
+        "seq",
+        "journal_records",
+        "saved_entries",
+    ]
+
+    def __init__(self, player: MusicPlayer, seq: int = 0) -> None:
+        """
+        Track what was last saved for one guild's player.
+
+        :param: seq:  Sequence of the last journal record on disk.
+        """
+        self.player: MusicPlayer = player
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.save_pending: bool = False
+        self.dirty: bool = False
+        # the first save for a player always writes a full snapshot.
+        self.force_snapshot: bool = True
+        # sequence numbers only grow, even across restarts, so stale journal
+        # records left by a crash are never replayed on top of a newer snapshot.
+        self.seq: int = max(seq, int(time.time() * 1000))
+        self.journal_records: int = 0
+        self.saved_entries: List["EntryTypes"] = []
+
+
+class QueueStateStore:
+    def __init__(
+        self,
+        bot: "MusicBot",
+        data_path: pathlib.Path,
+        interval: float = DEFAULT_QUEUE_SAVE_INTERVAL,
+        snapshot_every: int = DEFAULT_QUEUE_SNAPSHOT_EVERY,
+    ) -> None:
+        """
+        Save the queue and current entry of each guild's MusicPlayer.
+        Changes are collected for `interval` seconds and saved in one write,
+        so a playlist import of many entries is saved once.
+        Saves which only add or remove entries at the ends of the queue are
+        appended to a journal file, other changes and every `snapshot_every`
+        journal records write a full snapshot instead.
+        JSON encoding and file writes are done in a thread, and snapshots are
+        written to a temporary file and renamed over the old one.
+
+        :param: bot:  A MusicBot discord client instance.
+        :param: data_path:  Data directory holding a folder for each guild.
+        :param: interval:  Seconds to collect changes before saving them.
+        :param: snapshot_every:  Journal records to allow before a snapshot.
+        """
+        self.bot: "MusicBot" = bot
+        self.data_path: pathlib.Path = data_path
+        self.interval: float = interval
+        self.snapshot_every: int = snapshot_every
+        self._guilds: Dict[int, _GuildQueueState] = {}
+        # references to pending saves, so they are not garbage collected.
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._stats: Dict[str, int] = {
+            "changes": 0,
+            "snapshots": 0,
+            "journal_records": 0,
+            "failed": 0,
+        }
+
+    def _get_paths(self, guild_id: int) -> Tuple[pathlib.Path, pathlib.Path]:
+        """Get the snapshot and journal file paths for the guild."""
+        guild_dir = self.data_path.joinpath(str(guild_id))
+        return (
+            guild_dir.joinpath(DATA_GUILD_FILE_QUEUE),
+            guild_dir.joinpath(DATA_GUILD_FILE_QUEUE_JOURNAL),
+        )
+
+    def _get_state(self, player: MusicPlayer) -> _GuildQueueState:
+        """Get the save state for `player`, replacing state of an older player."""
+        guild_id = player.voice_client.guild.id
+        state = self._guilds.get(guild_id, None)
+        if state is None or state.player is not player:
+            state = _GuildQueueState(player, state.seq if state else 0)
+            self._guilds[guild_id] = state
+        return state
+
+    def watch(self, player: MusicPlayer) -> None:
+        """
+        Save the state of `player` whenever the queue or the current entry
+        changes.  MusicPlayer calls this for itself when it is created.
+        """
+        self._get_state(player)
+        for event in (
+            "entry-added",
+            "entries-added",
+            "entries-changed",
+            "play",
+            "stop",
+            "finished-playing",
+        ):
+            player.on(event, self._on_player_event)
+
+    def _on_player_event(self, player: MusicPlayer, **_kwargs: Any) -> None:
+        """Event handler for MusicPlayer events which change saved state."""
+        self.mark_dirty(player)
+
+    def mark_dirty(self, player: MusicPlayer, snapshot: bool = False) -> None:
+        """
+        Schedule the state of `player` to be saved, unless a save is already
+        waiting to run.
+
+        :param: snapshot:  Write a full snapshot instead of a journal record.
+        """
+        state = self._get_state(player)
+        state.dirty = True
+        state.force_snapshot = state.force_snapshot or snapshot
+        self._stats["changes"] += 1
+        if state.save_pending:
+            return
+        state.save_pending = True
+        task = asyncio.create_task(self._save_later(state), name="MB_SaveQueueState")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _save_later(self, state: _GuildQueueState) -> None:
+        """Wait for the save interval, then save all changes made meanwhile."""
+        await asyncio.sleep(self.interval)
+        state.save_pending = False
+        await self._save(state)
+
+    async def flush(self, guild_id: Optional[int] = None) -> None:
+        """
+        Save pending changes right away, for one guild or all of them.
+        Intended to be used at shutdown.
+        """
+        if guild_id is not None:
+            state = self._guilds.get(guild_id, None)
+            states = [state] if state else []
+        else:
+            states = list(self._guilds.values())
+        for state in states:
+            await self._save(state)
+
+    def forget(self, guild_id: int) -> None:
+        """Stop tracking the guild, without removing its saved files."""
+        self._guilds.pop(guild_id, None)
+
+    async def _save(self, state: _GuildQueueState) -> None:
+        """
+        Save the player state as a journal record if possible, or as a snapshot.
+        """
+        async with state.lock:
+            if not state.dirty:
+                return
+            state.dirty = False
+
+            player = state.player
+            entries = list(player.playlist.entries)
+            diff = None
+            if (
+                not state.force_snapshot
+                and state.journal_records < self.snapshot_every
+            ):
+                diff = self._diff(state.saved_entries, entries)
+
+            snapshot_file, journal_file = self._get_paths(player.voice_client.guild.id)
+            try:
+                if diff is None:
+                    data = player.__json__()
+                    data[SNAPSHOT_SEQ_KEY] = state.seq
+                    await asyncio.to_thread(
+                        self._write_snapshot, snapshot_file, journal_file, data
+                    )
+                    state.journal_records = 0
+                    state.force_snapshot = False
+                    self._stats["snapshots"] += 1
+                else:
+                    pop, head, tail = diff
+                    progress = player.progress
+                    record = {
+                        "seq": state.seq + 1,
+                        "pop": pop,
+                        "head": head,
+                        "tail": tail,
+                        "current_entry": {
+                            "entry": player.current_entry,
+                            "progress": progress if progress > 1 else None,
+                        },
+                    }
+                    await asyncio.to_thread(self._append_journal, journal_file, record)
+                    state.seq += 1
+                    state.journal_records += 1
+                    self._stats["journal_records"] += 1
+                state.saved_entries = entries
+            except Exception:  # pylint: disable=broad-exception-caught
+                # any failure leaves the files behind the queue, so the next
+                # save must write a full snapshot.
+                log.exception("Failed to save queue state to:  %s", snapshot_file)
+                state.force_snapshot = True
+                self._stats["failed"] += 1
+
+    @staticmethod
+    def _diff(
+        old: List["EntryTypes"], new: List["EntryTypes"]
+    ) -> Optional[_QueueDiff]:
+        """
+        Describe how `new` differs from `old` as entries removed from the
+        front, then entries added to either end.
+
+        :returns:  The diff, or None if the change cannot be described this way.
+        """
+        positions = {id(e): idx for idx, e in enumerate(new)}
+        pop = 0
+        while pop < len(old) and id(old[pop]) not in positions:
+            pop += 1
+        kept = old[pop:]
+        start = positions[id(kept[0])] if kept else 0
+        end = start + len(kept)
+        if end > len(new) or any(a is not b for a, b in zip(kept, new[start:end])):
+            return None
+        return pop, new[:start], new[end:]
+
+    @staticmethod
+    def _write_snapshot(
+        snapshot_file: pathlib.Path,
+        journal_file: pathlib.Path,
+        data: Dict[str, Any],
+    ) -> None:
+        """Encode and atomically replace the snapshot, then drop the journal."""
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot_file.with_name(snapshot_file.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf8") as fh:
+            json.dump(data, fh, cls=Serializer)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_file, snapshot_file)
+        journal_file.unlink(missing_ok=True)
+
+    @staticmethod
+    def _append_journal(journal_file: pathlib.Path, record: Dict[str, Any]) -> None:
+        """Encode and append a single record to the journal."""
+        line = json.dumps(record, cls=Serializer) + "\n"
+        journal_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(journal_file, "a", encoding="utf8") as fh:
+            fh.write(line)
+
+    @staticmethod
+    def _read_state(
+        snapshot_file: pathlib.Path, journal_file: pathlib.Path
+    ) -> Tuple[Optional[str], int]:
+        """
+        Read the snapshot and replay journal records newer than it.
+
+        :returns:  Player JSON for MusicPlayer.from_json() and the last sequence
+            number, or None if there is no saved state.
+        """
+        if not snapshot_file.is_file():
+            return None, 0
+
+        with open(snapshot_file, "r", encoding="utf8") as fh:
+            data = json.load(fh)
+        seq = int(data.pop(SNAPSHOT_SEQ_KEY, 0))
+
+        if journal_file.is_file():
+            body = data["data"]
+            entries: List[Any] = body["entries"]["data"]["entries"]
+            with open(journal_file, "r", encoding="utf8") as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # only the last record can be cut short by a crash.
+                        log.warning("Ignoring damaged queue journal record.")
+                        break
+                    if record["seq"] <= seq:
+                        continue
+                    del entries[: record["pop"]]
+                    entries[:0] = record["head"]
+                    entries.extend(record["tail"])
+                    body["current_entry"] = record["current_entry"]
+                    seq = record["seq"]
+
+        return json.dumps(data), seq
+
+    async def load_player(
+        self,
+        guild_id: int,
+        bot: "MusicBot",
+        voice_client: "VoiceClient",
+        playlist: "Playlist",
+    ) -> Optional[MusicPlayer]:
+        """
+        Create a MusicPlayer from the saved state of the guild, if any.
+        The remaining arguments are passed on to MusicPlayer.from_json().
+        """
+        snapshot_file, journal_file = self._get_paths(guild_id)
+        try:
+            raw_json, seq = await asyncio.to_thread(
+                self._read_state, snapshot_file, journal_file
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            log.exception("Failed to read saved queue state from:  %s", snapshot_file)
+            return None
+        if raw_json is None:
+            return None
+
+        player = MusicPlayer.from_json(raw_json, bot, voice_client, playlist)
+        if player is not None:
+            self._guilds[guild_id] = _GuildQueueState(player, seq)
+        return player
+
+    async def create_player(
+        self,
+        guild_id: int,
+        bot: "MusicBot",
+        voice_client: "VoiceClient",
+        playlist: "Playlist",
+    ) -> MusicPlayer:
+        """
+        Create a MusicPlayer for the guild, restoring its saved state if any.
+        New players watch themselves with this store, so their state is saved.
+        """
+        player = await self.load_player(guild_id, bot, voice_client, playlist)
+        if player is None:
+            player = MusicPlayer(bot, voice_client, playlist)
+        return player
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get counts of state changes and the writes they were saved in.
+        """
+        return {"guilds": len(self._guilds), **self._stats}
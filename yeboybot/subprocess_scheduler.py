@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from typing import Any, Dict, List, Set, Tuple
+
+from .constants import DEFAULT_MAX_SUBPROCESSES_AUTO
+from .constructs import JobPriority
+from .exceptions import FFmpegError
+
+log = logging.getLogger(__name__)
+
+# (priority, sequence, waiter future)
+_Waiter = Tuple[int, int, "asyncio.Future[None]"]
+
+
+class SubprocessScheduler:
+    def __init__(self, max_running: int = 0) -> None:
+        """
+        Limit how many ffmpeg and ffprobe processes MusicBot runs at once.
+        Commands beyond the limit wait in a queue and start in JobPriority
+        order, so probes needed for playback run before background work.
+        Commands can be given a timeout, after which the process is killed,
+        and cancelling the awaiting task also kills a running process.
+
+        :param: max_running:  Maximum number of processes to run at once.
+            Set to 0 to size this from the number of CPUs.
+        """
+        self._max_running: int = self._resolve_limit(max_running)
+        self._running: int = 0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._procs: Set["asyncio.subprocess.Process"] = set()
+        self._stats: Dict[str, float] = {
+            "started": 0,
+            "completed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+        }
+
+    @staticmethod
+    def _resolve_limit(max_running: int) -> int:
+        """Get the process limit to use, leaving a CPU free for playback if auto."""
+        if max_running > 0:
+            return max_running
+        cpus = os.cpu_count() or 1
+        return max(1, min(cpus - 1, DEFAULT_MAX_SUBPROCESSES_AUTO))
+
+    @property
+    def max_running(self) -> int:
+        """Get the maximum number of processes allowed to run at once."""
+        return self._max_running
+
+    def set_max_running(self, max_running: int) -> None:
+        """
+        Change the process limit, where 0 sizes it from the number of CPUs.
+        Raising the limit starts queued commands right away.
+        """
+        self._max_running = self._resolve_limit(max_running)
+        self._wake()
+
+    async def _acquire(self, priority: int) -> None:
+        """Wait for a free process slot, in priority order."""
+        if self._running < self._max_running and not self._waiters:
+            self._running += 1
+            return
+
+        fut: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # the slot may have been handed over just as we were cancelled.
+            if not fut.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Free a process slot and hand it to the next waiting command."""
+        self._running -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        """Hand free slots to waiting commands.  Cancelled waiters are skipped."""
+        while self._waiters and self._running < self._max_running:
+            _prio, _seq, fut = heapq.heappop(self._waiters)
+            if fut.done():
+                continue
+            self._running += 1
+            fut.set_result(None)
+
+    async def run(
+        self,
+        command: List[str],
+        *,
+        priority: int = JobPriority.NEXT_UP,
+        timeout: float = 0,
+    ) -> bytes:
+        """
+        Run `command` once a process slot is free and wait for its output.
+
+        :param: command:
+            Must be a list of arguments, where element 0 is an executable path.
+        :param: priority:  A JobPriority value used to order waiting commands.
+        :param: timeout:  Seconds to let the process run before killing it, 0 for no limit.
+
+        :returns:  stdout concatenated with stderr as bytes.
+
+        :raises: musicbot.exceptions.FFmpegError
+            if the process was killed because it ran out of time.
+        """
+        queued_at = time.monotonic()
+        await self._acquire(priority)
+        try:
+            waited = time.monotonic() - queued_at
+            self._stats["started"] += 1
+            self._stats["wait_total"] += waited
+            self._stats["wait_max"] = max(self._stats["wait_max"], waited)
+
+            p = await asyncio.create_subprocess_exec(
+                # The inconsistency between the various implements of subprocess, asyncio.subprocess, and
+                # all the other process calling functions tucked into python is alone enough to be dangerous.
+                # There is a time and place for everything, and this is not the time or place for shells.
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            log.noise(  # type: ignore[attr-defined]
+                "Starting asyncio subprocess (%s) with command: %s", p, command
+            )
+            self._procs.add(p)
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    p.communicate(), timeout if timeout > 0 else None
+                )
+            except asyncio.TimeoutError as e:
+                self._kill(p)
+                await p.wait()
+                self._stats["timed_out"] += 1
+                raise FFmpegError(
+                    f"Subprocess timed out after {timeout} seconds:  {command[0]}"
+                ) from e
+            except asyncio.CancelledError:
+                self._kill(p)
+                self._stats["cancelled"] += 1
+                raise
+            finally:
+                self._procs.discard(p)
+        finally:
+            self._release()
+
+        self._stats["completed"] += 1
+        return stdout + stderr
+
+    @staticmethod
+    def _kill(p: "asyncio.subprocess.Process") -> None:
+        """Kill the process `p` if it is still running."""
+        if p.returncode is None:
+            try:
+                p.kill()
+            except ProcessLookupError:
+                pass
+
+    def kill_all(self) -> None:
+        """Kill all running processes, tasks waiting on them will get errors."""
+        for p in list(self._procs):
+            self._kill(p)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get counts of running and queued commands, and wait time metrics.
+        Wait times are in seconds.
+        """
+        queued_by_priority: Dict[int, int] = {}
+        for prio, _seq, fut in self._waiters:
+            if not fut.done():
+                queued_by_priority[prio] = queued_by_priority.get(prio, 0) + 1
+
+        started = self._stats["started"]
+        return {
+            "max_running": self._max_running,
+            "running": self._running,
+            "queued": sum(queued_by_priority.values()),
+            "queued_by_priority": dict(sorted(queued_by_priority.items())),
+            "started": int(started),
+            "completed": int(self._stats["completed"]),
+            "timed_out": int(self._stats["timed_out"]),
+            "cancelled": int(self._stats["cancelled"]),
+            "wait_avg": self._stats["wait_total"] / started if started else 0.0,
+            "wait_max": self._stats["wait_max"],
+        }
+
+
+# Shared by every caller of entry.run_command(), so the limit applies to the whole bot.
+subprocess_scheduler = SubprocessScheduler()